@@ -3,7 +3,6 @@ import subprocess
 import threading
 import ctypes
 import os
-import shutil
 import webbrowser
 from pathlib import Path
 from datetime import datetime
@@ -139,33 +138,58 @@ class WorkerThread(QThread):
             (r"C:\Windows\Temp", "Temp Windows")
         ]
         
+        from modules.bulk_delete import BulkDeleter, summarize_failures
+        from modules.retention_policy import RetentionPolicy, TEMP_RETENTION
+        from modules.quarantine import QuarantineStore, quarantine_enabled, describe_run
+        
+        # Mode quarantaine : fichiers déplacés (restaurables) au lieu d'être supprimés
+        quarantine_store = QuarantineStore() if quarantine_enabled() else None
+        quarantine_run = quarantine_store.begin("Nettoyage Windows") if quarantine_store else None
+        if quarantine_run:
+            self.log_signal.emit("  ♻️ Mode quarantaine actif (fichiers restaurables)")
+        
+        # Fichiers temp encore utilisés récemment conservés (non ouverts depuis 7 jours)
+        temp_policy = RetentionPolicy(TEMP_RETENTION)
+        
+        def on_progress(files, size, current_path):
+            self.log_signal.emit(f"    … {files} fichiers ({size/(1024**2):.1f} Mo)")
+        
+        seen_paths = set()
         for temp_path, label in temp_paths:
             if temp_path and os.path.exists(temp_path):
+                # TEMP et TMP pointent souvent vers le même dossier
+                key = os.path.normcase(os.path.abspath(temp_path))
+                if key in seen_paths:
+                    continue
+                seen_paths.add(key)
+                
                 try:
-                    file_count = 0
-                    size_freed = 0
-                    
-                    for item in os.listdir(temp_path):
-                        item_path = os.path.join(temp_path, item)
-                        try:
-                            if os.path.isfile(item_path):
-                                size = os.path.getsize(item_path)
-                                os.remove(item_path)
-                                size_freed += size
-                                file_count += 1
-                            elif os.path.isdir(item_path):
-                                shutil.rmtree(item_path)
-                                file_count += 1
-                        except:
-                            pass
+                    selection = temp_policy.evaluate(temp_path)
+                    deleter = BulkDeleter(progress_callback=on_progress, progress_interval=2.0, quarantine=quarantine_run)
+                    report = deleter.delete_files(selection['candidates'])
+                    # Dossiers vidés par la sélection (ceux qui gardent des fichiers restent) ;
+                    # dossiers vides récents conservés comme les fichiers
+                    report = deleter.remove_empty_dirs(
+                        temp_path,
+                        older_than=temp_policy.dir_cutoff(),
+                        emptied={os.path.dirname(path) for path, _ in selection['candidates']}
+                    )
                     
-                    cleaned_size += size_freed
-                    cleaned_files += file_count
+                    cleaned_size += report['size']
+                    cleaned_files += report['files']
                     
-                    if file_count > 0:
-                        self.log_signal.emit(f"  ✓ {label}: {file_count} éléments ({size_freed/(1024**2):.1f} Mo)")
+                    if report['files'] > 0:
+                        self.log_signal.emit(f"  ✓ {label}: {report['files']} fichiers, {report['dirs']} dossiers vides ({report['size']/(1024**2):.1f} Mo)")
                     else:
                         self.log_signal.emit(f"  ○ {label}: Déjà propre")
+                    if selection['kept']:
+                        self.log_signal.emit(f"  ○ {label}: {selection['kept']} fichiers récents conservés")
+                    if report['scheduled']:
+                        self.log_signal.emit(f"  ↻ {len(report['scheduled'])} éléments verrouillés supprimés au redémarrage")
+                    if report['failed']:
+                        self.log_signal.emit(f"  ⚠ {len(report['failed'])} éléments en cours d'utilisation")
+                        for line in summarize_failures(report, limit=3):
+                            self.log_signal.emit(line)
                 except:
                     self.log_signal.emit(f"  ✗ {label}: Accès refusé")
         
@@ -193,9 +217,16 @@ class WorkerThread(QThread):
         wu_cache = r"C:\Windows\SoftwareDistribution\Download"
         if os.path.exists(wu_cache):
             try:
-                shutil.rmtree(wu_cache)
-                os.makedirs(wu_cache)
-                self.log_signal.emit("  ✓ Cache WU nettoyé")
+                deleter = BulkDeleter(progress_callback=on_progress, progress_interval=2.0, quarantine=quarantine_run)
+                report = deleter.delete_contents(wu_cache)
+                cleaned_size += report['size']
+                cleaned_files += report['files']
+                if report['failed']:
+                    self.log_signal.emit(f"  ⚠ Cache WU partiellement nettoyé ({len(report['failed'])} échecs)")
+                    for line in summarize_failures(report, limit=3):
+                        self.log_signal.emit(line)
+                else:
+                    self.log_signal.emit(f"  ✓ Cache WU nettoyé ({report['size']/(1024**2):.1f} Mo)")
             except:
                 self.log_signal.emit("  ✗ Impossible de nettoyer le cache WU")
         
@@ -203,6 +234,15 @@ class WorkerThread(QThread):
         self.run_cmd(["net", "start", "wuauserv"])
         self.run_cmd(["net", "start", "bits"])
         
+        if quarantine_run:
+            manifest = quarantine_run.commit()
+            if manifest:
+                self.log_signal.emit(f"\n♻️ Quarantaine : {describe_run(manifest)}")
+            try:
+                quarantine_store.maintain()
+            except OSError:
+                pass
+        
         # Résumé
         self.log_signal.emit("\n" + "╔" + "═"*48 + "╗")
         self.log_signal.emit("║" + " "*15 + "✅ TERMINÉ" + " "*21 + "║")
@@ -462,23 +502,19 @@ class WorkerThread(QThread):
         self.log_signal.emit("└" + "─"*48 + "┘")
         
         try:
-            result = subprocess.run(
-                ["ipconfig"],
-                capture_output=True,
-                text=True,
-                timeout=3,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=STARTUPINFO,
-                encoding="cp850",
-                errors="replace"
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout
-                for line in output.split('\n'):
-                    if "IPv4" in line or "Passerelle" in line or "Gateway" in line:
-                        self.log_signal.emit(f"  {line.strip()}")
-        except:
+            from modules.net_interfaces import get_interfaces, format_speed, MEDIA_LOOPBACK
+            active = [i for i in get_interfaces() if i['is_up'] and i['ipv4'] and i['media'] != MEDIA_LOOPBACK]
+            for adapter in active:
+                marker = "★" if adapter['default_route'] else "•"
+                self.log_signal.emit(f"  {marker} {adapter['name']} ({adapter['media']}, {format_speed(adapter['speed_mbps'])})")
+                self.log_signal.emit(f"      IPv4: {', '.join(adapter['ipv4'])}")
+                if adapter['gateway']:
+                    self.log_signal.emit(f"      Passerelle: {adapter['gateway']}")
+                if adapter['dns']:
+                    self.log_signal.emit(f"      DNS: {', '.join(adapter['dns'])}")
+            if not active:
+                self.log_signal.emit("  ✗ Aucune carte réseau active")
+        except Exception:
             self.log_signal.emit("  ✗ Impossible de récupérer les infos réseau")
         
         # Résumé final
@@ -600,6 +636,8 @@ class RefreshWorker(QThread):
             
             # Disques
             try:
+                from modules.disk_forecast import observe, format_forecast
+                
                 drives = w.Win32_LogicalDisk(DriveType=3)
                 disk_info = []
                 for drive in drives:
@@ -609,7 +647,16 @@ class RefreshWorker(QThread):
                     used_gb = total_gb - free_gb
                     percent = (used_gb / total_gb * 100) if total_gb > 0 else 0
                     alert = " ⚠️  CRITIQUE" if free_gb < (total_gb * 0.1) else ""
-                    disk_info.append(f"{letter}\\ | {used_gb:.1f}/{total_gb:.1f} Go ({percent:.0f}%){alert}")
+                    
+                    # Historique d'espace libre + date estimée du seuil critique
+                    forecast = ""
+                    if drive.Size:
+                        try:
+                            prediction = observe(f"{letter}\\", int(drive.Size), int(drive.FreeSpace or 0))
+                            forecast = "" if alert else format_forecast(prediction)
+                        except Exception:
+                            forecast = ""
+                    disk_info.append(f"{letter}\\ | {used_gb:.1f}/{total_gb:.1f} Go ({percent:.0f}%){alert}{forecast}")
                 data['disks'] = "\n".join(disk_info) if disk_info else "❌ Aucun disque"
             except:
                 data['disks'] = "❌ Erreur lecture disques"
@@ -0,0 +1,406 @@
+# benchmarks/bench_disk_cleanup.py
+"""
+Benchmark - Scanners du nettoyage disque sur une arborescence synthétique
+Mesure : count_items, Navigateurs, Gaming, Windows Store, Fichiers volumineux, Doublons
+
+Génère un profil utilisateur reproductible (graine fixe) dans un dossier
+temporaire, pointe HOME / USERPROFILE / LOCALAPPDATA / APPDATA dessus puis
+exécute chaque catégorie de DiskCleanupWorker en mode analyse.
+
+Rapporte par catégorie : fichiers/s, Mo/s lus (hachage des doublons),
+pic de RSS, appels système de lecture (syscr de /proc/self/io) et appels
+Python instrumentés (scandir, os.stat/lstat, DirEntry.stat/is_dir, open) :
+ces derniers ne sont pas des appels système (DirEntry.is_dir n'en fait
+souvent aucun, DirEntry.stat au plus un).
+
+Usage (depuis la racine du dépôt, Linux) :
+    python benchmarks/bench_disk_cleanup.py --files 50000 --depth 5 --dup-ratio 0.2
+    python benchmarks/bench_disk_cleanup.py --sizes large --hardlinks 0.1 --runs 3
+"""
+
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import builtins
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+MB = 1024 * 1024
+
+# Distributions de tailles : (probabilité, taille min, taille max)
+SIZE_PROFILES = {
+    'small': [(0.90, 0, 16 * 1024), (0.10, 16 * 1024, 256 * 1024)],
+    'mixed': [(0.70, 0, 16 * 1024), (0.25, 16 * 1024, 1 * MB), (0.045, 1 * MB, 64 * MB),
+              (0.005, 600 * MB, 2048 * MB)],
+    'large': [(0.40, 16 * 1024, 1 * MB), (0.50, 1 * MB, 128 * MB), (0.10, 600 * MB, 4096 * MB)],
+}
+
+# Au-delà, le fichier est creux (seuls le début et la fin sont écrits)
+SPARSE_THRESHOLD = 1 * MB
+
+# Répartition des fichiers générés entre les zones scannées
+AREAS = [
+    (0.30, ('home', 'Downloads')),
+    (0.15, ('home', 'Documents')),
+    (0.05, ('home', 'Desktop')),
+    (0.05, ('home', 'Videos')),
+    (0.10, ('local', 'Google', 'Chrome', 'User Data', 'Default', 'Cache', 'Cache_Data')),
+    (0.05, ('local', 'Google', 'Chrome', 'User Data', 'Profile 1', 'Code Cache', 'js')),
+    (0.05, ('local', 'Microsoft', 'Edge', 'User Data', 'Default', 'GPUCache')),
+    (0.05, ('local', 'Mozilla', 'Firefox', 'Profiles', 'bench.default-release', 'cache2', 'entries')),
+    (0.05, ('local', 'Steam', 'htmlcache')),
+    (0.05, ('local', 'NVIDIA', 'DXCache')),
+    (0.05, ('roaming', 'Origin')),
+    (0.05, ('local', 'Packages', 'Microsoft.WindowsStore_8wekyb3d8bbwe', 'LocalCache')),
+]
+
+CATEGORIES = ['count_items', 'browsers', 'gaming', 'windows_store', 'large_files', 'duplicates']
+
+
+# ============ GÉNÉRATION ============
+
+def pick_size(rng, profile):
+    roll = rng.random()
+    for probability, low, high in SIZE_PROFILES[profile]:
+        if roll < probability:
+            return rng.randint(low, high)
+        roll -= probability
+    low, high = SIZE_PROFILES[profile][-1][1:]
+    return rng.randint(low, high)
+
+
+def write_file(path, size, seed):
+    """Contenu déterministe ; fichiers volumineux creux (début + fin écrits)"""
+    head = seed.to_bytes(8, 'little') * 1024  # 8 Ko propres au contenu
+    with open(path, 'wb') as f:
+        if size <= SPARSE_THRESHOLD:
+            f.write((head * (size // len(head) + 1))[:size])
+        else:
+            f.write(head)
+            f.seek(size - len(head))
+            f.write(head)
+
+
+def make_dirs(rng, base, depth, fanout):
+    """Arborescence de dossiers de profondeur variable sous base"""
+    dirs = [base]
+    frontier = [base]
+    for _ in range(depth):
+        next_frontier = []
+        for parent in frontier:
+            for i in range(rng.randint(1, fanout)):
+                child = parent / f"d{len(dirs)}_{i}"
+                dirs.append(child)
+                next_frontier.append(child)
+        # Limiter l'explosion : on n'approfondit qu'une partie des branches
+        frontier = rng.sample(next_frontier, min(len(next_frontier), fanout * 4))
+    for folder in dirs:
+        folder.mkdir(parents=True, exist_ok=True)
+    return dirs
+
+
+def generate_tree(root, files, depth, fanout, sizes, dup_ratio, hardlink_ratio, seed):
+    """Générer le profil synthétique ; retourne des statistiques"""
+    rng = random.Random(seed)
+    stats = {'files': 0, 'bytes': 0, 'duplicates': 0, 'hardlinks': 0, 'dirs': 0}
+    written = []  # (chemin, taille, graine) des fichiers originaux
+
+    weights = [weight for weight, _ in AREAS]
+    area_dirs = {}
+    for _, parts in AREAS:
+        area_dirs[parts] = make_dirs(rng, root.joinpath(*parts), depth, fanout)
+        stats['dirs'] += len(area_dirs[parts])
+
+    # Fichiers d'index des caches (utilisés par l'empreinte des caches navigateurs)
+    for _, parts in AREAS:
+        if parts[-1] in ('Cache_Data', 'entries'):
+            write_file(root.joinpath(*parts) / 'index', 256, 0)
+
+    for n in range(files):
+        parts = rng.choices([parts for _, parts in AREAS], weights)[0]
+        folder = rng.choice(area_dirs[parts])
+        path = folder / f"f{n}.bin"
+
+        roll = rng.random()
+        if written and roll < hardlink_ratio:
+            source = rng.choice(written)[0]
+            try:
+                os.link(source, path)
+                stats['hardlinks'] += 1
+                stats['files'] += 1
+                continue
+            except OSError:
+                pass
+        if written and roll < hardlink_ratio + dup_ratio:
+            _, size, content_seed = rng.choice(written)
+            stats['duplicates'] += 1
+        else:
+            size = pick_size(rng, sizes)
+            content_seed = n + 1
+        write_file(path, size, content_seed)
+        written.append((path, size, content_seed))
+        stats['files'] += 1
+        stats['bytes'] += size
+
+    return stats
+
+
+# ============ INSTRUMENTATION ============
+
+class _CountedEntry:
+    """DirEntry dont les appels stat() / is_dir() sont comptés (DirEntry non patchable)"""
+
+    __slots__ = ('_entry', '_counts')
+
+    def __init__(self, entry, counts):
+        self._entry = entry
+        self._counts = counts
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+    def stat(self, *args, **kwargs):
+        self._counts['entry.stat'] += 1
+        return self._entry.stat(*args, **kwargs)
+
+    def is_dir(self, *args, **kwargs):
+        self._counts['entry.is_dir'] += 1
+        return self._entry.is_dir(*args, **kwargs)
+
+
+class _CountedScandir:
+    """Itérateur scandir qui enveloppe chaque entrée"""
+
+    def __init__(self, iterator, counts):
+        self._iterator = iterator
+        self._counts = counts
+
+    def __iter__(self):
+        for entry in self._iterator:
+            yield _CountedEntry(entry, self._counts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._iterator.close()
+
+
+class CallCounter:
+    """Compter les appels Python à scandir / stat / open et DirEntry.stat / is_dir"""
+
+    TARGETS = [(os, 'scandir'), (os, 'stat'), (os, 'lstat'), (builtins, 'open')]
+
+    def __init__(self):
+        self.counts = {}
+        self._originals = []
+
+    def __enter__(self):
+        self.counts['entry.stat'] = 0
+        self.counts['entry.is_dir'] = 0
+        for module, name in self.TARGETS:
+            original = getattr(module, name)
+            self._originals.append((module, name, original))
+            self.counts[name] = 0
+
+            def wrapper(*args, _name=name, _original=original, **kwargs):
+                self.counts[_name] += 1
+                result = _original(*args, **kwargs)
+                if _name == 'scandir':
+                    return _CountedScandir(result, self.counts)
+                return result
+
+            setattr(module, name, wrapper)
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, original in self._originals:
+            setattr(module, name, original)
+        self._originals = []
+
+
+def read_proc_io():
+    """Compteurs noyau du processus (Linux) : syscr, syscw, rchar..."""
+    counters = {}
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                counters[key.strip()] = int(value)
+    except (OSError, ValueError):
+        pass
+    return counters
+
+
+def reset_peak_rss():
+    """Remettre à zéro VmHWM (Linux >= 4.0) ; False si impossible"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """Pic de mémoire résidente en octets"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+# ============ EXÉCUTION ============
+
+def point_environment(root):
+    """Faire pointer les dossiers utilisateur vers l'arborescence synthétique"""
+    home = root / 'home'
+    os.environ['HOME'] = str(home)
+    os.environ['USERPROFILE'] = str(home)
+    os.environ['LOCALAPPDATA'] = str(root / 'local')
+    os.environ['APPDATA'] = str(root / 'roaming')
+    os.environ['TEMP'] = os.environ['TMP'] = str(root / 'local' / 'Temp')
+
+
+def run_category(category, root):
+    """Exécuter une catégorie en mode analyse ; retourne (durée, fichiers vus, résultat)"""
+    from modules.disk_cleanup_advanced import DiskCleanupWorker
+
+    worker = DiskCleanupWorker([category], mode="analyze")
+    start = time.perf_counter()
+    if category == 'count_items':
+        files, size, allocated = worker.count_items(root)
+        result = {'files': files, 'size': size, 'allocated': allocated}
+    else:
+        getattr(worker, f"handle_{category}")()
+        result = worker.results.get(category, {})
+    elapsed = time.perf_counter() - start
+    return elapsed, worker.scan_progress.files, result
+
+
+def measure(category, root):
+    reset_peak_rss()
+    io_before = read_proc_io()
+    with CallCounter() as calls:
+        elapsed, seen, result = run_category(category, root)
+    io_after = read_proc_io()
+
+    delta = {key: io_after.get(key, 0) - io_before.get(key, 0) for key in ('syscr', 'syscw', 'rchar')}
+    return {
+        'category': category,
+        'time': elapsed,
+        'seen': seen,
+        'files_per_s': seen / elapsed if elapsed else 0,
+        'read_mb_per_s': delta['rchar'] / MB / elapsed if elapsed else 0,
+        'peak_rss_mb': peak_rss() / MB,
+        'syscr': delta['syscr'],
+        'syscw': delta['syscw'],
+        'calls': dict(calls.counts),
+        'found': result.get('files', 0),
+    }
+
+
+def format_row(row, run):
+    calls = row['calls']
+    return (f"{row['category']:<14} {run:>3} {row['time']:>8.3f} {row['seen']:>9} "
+            f"{row['files_per_s']:>10.0f} {row['read_mb_per_s']:>9.1f} {row['peak_rss_mb']:>8.1f} "
+            f"{row['syscr']:>8} {calls.get('scandir', 0):>8} {calls.get('stat', 0) + calls.get('lstat', 0):>7} "
+            f"{calls.get('entry.stat', 0):>8} {calls.get('entry.is_dir', 0):>8} "
+            f"{calls.get('open', 0):>7} {row['found']:>7}")
+
+
+HEADER = (f"{'catégorie':<14} {'run':>3} {'durée s':>8} {'fichiers':>9} "
+          f"{'fich/s':>10} {'lu Mo/s':>9} {'RSS Mo':>8} "
+          f"{'syscr':>8} {'scandir':>8} {'os.stat':>7} {'e.stat':>8} {'e.is_dir':>8} {'open':>7} {'trouvés':>7}")
+
+LEGEND = ("syscr = appels système de lecture (noyau) ; scandir, os.stat (stat + lstat), "
+          "e.stat / e.is_dir (DirEntry) et open = appels Python, pas des appels système")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark des scanners du nettoyage disque")
+    parser.add_argument('--files', type=int, default=20000, help="nombre de fichiers générés")
+    parser.add_argument('--depth', type=int, default=4, help="profondeur des arborescences")
+    parser.add_argument('--fanout', type=int, default=6, help="sous-dossiers max par dossier")
+    parser.add_argument('--sizes', choices=sorted(SIZE_PROFILES), default='mixed', help="distribution des tailles")
+    parser.add_argument('--dup-ratio', type=float, default=0.1, help="proportion de doublons (copies)")
+    parser.add_argument('--hardlinks', type=float, default=0.0, help="proportion de liens physiques")
+    parser.add_argument('--seed', type=int, default=42, help="graine (arborescence reproductible)")
+    parser.add_argument('--runs', type=int, default=1, help="passages par catégorie (le 1er sans cache)")
+    parser.add_argument('--categories', default=",".join(CATEGORIES), help="catégories, séparées par des virgules")
+    parser.add_argument('--dir', help="dossier de l'arborescence (temporaire par défaut)")
+    parser.add_argument('--keep', action='store_true', help="conserver l'arborescence générée")
+    parser.add_argument('--output', help="ajouter les résultats à ce fichier")
+    args = parser.parse_args(argv)
+
+    categories = [c.strip() for c in args.categories.split(',') if c.strip()]
+    unknown = [c for c in categories if c not in CATEGORIES]
+    if unknown:
+        parser.error(f"catégories inconnues : {', '.join(unknown)}")
+
+    root = Path(args.dir) if args.dir else Path(tempfile.mkdtemp(prefix="wapinator_bench_"))
+    root.mkdir(parents=True, exist_ok=True)
+    lines = []
+
+    def out(line=""):
+        print(line, flush=True)
+        lines.append(line)
+
+    try:
+        start = time.perf_counter()
+        stats = generate_tree(root, args.files, args.depth, args.fanout, args.sizes,
+                              args.dup_ratio, args.hardlinks, args.seed)
+        out(f"Arborescence : {root}")
+        out(f"  {stats['files']} fichiers ({stats['bytes'] / MB:.1f} Mo logiques), {stats['dirs']} dossiers, "
+            f"{stats['duplicates']} doublons, {stats['hardlinks']} liens physiques "
+            f"— générée en {time.perf_counter() - start:.1f} s")
+        out(f"  graine={args.seed} tailles={args.sizes} profondeur={args.depth} fanout={args.fanout}")
+        out()
+
+        point_environment(root)
+
+        # Qt n'est nécessaire que pour instancier le QThread (aucune boucle d'événements)
+        from PyQt6.QtCore import QCoreApplication
+        app = QCoreApplication.instance() or QCoreApplication([])
+
+        data_dir = root / 'home' / 'Documents' / 'Wapinator'
+        out(LEGEND)
+        out(HEADER)
+        for category in categories:
+            for run in range(1, args.runs + 1):
+                if run == 1:
+                    # Premier passage à froid : caches et estimations oubliés
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                out(format_row(measure(category, root), run))
+        del app
+    finally:
+        if not args.keep and not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# modules/bandwidth_monitor.py
+"""
+Bandwidth Monitor - Débit par carte réseau et par processus en temps réel
+Utilisé par : Network Tester (moniteur de bande passante)
+
+- Compteurs psutil par carte relevés toutes les 0,5 s, débit = différence
+  entre deux relevés (remise à zéro des compteurs tolérée)
+- Historique compact par carte (tableaux, ~1 h à 2 mesures/s)
+- Connexions actives (psutil.net_connections) relevées toutes les 2 s et
+  comparées au relevé précédent : seuls les nouveaux processus sont résolus
+- Gros consommateurs : processus ayant des connexions, classés par débit
+  d'E/S réseau entre deux relevés (Windows : E/S "autres" ; ailleurs, à
+  défaut, E/S totales signalées comme telles)
+"""
+
+import time
+import threading
+from array import array
+
+import psutil
+
+SAMPLE_INTERVAL = 0.5
+CONNECTIONS_INTERVAL = 2.0
+HISTORY_SECONDS = 3600
+TOP_COUNT = 5
+
+# Processus suivis au maximum pour les E/S (limite le coût d'un relevé)
+MAX_TRACKED_PROCESSES = 64
+
+# Nature du débit d'un processus
+RATE_NETWORK = 'network'
+RATE_TOTAL = 'total'
+RATE_NAMES = {RATE_NETWORK: "E/S réseau", RATE_TOTAL: "E/S totales"}
+
+
+# ============ HISTORIQUE PAR CARTE ============
+
+class RateHistory:
+    """Derniers débits d'une carte (instant, réception, émission en octets/s)
+
+    20 octets par mesure : 1 h à 2 mesures/s ≈ 140 Ko par carte.
+    """
+
+    def __init__(self, capacity=int(HISTORY_SECONDS / SAMPLE_INTERVAL)):
+        self.capacity = capacity
+        self.times = array('d', [0.0]) * capacity
+        self.recv = array('d', [0.0]) * capacity
+        self.sent = array('f', [0.0]) * capacity
+        self.count = 0
+        self.next = 0
+
+    def append(self, t, recv_rate, sent_rate):
+        i = self.next
+        self.times[i] = t
+        self.recv[i] = recv_rate
+        self.sent[i] = sent_rate
+        self.next = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def __len__(self):
+        return self.count
+
+    def samples(self, since=None):
+        """(t, réception, émission) du plus ancien au plus récent"""
+        start = (self.next - self.count) % self.capacity
+        for k in range(self.count):
+            i = (start + k) % self.capacity
+            if since is not None and self.times[i] < since:
+                continue
+            yield self.times[i], self.recv[i], self.sent[i]
+
+    def peak(self, since=None):
+        """Débits max (réception, émission) sur la période"""
+        recv_max = sent_max = 0.0
+        for _, recv, sent in self.samples(since):
+            recv_max = max(recv_max, recv)
+            sent_max = max(sent_max, sent)
+        return recv_max, sent_max
+
+
+def nic_rates(previous, current, elapsed):
+    """{carte: (réception, émission) en octets/s} entre deux relevés pernic
+
+    Une carte apparue ou dont les compteurs ont diminué (réinitialisation,
+    débordement 32 bits) n'a pas de débit pour ce relevé.
+    """
+    rates = {}
+    if elapsed <= 0:
+        return rates
+    for name, counters in current.items():
+        before = previous.get(name)
+        if before is None:
+            continue
+        recv = counters.bytes_recv - before.bytes_recv
+        sent = counters.bytes_sent - before.bytes_sent
+        if recv < 0 or sent < 0:
+            continue
+        rates[name] = (recv / elapsed, sent / elapsed)
+    return rates
+
+
+# ============ CONNEXIONS PAR PROCESSUS ============
+
+def _connection_key(conn):
+    return (conn.pid, conn.laddr, conn.raddr)
+
+
+class ConnectionTracker:
+    """Connexions par processus, mises à jour par différence entre relevés"""
+
+    def __init__(self):
+        self.connections = {}   # clé -> pid
+        self.by_pid = {}        # pid -> nombre de connexions distantes
+        self.processes = {}     # pid -> {'name', 'process', 'io', 'io_time'}
+        self.opened = 0
+        self.closed = 0
+
+    def refresh(self, connections=None):
+        """Relever les connexions ; retourne (ouvertes, fermées) depuis le dernier relevé"""
+        if connections is None:
+            try:
+                connections = psutil.net_connections(kind='inet')
+            except (psutil.AccessDenied, OSError):
+                connections = []
+        current = {}
+        for conn in connections:
+            if conn.pid and conn.raddr:
+                current[_connection_key(conn)] = conn.pid
+
+        opened = current.keys() - self.connections.keys()
+        closed = self.connections.keys() - current.keys()
+        for key in closed:
+            pid = self.connections[key]
+            self.by_pid[pid] -= 1
+            if not self.by_pid[pid]:
+                del self.by_pid[pid]
+                self.processes.pop(pid, None)
+        for key in opened:
+            pid = current[key]
+            self.by_pid[pid] = self.by_pid.get(pid, 0) + 1
+            if pid not in self.processes:
+                self.processes[pid] = self._describe(pid)
+        self.connections = current
+        self.opened += len(opened)
+        self.closed += len(closed)
+        return len(opened), len(closed)
+
+    @staticmethod
+    def _describe(pid):
+        try:
+            process = psutil.Process(pid)
+            return {'name': process.name(), 'process': process, 'io': None, 'io_time': None}
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return {'name': f"PID {pid}", 'process': None, 'io': None, 'io_time': None}
+
+    @staticmethod
+    def _io_bytes(process):
+        """(octets cumulés, nature) : E/S réseau si le système les isole"""
+        io = process.io_counters()
+        # Windows : les E/S réseau sont comptées dans "other", sans les lectures disque
+        if hasattr(io, 'other_bytes'):
+            return io.other_bytes, RATE_NETWORK
+        return io.read_bytes + io.write_bytes, RATE_TOTAL
+
+    def top_talkers(self, count=TOP_COUNT, now=None):
+        """[{'pid','name','connections','rate','rate_kind'}] classés par débit (octets/s)"""
+        now = time.monotonic() if now is None else now
+        busiest = sorted(self.by_pid.items(), key=lambda item: item[1], reverse=True)
+        talkers = []
+        for pid, connections in busiest[:MAX_TRACKED_PROCESSES]:
+            info = self.processes.get(pid)
+            if info is None:
+                continue
+            rate = None
+            kind = None
+            if info['process'] is not None:
+                try:
+                    total, kind = self._io_bytes(info['process'])
+                except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+                    info['process'] = None
+                else:
+                    if info['io'] is not None and now > info['io_time']:
+                        rate = max(0.0, (total - info['io']) / (now - info['io_time']))
+                    info['io'], info['io_time'] = total, now
+            talkers.append({'pid': pid, 'name': info['name'], 'connections': connections,
+                            'rate': rate, 'rate_kind': kind})
+        talkers.sort(key=lambda t: (t['rate'] or 0.0, t['connections']), reverse=True)
+        return talkers[:count]
+
+
+# ============ MONITEUR ============
+
+class BandwidthMonitor:
+    """Relevés périodiques des cartes et des connexions (bloquant : run/stop)"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL, connections_interval=CONNECTIONS_INTERVAL):
+        self.interval = interval
+        self.connections_interval = connections_interval
+        self.history = {}
+        self.tracker = ConnectionTracker()
+        self.talkers = []
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, on_sample=None):
+        """Relever jusqu'à stop() ; on_sample(dict) à chaque relevé"""
+        previous = psutil.net_io_counters(pernic=True)
+        previous_t = time.monotonic()
+        next_connections = previous_t
+        next_tick = previous_t + self.interval
+        while not self._stop.wait(max(0.0, next_tick - time.monotonic())):
+            next_tick += self.interval
+            now = time.monotonic()
+            current = psutil.net_io_counters(pernic=True)
+            rates = nic_rates(previous, current, now - previous_t)
+            previous, previous_t = current, now
+
+            wall = time.time()
+            for name, (recv, sent) in rates.items():
+                history = self.history.get(name)
+                if history is None:
+                    history = self.history[name] = RateHistory()
+                history.append(wall, recv, sent)
+
+            if now >= next_connections:
+                next_connections = now + self.connections_interval
+                self.tracker.refresh()
+                self.talkers = self.tracker.top_talkers(now=now)
+
+            if on_sample:
+                on_sample({
+                    'time': wall,
+                    'rates': rates,
+                    'talkers': self.talkers,
+                    'connections': len(self.tracker.connections),
+                })
+
+    def peaks(self, since=None):
+        """{carte: (réception max, émission max)} en octets/s"""
+        return {name: history.peak(since) for name, history in self.history.items()}
+
+
+def format_rate(bytes_per_second):
+    """Débit lisible en bits/s (comme les tests de débit)"""
+    bits = (bytes_per_second or 0) * 8
+    if bits >= 1e9:
+        return f"{bits / 1e9:.2f} Gbps"
+    if bits >= 1e6:
+        return f"{bits / 1e6:.1f} Mbps"
+    if bits >= 1e3:
+        return f"{bits / 1e3:.0f} kbps"
+    return f"{bits:.0f} bps"
@@ -1,5 +1,5 @@
 # modules/bloatware_cleaner.py
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
+from PyQt6.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                             QTextEdit, QProgressBar, QMessageBox, QTableWidget, 
                             QTableWidgetItem, QHeaderView, QCheckBox, QLineEdit)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
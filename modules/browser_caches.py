@@ -0,0 +1,213 @@
+# modules/browser_caches.py
+"""
+Browser Caches - Découverte des caches navigateurs (tous profils)
+Utilisé par : Nettoyage disque avancé (catégorie Navigateurs)
+
+- Chrome / Edge / Brave : Default + Profile N (Cache, Code Cache, GPUCache)
+- Firefox : tous les profils (cache2)
+- Tailles calculées en parallèle via le walker partagé
+- Résultats mémorisés par profil : un cache inchangé n'est pas reparcouru
+"""
+
+import os
+import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.disk_walker import get_data_dir, iter_files, get_cluster_size, allocated_size
+
+# Navigateurs Chromium : dossier "User Data" relatif à LOCALAPPDATA
+CHROMIUM_BROWSERS = {
+    'Chrome': ('Google', 'Chrome', 'User Data'),
+    'Edge': ('Microsoft', 'Edge', 'User Data'),
+    'Brave': ('BraveSoftware', 'Brave-Browser', 'User Data'),
+}
+
+# Caches par profil Chromium
+CHROMIUM_CACHE_DIRS = ['Cache', 'Code Cache', 'GPUCache']
+
+# Caches Firefox par profil
+FIREFOX_CACHE_DIRS = ['cache2']
+
+# Fichiers réécrits sur place à chaque utilisation du cache (le mtime
+# du dossier ne change que lors d'ajouts/suppressions d'entrées)
+INDEX_FILES = ['index', 'index-dir']
+
+
+def _chromium_profiles(user_data):
+    """Profils d'un dossier "User Data" : Default, Profile 1..N, autres profils"""
+    profiles = []
+    try:
+        with os.scandir(user_data) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                name = entry.name
+                if name == 'Default' or name.startswith('Profile ') or \
+                        os.path.isfile(os.path.join(entry.path, 'Preferences')):
+                    profiles.append(name)
+    except OSError:
+        pass
+    # Default en premier, puis Profile 1, Profile 2, ...
+    return sorted(profiles, key=lambda n: (n != 'Default', len(n), n))
+
+
+def _firefox_profile_roots():
+    """Dossiers Profiles Firefox (le cache est sous LOCALAPPDATA sous Windows)"""
+    roots = []
+    for env in ('LOCALAPPDATA', 'APPDATA'):
+        base = os.environ.get(env)
+        if base:
+            roots.append(Path(base) / 'Mozilla' / 'Firefox' / 'Profiles')
+    return roots
+
+
+def discover_browser_caches():
+    """Tous les caches navigateurs présents : liste de dicts
+    {'browser', 'profile', 'cache', 'path'} ; navigateurs installés en plus"""
+    caches = []
+    installed = []
+    local = os.environ.get('LOCALAPPDATA', '')
+
+    for browser, parts in CHROMIUM_BROWSERS.items():
+        if not local:
+            break
+        user_data = Path(local).joinpath(*parts)
+        if not user_data.is_dir():
+            continue
+        installed.append(browser)
+        for profile in _chromium_profiles(user_data):
+            for cache in CHROMIUM_CACHE_DIRS:
+                path = user_data / profile / cache
+                if path.is_dir():
+                    caches.append({'browser': browser, 'profile': profile, 'cache': cache, 'path': str(path)})
+
+    seen = set()
+    for root in _firefox_profile_roots():
+        if not root.is_dir():
+            continue
+        if 'Firefox' not in installed:
+            installed.append('Firefox')
+        try:
+            profiles = sorted(entry.name for entry in os.scandir(root) if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            continue
+        for profile in profiles:
+            for cache in FIREFOX_CACHE_DIRS:
+                path = root / profile / cache
+                key = os.path.normcase(str(path))
+                if key in seen or not path.is_dir():
+                    continue
+                seen.add(key)
+                caches.append({'browser': 'Firefox', 'profile': profile, 'cache': cache, 'path': str(path)})
+
+    return caches, installed
+
+
+def cache_signature(path):
+    """Empreinte bon marché d'un cache : mtime du dossier, de ses sous-dossiers
+    directs et des fichiers d'index (sans lister les entrées du cache)"""
+    stamps = []
+    try:
+        stamps.append(os.stat(path).st_mtime_ns)
+        with os.scandir(path) as it:
+            subdirs = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return None
+    for folder in [path] + subdirs:
+        if folder != path:
+            try:
+                stamps.append(os.stat(folder).st_mtime_ns)
+            except OSError:
+                pass
+        for name in INDEX_FILES:
+            try:
+                st = os.stat(os.path.join(folder, name))
+                stamps.append(st.st_mtime_ns ^ st.st_size)
+            except OSError:
+                pass
+    return ":".join(str(stamp) for stamp in stamps)
+
+
+class BrowserCacheIndex:
+    """Tailles des caches au dernier passage, par chemin + empreinte"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_data_dir() / "browser_caches.json"
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def get(self, path, signature):
+        """(fichiers, taille, allouée) si le cache n'a pas changé, sinon None"""
+        entry = self.data.get(os.path.normcase(path))
+        if not entry or signature is None or entry.get('sig') != signature:
+            return None
+        return entry['files'], entry['size'], entry['allocated']
+
+    def update(self, path, signature, files, size, allocated):
+        if signature is None:
+            return
+        self.data[os.path.normcase(path)] = {'sig': signature, 'files': files, 'size': size, 'allocated': allocated}
+
+    def discard(self, path):
+        self.data.pop(os.path.normcase(path), None)
+
+    def prune(self, paths):
+        """Oublier les caches qui n'existent plus (profils supprimés)"""
+        keep = {os.path.normcase(p) for p in paths}
+        self.data = {k: v for k, v in self.data.items() if k in keep}
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, separators=(',', ':'))
+        except OSError:
+            pass
+
+
+def _measure(path, progress):
+    files = 0
+    size = 0
+    allocated = 0
+    cluster = get_cluster_size(path)
+    for filepath, st in iter_files(path, progress=progress):
+        files += 1
+        size += st.st_size
+        allocated += allocated_size(st, cluster, filepath)
+    return files, size, allocated
+
+
+def size_browser_caches(caches, progress=None, index=None, max_workers=4):
+    """Calculer la taille de chaque cache en parallèle (un parcours par cache)
+
+    Complète chaque dict avec 'files', 'size', 'allocated' et 'reused'
+    (True si repris de l'index sans parcours). L'index est mis à jour.
+    """
+    def measure(cache):
+        path = cache['path']
+        signature = cache_signature(path)
+        known = index.get(path, signature) if index is not None else None
+        if known is not None:
+            files, size, allocated = known
+            reused = True
+        else:
+            files, size, allocated = _measure(path, progress)
+            reused = False
+        return signature, files, size, allocated, reused
+
+    workers = max(1, min(max_workers, len(caches)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="browser-cache") as pool:
+        measured = list(pool.map(measure, caches))
+
+    for cache, (signature, files, size, allocated, reused) in zip(caches, measured):
+        cache.update(files=files, size=size, allocated=allocated, reused=reused)
+        if index is not None:
+            index.update(cache['path'], signature, files, size, allocated)
+
+    if index is not None:
+        index.prune([cache['path'] for cache in caches])
+    return caches
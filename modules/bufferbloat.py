@@ -0,0 +1,146 @@
+# modules/bufferbloat.py
+"""
+Bufferbloat - Latence sous charge (lag en jeu pendant un téléchargement)
+Utilisé par : Network Tester (test bufferbloat)
+
+- Latence de référence au repos (ping 50 Hz)
+- Puis latence mesurée pendant que des flux parallèles saturent le lien
+  (download puis upload), via le test de débit et son point de test
+- Latence ajoutée (médiane et p95 en charge - repos) et note A+ à F
+- Fonctionne hors ligne avec le serveur de débit local
+"""
+
+import threading
+
+from modules.net_probes import Pinger, resolve
+from modules.latency_stats import summarize
+from modules.throughput import ThroughputTest, parse_endpoint
+
+PING_INTERVAL = 0.02
+BASELINE_SECONDS = 5
+LOAD_SECONDS = 10
+WARMUP_SECONDS = 2
+
+# (latence ajoutée max en ms, note) ; au-delà : F
+GRADES = [
+    (5, "A+"),
+    (30, "A"),
+    (60, "B"),
+    (200, "C"),
+    (400, "D"),
+]
+
+GRADE_TEXT = {
+    "A+": "Excellent : aucun lag perceptible sous charge",
+    "A": "Très bon : jeu/visio fluides pendant les téléchargements",
+    "B": "Correct : léger lag possible pendant les gros transferts",
+    "C": "Moyen : lag net en jeu quand le réseau est chargé",
+    "D": "Mauvais : jeu/visio difficiles pendant les transferts",
+    "F": "Très mauvais : files d'attente saturées (activez le SQM/QoS de la box)",
+}
+
+
+def grade(added_ms):
+    """Note d'après la latence ajoutée sous charge"""
+    for limit, letter in GRADES:
+        if added_ms < limit:
+            return letter
+    return "F"
+
+
+def _ping_for(target, seconds):
+    """RTT à 50 Hz vers la cible pendant `seconds` s"""
+    count = max(1, int(seconds / PING_INTERVAL))
+    pinger = Pinger(timeout=1.0)
+    return pinger.ping_many([target], count=count, interval=PING_INTERVAL)[target], pinger.method
+
+
+class BufferbloatTest:
+    """Latence au repos puis sous charge download et upload"""
+
+    def __init__(self, endpoint=None, streams=8, ping_target=None):
+        self.endpoint = endpoint
+        self.streams = streams
+        # Par défaut : l'hôte du point de test (même chemin réseau que la charge)
+        self.ping_target = ping_target or parse_endpoint(endpoint)[1]
+        self.active_test = None
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+        if self.active_test:
+            self.active_test.stop()
+
+    def run(self, log=None, progress=None):
+        log = log or (lambda text: None)
+        progress = progress or (lambda percent: None)
+        target = resolve(self.ping_target)
+        if target is None:
+            return {'success': False, 'error': f"Cible introuvable : {self.ping_target}"}
+
+        log(f"  → Latence au repos ({BASELINE_SECONDS} s à 50 Hz vers {self.ping_target})...")
+        rtts, method = _ping_for(target, BASELINE_SECONDS)
+        baseline = summarize(rtts)
+        progress(20)
+        if not baseline['success']:
+            return {'success': False, 'error': "La cible ne répond pas au ping", 'method': method}
+        log(f"    Repos : médiane {baseline['p50']:.1f} ms | p95 {baseline['p95']:.1f} ms")
+
+        report = {'success': True, 'target': self.ping_target, 'method': method,
+                  'baseline': baseline, 'endpoint': self.endpoint, 'streams': self.streams}
+        for step, direction in enumerate(('download', 'upload')):
+            if self._stop.is_set():
+                break
+            label = "download" if direction == 'download' else "upload"
+            log(f"  → Latence pendant un {label} saturant ({self.streams} flux, {LOAD_SECONDS} s)...")
+            report[direction] = self._under_load(target, direction, baseline)
+            progress(60 + step * 40)
+            data = report[direction]
+            if not data['load_ok']:
+                log("    Charge non établie (point de test injoignable) : pas de note")
+                continue
+            log(f"    Sous charge : médiane {data['latency']['p50']:.1f} ms | p95 {data['latency']['p95']:.1f} ms "
+                f"| +{data['added_p50']:.1f} ms | débit {data['mbps']:.1f} Mbps → {data['grade']}")
+
+        graded = [report[d]['grade'] for d in ('download', 'upload') if report.get(d, {}).get('grade')]
+        report['grade'] = max(graded, key=_grade_rank) if graded else None
+        return report
+
+    def _under_load(self, target, direction, baseline):
+        test = ThroughputTest(self.endpoint, streams=self.streams, duration=LOAD_SECONDS,
+                              warmup=WARMUP_SECONDS, direction=direction)
+        self.active_test = test
+        holder = {}
+        load = threading.Thread(target=lambda: holder.update(report=test.run()), daemon=True)
+        load.start()
+        # Les files d'attente se remplissent pendant la montée en charge : mesure après
+        self._stop.wait(WARMUP_SECONDS)
+        # Aucun octet après la montée en charge : point de test injoignable, inutile de pinger
+        loaded = sum(test.counters) > 0 and load.is_alive() and not self._stop.is_set()
+        rtts = _ping_for(target, LOAD_SECONDS - WARMUP_SECONDS - 1)[0] if loaded else []
+        test.stop()
+        load.join(timeout=5)
+        self.active_test = None
+
+        throughput = holder.get('report') or {}
+        if not (loaded and throughput.get('success', False)):
+            # Latence mesurée sans charge réelle : pas de note
+            return {'latency': summarize(rtts), 'added_p50': None, 'added_p95': None,
+                    'mbps': throughput.get('mbps', 0.0), 'load_ok': False, 'grade': None}
+
+        latency = summarize(rtts)
+        added_p50 = max(0.0, latency['p50'] - baseline['p50']) if latency['success'] else float('inf')
+        added_p95 = max(0.0, latency['p95'] - baseline['p95']) if latency['success'] else float('inf')
+        return {
+            'latency': latency,
+            'added_p50': added_p50,
+            'added_p95': added_p95,
+            'mbps': throughput.get('mbps', 0.0),
+            'load_ok': True,
+            'grade': grade(added_p50),
+        }
+
+
+def _grade_rank(letter):
+    order = [letter for _, letter in GRADES] + ["F"]
+    return order.index(letter)
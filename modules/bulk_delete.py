@@ -0,0 +1,393 @@
+# modules/bulk_delete.py
+"""
+Bulk Delete - Moteur de suppression parallèle partagé
+Utilisé par : Nettoyage disque avancé, Nettoyage Windows, Réparateur Windows Update
+
+- Suppression sur un pool borné de threads I/O (unlink = appel bloquant)
+- Progression en octets ET en fichiers (callback limité en fréquence)
+- Fichiers verrouillés : nouvel essai puis suppression au redémarrage
+- Rapport d'échecs par chemin
+- Mode quarantaine optionnel : fichiers déplacés (restaurables) au lieu d'être supprimés
+"""
+
+import os
+import stat
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.disk_walker import get_cluster_size, allocated_size
+
+# Codes d'erreur Windows "fichier en cours d'utilisation"
+ERROR_SHARING_VIOLATION = 32
+ERROR_LOCK_VIOLATION = 33
+LOCKED_ERRORS = (ERROR_SHARING_VIOLATION, ERROR_LOCK_VIOLATION)
+
+MOVEFILE_DELAY_UNTIL_REBOOT = 0x4
+
+# Nombre de fichiers envoyés ensemble à un thread (limite le coût par tâche)
+BATCH_SIZE = 256
+
+
+def new_report():
+    """Rapport de suppression vide"""
+    return {
+        'files': 0,        # fichiers supprimés
+        'dirs': 0,         # dossiers supprimés
+        'size': 0,         # octets supprimés (taille logique)
+        'allocated': 0,    # octets libérés sur disque (clusters)
+        'failed': {},      # chemin -> message d'erreur
+        'scheduled': [],   # chemins programmés pour suppression au redémarrage
+    }
+
+
+def schedule_delete_on_reboot(path):
+    """Programmer la suppression d'un chemin au prochain redémarrage (admin requis)"""
+    if sys.platform != 'win32':
+        return False
+    try:
+        import ctypes
+        return bool(ctypes.windll.kernel32.MoveFileExW(str(path), None, MOVEFILE_DELAY_UNTIL_REBOOT))
+    except Exception:
+        return False
+
+
+class BulkDeleter:
+    """Suppression massive de fichiers sur un pool de threads borné"""
+
+    def __init__(self, max_workers=8, progress_callback=None, progress_interval=0.25,
+                 retries=2, retry_delay=0.5, schedule_on_reboot=True, quarantine=None):
+        self.max_workers = max(1, max_workers)
+        self.progress_callback = progress_callback  # callback(files, size, current_path)
+        self.progress_interval = progress_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.schedule_on_reboot = schedule_on_reboot
+        self.quarantine = quarantine  # QuarantineRun ou None (suppression définitive)
+
+        self._lock = threading.Lock()
+        self._last_progress = 0.0
+        self._report = new_report()
+        self._locked = []
+
+    # ------------------------------------------------------------------
+    # API publique
+    # ------------------------------------------------------------------
+
+    def delete_contents(self, folder, extensions=None):
+        """Vider un dossier (le dossier lui-même est conservé)
+
+        Avec un filtre d'extensions, seuls les fichiers correspondants sont
+        supprimés (récursivement) et l'arborescence est conservée.
+        """
+        return self._run([folder], keep_roots=True, extensions=extensions)
+
+    def delete_tree(self, path):
+        """Supprimer un dossier et tout son contenu"""
+        return self._run([path], keep_roots=False)
+
+    def delete_paths(self, paths):
+        """Supprimer une liste de fichiers et/ou dossiers"""
+        return self._run(paths, keep_roots=False)
+
+    def delete_files(self, files):
+        """Supprimer des fichiers déjà inventoriés : (chemin, stat), sans nouveau stat"""
+        self._delete_entries(files)
+        self._emit_progress(None, force=True)
+        return self._report
+
+    def remove_empty_dirs(self, root, older_than=None, emptied=()):
+        """Supprimer les dossiers vides sous root (root conservé), plus profonds d'abord
+
+        Les dossiers qui contiennent encore des fichiers (conservés, verrouillés)
+        restent en place ; les jonctions ne sont jamais parcourues.
+        `older_than` : un dossier modifié après cet instant est conservé (peut-être
+        créé à l'instant par un programme), sauf s'il est dans `emptied` (vidé par
+        ce nettoyage, d'où sa date récente).
+        """
+        root = os.fspath(root)
+        emptied = set(emptied)
+        stack = [(root, False)]
+        while stack:
+            path, visited = stack.pop()
+            if visited:
+                if path == root:
+                    continue
+                try:
+                    if (older_than is not None and path not in emptied
+                            and os.lstat(path).st_mtime >= older_than):
+                        continue
+                    os.rmdir(path)
+                    self._report['dirs'] += 1
+                    # Le parent vient d'être modifié par ce nettoyage
+                    emptied.add(os.path.dirname(path))
+                except OSError:
+                    pass
+                continue
+            stack.append((path, True))
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False) and not self._is_junction(entry):
+                            stack.append((entry.path, False))
+            except OSError:
+                pass
+        return self._report
+
+    # ------------------------------------------------------------------
+    # Moteur
+    # ------------------------------------------------------------------
+
+    def _run(self, roots, keep_roots, extensions=None):
+        if extensions:
+            extensions = tuple(ext.lower() for ext in extensions)
+
+        # Dossiers à supprimer après leurs fichiers (ordre : plus profonds d'abord)
+        dirs_to_remove = []
+
+        def entries():
+            for root in roots:
+                root = os.fspath(root)
+                try:
+                    st = os.lstat(root)
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    self._fail(root, e)
+                    continue
+
+                if not stat.S_ISDIR(st.st_mode) or self._is_link(root, st):
+                    yield root, st
+                    continue
+
+                for path, file_st in self._walk(root, extensions):
+                    if file_st is None:
+                        dirs_to_remove.append(path)
+                        continue
+                    yield path, file_st
+
+                if not keep_roots:
+                    dirs_to_remove.append(root)
+
+        self._delete_entries(entries())
+
+        # Dossiers vides (le parcours est post-ordre : enfants avant parents)
+        if not extensions:
+            for path in dirs_to_remove:
+                self._remove_dir(path)
+
+        self._emit_progress(None, force=True)
+        return self._report
+
+    def _delete_entries(self, entries):
+        """Répartir (chemin, stat) en lots sur le pool puis traiter les verrouillés"""
+        self._report = new_report()
+        self._locked = []
+        self._last_progress = 0.0
+
+        # Nombre max de lots en vol : borne la mémoire même avec 200k fichiers
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bulk-delete") as pool:
+            batch = []
+
+            def flush():
+                if batch:
+                    in_flight.acquire()
+                    future = pool.submit(self._delete_batch, list(batch))
+                    future.add_done_callback(lambda _: in_flight.release())
+                    batch.clear()
+
+            drive = None
+            cluster = 4096
+            for path, st in entries:
+                if os.path.splitdrive(path)[0] != drive:
+                    drive = os.path.splitdrive(path)[0]
+                    cluster = get_cluster_size(path)
+                batch.append((path, st.st_size, allocated_size(st, cluster, path)))
+                if len(batch) >= BATCH_SIZE:
+                    flush()
+            flush()
+
+        # Fichiers verrouillés : nouvel essai puis redémarrage
+        self._retry_locked()
+
+    def _walk(self, root, extensions):
+        """Parcours post-ordre sans suivre liens/jonctions : (chemin, stat) ; stat None = dossier"""
+        stack = [(root, False)]
+        while stack:
+            path, visited = stack.pop()
+            if visited:
+                if path != root:
+                    yield path, None
+                continue
+
+            stack.append((path, True))
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False) and not self._is_junction(entry):
+                                stack.append((entry.path, False))
+                                continue
+                            if extensions and not entry.name.lower().endswith(extensions):
+                                continue
+                            # stat() est gratuit sous Windows (données de FindNextFile)
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            st = os.stat_result((0,) * 10)
+                        yield entry.path, st
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._fail(path, e)
+
+    def _delete_batch(self, batch):
+        """Supprimer un lot de fichiers (exécuté dans le pool)"""
+        files = 0
+        size = 0
+        allocated = 0
+        for path, file_size, file_allocated in batch:
+            if self._unlink(path, size=file_size):
+                files += 1
+                size += file_size
+                allocated += file_allocated
+
+        with self._lock:
+            self._report['files'] += files
+            self._report['size'] += size
+            self._report['allocated'] += allocated
+        self._emit_progress(batch[-1][0])
+
+    def _discard(self, path, size=None):
+        """Supprimer un fichier, ou le déplacer en quarantaine"""
+        if self.quarantine is not None:
+            self.quarantine.add(path, size)
+        else:
+            os.unlink(path)
+
+    def _unlink(self, path, record_locked=True, size=None):
+        """Supprimer un fichier ; True si supprimé"""
+        try:
+            self._discard(path, size)
+            return True
+        except FileNotFoundError:
+            return False
+        except IsADirectoryError:
+            # Lien symbolique de dossier sous Windows
+            return self._remove_dir(path, count=False)
+        except PermissionError as e:
+            if getattr(e, 'winerror', None) in LOCKED_ERRORS:
+                if record_locked:
+                    with self._lock:
+                        self._locked.append(path)
+                return False
+            # Attribut lecture seule : le retirer puis réessayer
+            try:
+                os.chmod(path, stat.S_IWRITE)
+                self._discard(path, size)
+                return True
+            except OSError as e2:
+                self._fail(path, e2)
+                return False
+        except OSError as e:
+            self._fail(path, e)
+            return False
+
+    def _retry_locked(self):
+        """Réessayer les fichiers verrouillés, sinon programmer au redémarrage"""
+        pending = self._locked
+        cluster = get_cluster_size(pending[0]) if pending else 4096
+        for _ in range(self.retries):
+            if not pending:
+                break
+            time.sleep(self.retry_delay)
+            still_locked = []
+            for path in pending:
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                try:
+                    self._discard(path, st.st_size)
+                    self._report['files'] += 1
+                    self._report['size'] += st.st_size
+                    self._report['allocated'] += allocated_size(st, cluster, path)
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    still_locked.append(path)
+            pending = still_locked
+
+        for path in pending:
+            if self.schedule_on_reboot and schedule_delete_on_reboot(path):
+                self._report['scheduled'].append(path)
+            else:
+                self._report['failed'][path] = "Fichier en cours d'utilisation"
+        self._locked = []
+
+    def _remove_dir(self, path, count=True):
+        """Supprimer un dossier vide"""
+        try:
+            os.rmdir(path)
+            if count:
+                self._report['dirs'] += 1
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            # Dossier contenant des fichiers programmés : à supprimer après eux
+            if self._report['scheduled'] and self.schedule_on_reboot and schedule_delete_on_reboot(path):
+                self._report['scheduled'].append(path)
+            elif path not in self._report['failed']:
+                self._fail(path, e)
+            return False
+
+    def _fail(self, path, error):
+        with self._lock:
+            self._report['failed'][os.fspath(path)] = getattr(error, 'strerror', None) or str(error)
+
+    def _emit_progress(self, current_path, force=False):
+        if not self.progress_callback:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_progress < self.progress_interval:
+                return
+            self._last_progress = now
+            files = self._report['files']
+            size = self._report['size']
+        try:
+            self.progress_callback(files, size, current_path)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_junction(entry):
+        """Jonction NTFS (traitée comme un lien, jamais parcourue)"""
+        if entry.is_symlink():
+            return True
+        try:
+            attrs = entry.stat(follow_symlinks=False).st_file_attributes
+            return bool(attrs & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+        except (AttributeError, OSError):
+            return False
+
+    @staticmethod
+    def _is_link(path, st):
+        if stat.S_ISLNK(st.st_mode):
+            return True
+        attrs = getattr(st, 'st_file_attributes', 0)
+        return bool(attrs & getattr(stat, 'FILE_ATTRIBUTE_REPARSE_POINT', 0x400))
+
+
+def summarize_failures(report, limit=5):
+    """Lignes de log décrivant les échecs d'un rapport"""
+    lines = []
+    failed = report.get('failed', {})
+    for path, message in list(failed.items())[:limit]:
+        lines.append(f"      ✗ {path} : {message}")
+    if len(failed) > limit:
+        lines.append(f"      ... et {len(failed) - limit} autres échecs")
+    return lines
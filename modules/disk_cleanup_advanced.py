@@ -6,17 +6,26 @@ Supporte : Navigateurs, Gaming, Windows.old, WinSxS, Fichiers volumineux, Doublo
 
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
                             QTextEdit, QProgressBar, QMessageBox, QCheckBox, QGroupBox,
-                            QScrollArea, QWidget, QTableWidget, QTableWidgetItem, QHeaderView)
+                            QScrollArea, QWidget, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QTreeWidget, QTreeWidgetItem, QComboBox, QFileDialog)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
 import os
-import shutil
 import subprocess
 from pathlib import Path
 from datetime import datetime
 import hashlib
 from collections import defaultdict
 
+from modules.bulk_delete import BulkDeleter, summarize_failures
+from modules.retention_policy import RetentionPolicy, LOG_RETENTION, describe_policy
+from modules.browser_caches import discover_browser_caches, size_browser_caches, BrowserCacheIndex
+from modules.disk_forecast import DiskHistory, forecast_volume, category_growth, format_forecast
+from modules.winsxs_analysis import WinSxSCache, run_analysis, format_age
+from modules.quarantine import QuarantineStore, quarantine_enabled, set_quarantine_enabled, load_settings, describe_run
+from modules.disk_walker import (SizeTreeScanner, SizeTreeCache, ScanProgress, ScanEstimates, iter_files,
+                                 get_cluster_size, allocated_size, get_free_space)
+
 # Flags pour subprocess (masquer CMD)
 import sys
 if sys.platform == 'win32':
@@ -28,11 +37,16 @@ else:
     CREATE_NO_WINDOW = 0
     STARTUPINFO = None
 
+# Catégories analysées seulement (rien n'est supprimé)
+SCAN_ONLY_CATEGORIES = ('large_files', 'duplicates')
+
 
 class DiskCleanupWorker(QThread):
     """Worker pour analyse et nettoyage disque"""
     log_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int)
+    status_signal = pyqtSignal(str)
+    scan_signal = pyqtSignal(int, float, str)  # fichiers vus, octets comptés, dossier courant
     category_signal = pyqtSignal(str, int, int)  # category, files, size_mb
     finished_signal = pyqtSignal(dict)
     
@@ -41,6 +55,17 @@ class DiskCleanupWorker(QThread):
         self.categories = categories
         self.mode = mode  # "analyze" ou "clean"
         self.results = {}
+        self.category_index = 0
+        self.last_percent = 0
+        
+        # Progression live du scan (limitée à ~4 notifications/s)
+        self.scan_progress = ScanProgress(self.on_scan_progress, interval=0.25)
+        self.estimates = ScanEstimates()
+        self.estimated_files = 0
+        
+        # Passage de quarantaine (mode nettoyage, si activé)
+        self.quarantine_store = None
+        self.quarantine_run = None
     
     def run(self):
         """Exécuter l'analyse ou le nettoyage"""
@@ -53,10 +78,25 @@ class DiskCleanupWorker(QThread):
             self.log_signal.emit("╚" + "═"*70 + "╝\n")
             
             total_categories = len(self.categories)
+            free_before = self.measure_free_space() if self.mode == "clean" else None
+            
+            if self.mode == "clean" and quarantine_enabled():
+                self.quarantine_store = QuarantineStore()
+                self.quarantine_run = self.quarantine_store.begin("Nettoyage disque avancé")
+                days = load_settings()['max_age_days']
+                self.log_signal.emit(f"♻️ Mode quarantaine : fichiers restaurables pendant {days} jours\n")
+            
+            # Estimation du total d'après le dernier passage
+            known = [self.estimates.get(c) for c in self.categories]
+            if all(known):
+                self.estimated_files = sum(files for files, _ in known)
             
             for i, category in enumerate(self.categories):
-                progress = int((i / total_categories) * 100)
-                self.progress_signal.emit(progress)
+                self.category_index = i
+                if not self.estimated_files:
+                    self.emit_progress((i / total_categories) * 100)
+                files_before = self.scan_progress.files
+                size_before = self.scan_progress.size
                 
                 if category == "browsers":
                     self.handle_browsers()
@@ -74,7 +114,27 @@ class DiskCleanupWorker(QThread):
                     self.handle_logs()
                 elif category == "windows_store":
                     self.handle_windows_store()
+                
+                self.estimates.update(
+                    category,
+                    self.scan_progress.files - files_before,
+                    self.scan_progress.size - size_before
+                )
+                # Historique des tailles (prévision de remplissage) : après un
+                # nettoyage, taille trouvée avant et taille restante après
+                result = self.results.get(category) or {}
+                if self.mode == "clean" and category not in SCAN_ONLY_CATEGORIES:
+                    found = result.get('found', result.get('size', 0))
+                    self.estimates.record_size(category, found, max(0, found - result.get('size', 0)))
+                else:
+                    self.estimates.record_size(category, result.get('size', 0))
             
+            self.scan_progress.flush()
+            self.estimates.save()
+            if self.quarantine_run is not None:
+                self.finish_quarantine()
+            if free_before is not None:
+                self.verify_reclaimed_space(free_before)
             self.progress_signal.emit(100)
             self.finished_signal.emit(self.results)
         
@@ -82,65 +142,90 @@ class DiskCleanupWorker(QThread):
             self.log_signal.emit(f"❌ Erreur: {str(e)}")
             self.finished_signal.emit({'error': str(e)})
     
+    def emit_progress(self, percent):
+        """Progression monotone (scan et suppression ne la font jamais reculer)"""
+        percent = max(self.last_percent, min(100, int(percent)))
+        if percent != self.last_percent:
+            self.last_percent = percent
+            self.progress_signal.emit(percent)
+    
+    def on_scan_progress(self, files, size, current_dir):
+        """Notification limitée en fréquence depuis le parcours disque"""
+        self.scan_signal.emit(files, float(size), current_dir)
+        if self.estimated_files:
+            # Plafonné à 99% : l'estimation vient du passage précédent
+            self.emit_progress(min(99, files / self.estimated_files * 100))
+        else:
+            total_categories = max(1, len(self.categories))
+            self.emit_progress(self.category_index / total_categories * 100)
+    
     def handle_browsers(self):
-        """Nettoyer cache navigateurs"""
+        """Nettoyer cache navigateurs (tous profils, tous types de cache)"""
         self.log_signal.emit("\n📁 NAVIGATEURS")
         self.log_signal.emit("─" * 70)
         
-        browsers = {
-            'Chrome': Path(os.environ.get('LOCALAPPDATA', '')) / 'Google' / 'Chrome' / 'User Data' / 'Default' / 'Cache',
-            'Edge': Path(os.environ.get('LOCALAPPDATA', '')) / 'Microsoft' / 'Edge' / 'User Data' / 'Default' / 'Cache',
-            'Firefox': Path(os.environ.get('APPDATA', '')) / 'Mozilla' / 'Firefox' / 'Profiles',
-            'Brave': Path(os.environ.get('LOCALAPPDATA', '')) / 'BraveSoftware' / 'Brave-Browser' / 'User Data' / 'Default' / 'Cache'
-        }
-        
         total_files = 0
         total_size = 0
+        total_allocated = 0
+        total_found = 0  # taille trouvée avant nettoyage
         
-        for browser, cache_path in browsers.items():
-            try:
-                if not cache_path.exists():
+        try:
+            caches, installed = discover_browser_caches()
+            for browser in ('Chrome', 'Edge', 'Firefox', 'Brave'):
+                if browser not in installed:
                     self.log_signal.emit(f"  ○ {browser}: Non installé")
-                    continue
-                
-                # Firefox a une structure différente
-                if browser == "Firefox":
-                    profile_dirs = list(cache_path.glob("*.default*"))
-                    if not profile_dirs:
-                        self.log_signal.emit(f"  ○ {browser}: Aucun profil trouvé")
-                        continue
-                    cache_path = profile_dirs[0] / 'cache2'
-                
-                if not cache_path.exists():
+            
+            # Tailles en parallèle, caches inchangés repris du dernier passage
+            index = BrowserCacheIndex()
+            size_browser_caches(caches, progress=self.scan_progress, index=index)
+            
+            by_browser = defaultdict(list)
+            for cache in caches:
+                by_browser[cache['browser']].append(cache)
+            
+            for browser in installed:
+                browser_caches = [c for c in by_browser[browser] if c['files'] > 0]
+                if not browser_caches:
                     self.log_signal.emit(f"  ○ {browser}: Cache vide")
                     continue
                 
-                # Compter fichiers et taille
-                files, size = self.count_items(cache_path)
+                files = sum(c['files'] for c in browser_caches)
+                size = sum(c['size'] for c in browser_caches)
+                allocated = sum(c['allocated'] for c in browser_caches)
+                profiles = len({c['profile'] for c in browser_caches})
+                self.log_signal.emit(
+                    f"  → {browser}: {files} fichiers ({size / (1024**2):.1f} Mo, "
+                    f"{allocated / (1024**2):.1f} Mo sur disque) • {profiles} profil(s)"
+                )
+                total_found += size
+                for cache in browser_caches:
+                    reused = " (inchangé)" if cache['reused'] else ""
+                    self.log_signal.emit(
+                        f"      {cache['profile']} / {cache['cache']} : {cache['files']} fichiers, "
+                        f"{cache['size'] / (1024**2):.1f} Mo{reused}"
+                    )
                 
-                if files > 0:
-                    size_mb = size / (1024**2)
-                    self.log_signal.emit(f"  → {browser}: {files} fichiers ({size_mb:.1f} Mo)")
-                    
-                    if self.mode == "clean":
-                        self.log_signal.emit(f"    🧹 Nettoyage en cours...")
-                        deleted = self.delete_folder_contents(cache_path)
-                        if deleted:
-                            self.log_signal.emit(f"    ✅ {browser} nettoyé")
-                            total_files += files
-                            total_size += size
-                        else:
-                            self.log_signal.emit(f"    ⚠️ Certains fichiers en cours d'utilisation")
-                    else:
-                        total_files += files
-                        total_size += size
+                if self.mode == "clean":
+                    self.log_signal.emit(f"    🧹 Nettoyage en cours...")
+                    for cache in browser_caches:
+                        report = self.delete_folder_contents(cache['path'], expected_size=cache['size'])
+                        self.log_deletion_report(f"{browser} {cache['profile']} / {cache['cache']}", report)
+                        index.discard(cache['path'])
+                        total_files += report['files']
+                        total_size += report['size']
+                        total_allocated += report['allocated']
                 else:
-                    self.log_signal.emit(f"  ○ {browser}: Cache vide")
+                    total_files += files
+                    total_size += size
+                    total_allocated += allocated
             
-            except Exception as e:
-                self.log_signal.emit(f"  ❌ {browser}: Erreur - {str(e)}")
+            index.save()
         
-        self.results['browsers'] = {'files': total_files, 'size': total_size}
+        except Exception as e:
+            self.log_signal.emit(f"  ❌ Navigateurs: Erreur - {str(e)}")
+        
+        self.results['browsers'] = {'files': total_files, 'size': total_size, 'allocated': total_allocated,
+                                    'found': total_found}
         self.category_signal.emit("Navigateurs", total_files, int(total_size / (1024**2)))
     
     def handle_gaming(self):
@@ -158,6 +243,8 @@ class DiskCleanupWorker(QThread):
         
         total_files = 0
         total_size = 0
+        total_allocated = 0
+        total_found = 0  # taille trouvée avant nettoyage
         
         for name, cache_path in gaming_caches.items():
             try:
@@ -165,31 +252,32 @@ class DiskCleanupWorker(QThread):
                     self.log_signal.emit(f"  ○ {name}: Non trouvé")
                     continue
                 
-                files, size = self.count_items(cache_path)
+                files, size, allocated = self.count_items(cache_path)
                 
                 if files > 0:
                     size_mb = size / (1024**2)
-                    self.log_signal.emit(f"  → {name}: {files} fichiers ({size_mb:.1f} Mo)")
+                    self.log_signal.emit(f"  → {name}: {files} fichiers ({size_mb:.1f} Mo, {allocated / (1024**2):.1f} Mo sur disque)")
+                    total_found += size
                     
                     if self.mode == "clean":
                         self.log_signal.emit(f"    🧹 Nettoyage en cours...")
-                        deleted = self.delete_folder_contents(cache_path)
-                        if deleted:
-                            self.log_signal.emit(f"    ✅ {name} nettoyé")
-                            total_files += files
-                            total_size += size
-                        else:
-                            self.log_signal.emit(f"    ⚠️ Certains fichiers en cours d'utilisation")
+                        report = self.delete_folder_contents(cache_path, expected_size=size)
+                        self.log_deletion_report(name, report)
+                        total_files += report['files']
+                        total_size += report['size']
+                        total_allocated += report['allocated']
                     else:
                         total_files += files
                         total_size += size
+                        total_allocated += allocated
                 else:
                     self.log_signal.emit(f"  ○ {name}: Cache vide")
             
             except Exception as e:
                 self.log_signal.emit(f"  ❌ {name}: Erreur - {str(e)}")
         
-        self.results['gaming'] = {'files': total_files, 'size': total_size}
+        self.results['gaming'] = {'files': total_files, 'size': total_size, 'allocated': total_allocated,
+                                  'found': total_found}
         self.category_signal.emit("Gaming", total_files, int(total_size / (1024**2)))
     
     def handle_windows_old(self):
@@ -201,15 +289,15 @@ class DiskCleanupWorker(QThread):
         
         if not windows_old.exists():
             self.log_signal.emit("  ○ Aucun dossier Windows.old trouvé")
-            self.results['windows_old'] = {'files': 0, 'size': 0}
+            self.results['windows_old'] = {'files': 0, 'size': 0, 'allocated': 0}
             self.category_signal.emit("Windows.old", 0, 0)
             return
         
         try:
-            files, size = self.count_items(windows_old)
+            files, size, allocated = self.count_items(windows_old)
             size_gb = size / (1024**3)
             
-            self.log_signal.emit(f"  → Windows.old trouvé: {size_gb:.2f} Go")
+            self.log_signal.emit(f"  → Windows.old trouvé: {size_gb:.2f} Go ({allocated / (1024**3):.2f} Go sur disque)")
             
             if self.mode == "clean":
                 self.log_signal.emit(f"    🧹 Suppression en cours (peut prendre plusieurs minutes)...")
@@ -233,26 +321,28 @@ class DiskCleanupWorker(QThread):
                         startupinfo=STARTUPINFO
                     )
                     
-                    shutil.rmtree(windows_old, ignore_errors=True)
+                    # Windows.old est déjà une copie de restauration : pas de quarantaine
+                    report = self.make_deleter(size, quarantine=False).delete_tree(windows_old)
                     
                     if not windows_old.exists():
                         self.log_signal.emit(f"    ✅ Windows.old supprimé ({size_gb:.2f} Go libérés)")
-                        self.results['windows_old'] = {'files': files, 'size': size}
                     else:
                         self.log_signal.emit(f"    ⚠️ Suppression partielle (redémarrage peut être nécessaire)")
-                        self.results['windows_old'] = {'files': 0, 'size': 0}
+                        self.log_deletion_report("Windows.old", report)
+                    self.results['windows_old'] = {'files': report['files'], 'size': report['size'],
+                                                   'allocated': report['allocated'], 'found': size}
                 
                 except Exception as e:
                     self.log_signal.emit(f"    ❌ Erreur: {str(e)}")
-                    self.results['windows_old'] = {'files': 0, 'size': 0}
+                    self.results['windows_old'] = {'files': 0, 'size': 0, 'allocated': 0, 'found': size}
             else:
-                self.results['windows_old'] = {'files': files, 'size': size}
+                self.results['windows_old'] = {'files': files, 'size': size, 'allocated': allocated}
             
             self.category_signal.emit("Windows.old", files, int(size / (1024**2)))
         
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
-            self.results['windows_old'] = {'files': 0, 'size': 0}
+            self.results['windows_old'] = {'files': 0, 'size': 0, 'allocated': 0}
             self.category_signal.emit("Windows.old", 0, 0)
     
     def handle_winsxs(self):
@@ -264,40 +354,39 @@ class DiskCleanupWorker(QThread):
         
         if not winsxs.exists():
             self.log_signal.emit("  ○ WinSxS non trouvé (normal si Windows récent)")
-            self.results['winsxs'] = {'files': 0, 'size': 0}
+            self.results['winsxs'] = {'files': 0, 'size': 0, 'allocated': 0}
             self.category_signal.emit("WinSxS", 0, 0)
             return
         
         try:
-            # Analyser taille WinSxS
-            result = subprocess.run(
-                ["Dism.exe", "/Online", "/Cleanup-Image", "/AnalyzeComponentStore"],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=STARTUPINFO,
-                encoding="utf-8",
-                errors="replace"
-            )
+            # Analyse DISM mise en cache : relancée en arrière-plan par la fenêtre
+            # (analyse) ou ici avant nettoyage, seulement après une maintenance
+            cache = WinSxSCache()
+            analysis = cache.load()
+            fresh = WinSxSCache.is_fresh(analysis)
             
-            # Extraire la taille récupérable
-            reclaimable_size = 0
-            for line in result.stdout.split('\n'):
-                if "Taille de nettoyage recommandée" in line or "recommended" in line.lower():
-                    try:
-                        # Extraire le nombre
-                        import re
-                        match = re.search(r'(\d+[\.,]?\d*)\s*(Mo|Go|MB|GB)', line, re.IGNORECASE)
-                        if match:
-                            value = float(match.group(1).replace(',', '.'))
-                            unit = match.group(2).upper()
-                            if 'G' in unit:
-                                reclaimable_size = int(value * 1024)  # Convertir en Mo
-                            else:
-                                reclaimable_size = int(value)
-                    except:
-                        pass
+            if self.mode == "clean" and not fresh:
+                self.log_signal.emit("  → Analyse du magasin de composants (DISM)...")
+                analysis = run_analysis()
+                if analysis:
+                    cache.save(analysis)
+                    fresh = True
+            
+            if not analysis:
+                if self.mode == "clean":
+                    self.log_signal.emit("  ❌ Analyse DISM impossible")
+                else:
+                    self.log_signal.emit("  ⏳ Première analyse DISM en arrière-plan (1 à 5 minutes)...")
+                self.results['winsxs'] = {'files': 0, 'size': 0, 'allocated': 0}
+                self.category_signal.emit("WinSxS", 0, 0)
+                return
+            
+            reclaimable_size = analysis.get('reclaimable_mb', 0)
+            age = format_age(analysis.get('timestamp'))
+            if fresh:
+                self.log_signal.emit(f"  ○ Analyse DISM {age} (aucune maintenance depuis)")
+            else:
+                self.log_signal.emit(f"  ○ Analyse DISM {age} — maintenance détectée, mise à jour en arrière-plan")
             
             if reclaimable_size > 0:
                 self.log_signal.emit(f"  → Espace récupérable: {reclaimable_size} Mo")
@@ -317,24 +406,27 @@ class DiskCleanupWorker(QThread):
                         errors="replace"
                     )
                     
+                    # Le magasin a changé : la prochaine analyse doit relancer DISM
+                    cache.clear()
+                    
                     if clean_result.returncode == 0:
                         self.log_signal.emit(f"    ✅ WinSxS nettoyé ({reclaimable_size} Mo libérés)")
-                        self.results['winsxs'] = {'files': 0, 'size': reclaimable_size * (1024**2)}
+                        self.results['winsxs'] = {'files': 0, 'size': reclaimable_size * (1024**2), 'allocated': reclaimable_size * (1024**2)}
                     else:
                         self.log_signal.emit(f"    ❌ Échec nettoyage WinSxS")
-                        self.results['winsxs'] = {'files': 0, 'size': 0}
+                        self.results['winsxs'] = {'files': 0, 'size': 0, 'allocated': 0}
                 else:
-                    self.results['winsxs'] = {'files': 0, 'size': reclaimable_size * (1024**2)}
+                    self.results['winsxs'] = {'files': 0, 'size': reclaimable_size * (1024**2), 'allocated': reclaimable_size * (1024**2)}
                 
                 self.category_signal.emit("WinSxS", 0, reclaimable_size)
             else:
                 self.log_signal.emit("  ○ Aucun nettoyage WinSxS recommandé")
-                self.results['winsxs'] = {'files': 0, 'size': 0}
+                self.results['winsxs'] = {'files': 0, 'size': 0, 'allocated': 0}
                 self.category_signal.emit("WinSxS", 0, 0)
         
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
-            self.results['winsxs'] = {'files': 0, 'size': 0}
+            self.results['winsxs'] = {'files': 0, 'size': 0, 'allocated': 0}
             self.category_signal.emit("WinSxS", 0, 0)
     
     def handle_large_files(self):
@@ -343,6 +435,7 @@ class DiskCleanupWorker(QThread):
         self.log_signal.emit("─" * 70)
         
         large_files = []
+        total_allocated = 0
         min_size = 500 * 1024 * 1024  # 500 MB
         
         # Chercher dans Downloads, Documents, Desktop
@@ -359,18 +452,11 @@ class DiskCleanupWorker(QThread):
             if not search_path.exists():
                 continue
             
-            try:
-                for file in search_path.rglob("*"):
-                    if file.is_file():
-                        try:
-                            size = file.stat().st_size
-                            if size > min_size:
-                                size_mb = size / (1024**2)
-                                large_files.append((str(file), size, size_mb))
-                        except:
-                            pass
-            except:
-                pass
+            cluster = get_cluster_size(search_path)
+            for filepath, st in iter_files(search_path, progress=self.scan_progress):
+                if st.st_size > min_size:
+                    large_files.append((filepath, st.st_size, st.st_size / (1024**2)))
+                    total_allocated += allocated_size(st, cluster, filepath)
         
         # Trier par taille
         large_files.sort(key=lambda x: x[1], reverse=True)
@@ -397,7 +483,7 @@ class DiskCleanupWorker(QThread):
         else:
             self.log_signal.emit("  ○ Aucun fichier > 500 MB trouvé")
         
-        self.results['large_files'] = {'files': len(large_files), 'size': total_size, 'list': large_files[:20]}
+        self.results['large_files'] = {'files': len(large_files), 'size': total_size, 'allocated': total_allocated, 'list': large_files[:20]}
         self.category_signal.emit("Fichiers volumineux", len(large_files), int(total_size / (1024**2)))
     
     def handle_duplicates(self):
@@ -410,7 +496,7 @@ class DiskCleanupWorker(QThread):
         
         if not search_path.exists():
             self.log_signal.emit("  ○ Dossier Downloads non trouvé")
-            self.results['duplicates'] = {'files': 0, 'size': 0}
+            self.results['duplicates'] = {'files': 0, 'size': 0, 'allocated': 0}
             self.category_signal.emit("Doublons", 0, 0)
             return
         
@@ -419,38 +505,36 @@ class DiskCleanupWorker(QThread):
         # Dict: hash -> [liste de fichiers]
         hashes = defaultdict(list)
         
-        try:
-            for file in search_path.rglob("*"):
-                if file.is_file() and file.stat().st_size > 1024:  # Ignorer fichiers < 1 KB
-                    try:
-                        # Hash rapide basé sur taille + premiers/derniers bytes
-                        size = file.stat().st_size
-                        with open(file, 'rb') as f:
-                            # Lire premiers 8KB
-                            first_chunk = f.read(8192)
-                            # Sauter au milieu
-                            if size > 16384:
-                                f.seek(size // 2)
-                                middle_chunk = f.read(8192)
-                            else:
-                                middle_chunk = b''
-                            # Lire derniers 8KB
-                            if size > 8192:
-                                f.seek(-8192, 2)
-                                last_chunk = f.read()
-                            else:
-                                last_chunk = b''
-                        
-                        # Hash combiné
-                        quick_hash = hashlib.md5(
-                            str(size).encode() + first_chunk + middle_chunk + last_chunk
-                        ).hexdigest()
-                        
-                        hashes[quick_hash].append((str(file), size))
-                    except:
-                        pass
-        except:
-            pass
+        for file, st in iter_files(search_path, progress=self.scan_progress):
+            size = st.st_size
+            if size <= 1024:  # Ignorer fichiers < 1 KB
+                continue
+            try:
+                # Hash rapide basé sur taille + premiers/derniers bytes
+                with open(file, 'rb') as f:
+                    # Lire premiers 8KB
+                    first_chunk = f.read(8192)
+                    # Sauter au milieu
+                    if size > 16384:
+                        f.seek(size // 2)
+                        middle_chunk = f.read(8192)
+                    else:
+                        middle_chunk = b''
+                    # Lire derniers 8KB
+                    if size > 8192:
+                        f.seek(-8192, 2)
+                        last_chunk = f.read()
+                    else:
+                        last_chunk = b''
+                
+                # Hash combiné
+                quick_hash = hashlib.md5(
+                    str(size).encode() + first_chunk + middle_chunk + last_chunk
+                ).hexdigest()
+                
+                hashes[quick_hash].append((file, size))
+            except:
+                pass
         
         # Trouver doublons
         duplicates = []
@@ -487,7 +571,9 @@ class DiskCleanupWorker(QThread):
         else:
             self.log_signal.emit("  ○ Aucun doublon trouvé dans Downloads")
         
-        self.results['duplicates'] = {'files': len(duplicates), 'size': wasted_space, 'list': duplicates[:10]}
+        cluster = get_cluster_size(search_path)
+        wasted_allocated = sum(-(-size // cluster) * cluster * (len(files) - 1) for files, size in duplicates)
+        self.results['duplicates'] = {'files': len(duplicates), 'size': wasted_space, 'allocated': wasted_allocated, 'list': duplicates[:10]}
         self.category_signal.emit("Doublons", len(duplicates), int(wasted_space / (1024**2)))
     
     def handle_logs(self):
@@ -503,33 +589,54 @@ class DiskCleanupWorker(QThread):
         
         total_files = 0
         total_size = 0
+        total_allocated = 0
+        total_found = 0  # taille trouvée avant nettoyage
+        
+        # Politique de conservation compilée une fois pour toutes les racines
+        policy = RetentionPolicy(LOG_RETENTION)
+        self.log_signal.emit("  Règles de conservation :")
+        for line in describe_policy(LOG_RETENTION):
+            self.log_signal.emit(line)
         
         for log_path in log_paths:
             if not log_path.exists():
                 continue
             
             try:
-                files, size = self.count_items(log_path, extensions=['.log', '.dmp', '.etl'])
+                selection = policy.evaluate(log_path, progress=self.scan_progress, collect=(self.mode == "clean"))
+                files = selection['files']
+                size = selection['size']
+                allocated = selection['allocated']
+                total_found += size
                 
                 if files > 0:
                     size_mb = size / (1024**2)
-                    self.log_signal.emit(f"  → {log_path.name}: {files} fichiers ({size_mb:.1f} Mo)")
+                    self.log_signal.emit(f"  → {log_path.name}: {files} fichiers expirés ({size_mb:.1f} Mo, {allocated / (1024**2):.1f} Mo sur disque)")
+                    for rule_name, stats in selection['by_rule'].items():
+                        if stats['files']:
+                            self.log_signal.emit(f"      • {rule_name}: {stats['files']} fichiers ({stats['size'] / (1024**2):.1f} Mo)")
+                    if selection['kept']:
+                        self.log_signal.emit(f"      ○ {selection['kept']} fichiers récents conservés")
                     
                     if self.mode == "clean":
                         self.log_signal.emit(f"    🧹 Nettoyage en cours...")
-                        deleted = self.delete_folder_contents(log_path, extensions=['.log', '.dmp', '.etl'])
-                        if deleted:
-                            self.log_signal.emit(f"    ✅ Logs nettoyés")
-                            total_files += files
-                            total_size += size
+                        report = self.make_deleter(size).delete_files(selection['candidates'])
+                        self.log_deletion_report("Logs", report)
+                        total_files += report['files']
+                        total_size += report['size']
+                        total_allocated += report['allocated']
                     else:
                         total_files += files
                         total_size += size
+                        total_allocated += allocated
+                elif selection['kept']:
+                    self.log_signal.emit(f"  ○ {log_path.name}: {selection['kept']} fichiers récents conservés")
             
             except Exception as e:
                 self.log_signal.emit(f"  ❌ {log_path.name}: Erreur - {str(e)}")
         
-        self.results['logs'] = {'files': total_files, 'size': total_size}
+        self.results['logs'] = {'files': total_files, 'size': total_size, 'allocated': total_allocated,
+                                'found': total_found}
         self.category_signal.emit("Logs", total_files, int(total_size / (1024**2)))
     
     def handle_windows_store(self):
@@ -541,16 +648,16 @@ class DiskCleanupWorker(QThread):
         
         if not store_cache.exists():
             self.log_signal.emit("  ○ Cache Windows Store non trouvé")
-            self.results['windows_store'] = {'files': 0, 'size': 0}
+            self.results['windows_store'] = {'files': 0, 'size': 0, 'allocated': 0}
             self.category_signal.emit("Windows Store", 0, 0)
             return
         
         try:
-            files, size = self.count_items(store_cache)
+            files, size, allocated = self.count_items(store_cache)
             
             if files > 0:
                 size_mb = size / (1024**2)
-                self.log_signal.emit(f"  → Cache trouvé: {files} fichiers ({size_mb:.1f} Mo)")
+                self.log_signal.emit(f"  → Cache trouvé: {files} fichiers ({size_mb:.1f} Mo, {allocated / (1024**2):.1f} Mo sur disque)")
                 
                 if self.mode == "clean":
                     self.log_signal.emit(f"    🧹 Nettoyage en cours...")
@@ -564,64 +671,519 @@ class DiskCleanupWorker(QThread):
                             startupinfo=STARTUPINFO
                         )
                         self.log_signal.emit(f"    ✅ Cache Windows Store nettoyé")
-                        self.results['windows_store'] = {'files': files, 'size': size}
+                        self.results['windows_store'] = {'files': files, 'size': size, 'allocated': allocated}
                     except Exception as e:
                         self.log_signal.emit(f"    ⚠️ Erreur: {str(e)}")
-                        self.results['windows_store'] = {'files': 0, 'size': 0}
+                        self.results['windows_store'] = {'files': 0, 'size': 0, 'allocated': 0, 'found': size}
                 else:
-                    self.results['windows_store'] = {'files': files, 'size': size}
+                    self.results['windows_store'] = {'files': files, 'size': size, 'allocated': allocated}
                 
                 self.category_signal.emit("Windows Store", files, int(size / (1024**2)))
             else:
                 self.log_signal.emit("  ○ Cache vide")
-                self.results['windows_store'] = {'files': 0, 'size': 0}
+                self.results['windows_store'] = {'files': 0, 'size': 0, 'allocated': 0}
                 self.category_signal.emit("Windows Store", 0, 0)
         
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
-            self.results['windows_store'] = {'files': 0, 'size': 0}
+            self.results['windows_store'] = {'files': 0, 'size': 0, 'allocated': 0}
             self.category_signal.emit("Windows Store", 0, 0)
     
     def count_items(self, path, extensions=None):
-        """Compter fichiers et taille totale"""
+        """Compter fichiers, taille logique et taille allouée (clusters)"""
         total_files = 0
         total_size = 0
+        total_allocated = 0
+        cluster = get_cluster_size(path)
         
+        for filepath, st in iter_files(path, extensions, self.scan_progress):
+            total_size += st.st_size
+            total_allocated += allocated_size(st, cluster, filepath)
+            total_files += 1
+        
+        return total_files, total_size, total_allocated
+    
+    def measure_free_space(self):
+        """Espace libre des volumes concernés (système + profil utilisateur)"""
+        volumes = {os.environ.get('SystemDrive', 'C:') + os.sep, Path.home().anchor or os.sep}
+        return {volume: get_free_space(volume) for volume in volumes}
+    
+    def verify_reclaimed_space(self, free_before):
+        """Comparer l'espace estimé (clusters) à l'espace libre réellement gagné"""
+        free_after = self.measure_free_space()
+        measured = 0
+        for volume, before in free_before.items():
+            after = free_after.get(volume)
+            if before is not None and after is not None:
+                measured += after - before
+        
+        # Fichiers volumineux et doublons : scan seulement, rien n'est supprimé
+        estimated = sum(
+            data.get('allocated', 0) for category, data in self.results.items()
+            if isinstance(data, dict) and category not in SCAN_ONLY_CATEGORIES
+        )
+        self.results['verification'] = {'estimated': estimated, 'measured': measured}
+        
+        self.log_signal.emit("\n📏 VÉRIFICATION ESPACE LIBÉRÉ")
+        self.log_signal.emit("─" * 70)
+        self.log_signal.emit(f"  → Estimé (clusters): {estimated / (1024**2):.1f} Mo")
+        self.log_signal.emit(f"  → Mesuré (espace libre): {measured / (1024**2):.1f} Mo")
+        if estimated > 0:
+            gap = (measured - estimated) / estimated * 100
+            self.log_signal.emit(f"  → Écart: {gap:+.1f}%")
+            if self.quarantine_run is not None:
+                self.log_signal.emit("  ℹ️ Quarantaine : l'espace est libéré à l'expiration des fichiers")
+            elif abs(gap) > 20:
+                self.log_signal.emit("  ℹ️ Écart important : autres écritures disque, corbeille, ou suppressions différées au redémarrage")
+    
+    def finish_quarantine(self):
+        """Enregistrer le passage puis consolider/expirer la quarantaine"""
+        manifest = self.quarantine_run.commit()
+        if manifest:
+            self.log_signal.emit(f"\n♻️ QUARANTAINE : {describe_run(manifest)}")
+        self.status_signal.emit("♻️ Consolidation de la quarantaine...")
         try:
-            for item in path.rglob("*"):
-                if item.is_file():
-                    # Filtrer par extension si spécifié
-                    if extensions:
-                        if item.suffix.lower() not in extensions:
-                            continue
-                    
-                    try:
-                        total_size += item.stat().st_size
-                        total_files += 1
-                    except:
-                        pass
-        except:
-            pass
-        
-        return total_files, total_size
+            stats = self.quarantine_store.maintain()
+            self.log_signal.emit(
+                f"  → {stats['deduplicated']} doublons fusionnés, {stats['compressed']} fichiers compressés, "
+                f"{stats['expired']} passages expirés"
+            )
+        except OSError as e:
+            self.log_signal.emit(f"  ⚠️ Consolidation interrompue : {e}")
+    
+    def make_deleter(self, expected_size=0, quarantine=True):
+        """Moteur de suppression relié à la progression de la catégorie courante"""
+        total_categories = max(1, len(self.categories))
+        start = self.category_index / total_categories
+        
+        def on_progress(files, size, current_path):
+            fraction = min(1.0, size / expected_size) if expected_size else 0
+            if not self.estimated_files:
+                self.emit_progress((start + fraction / total_categories) * 100)
+            self.status_signal.emit(f"🗑️ {files} fichiers supprimés ({size / (1024**2):.1f} Mo)")
+        
+        return BulkDeleter(progress_callback=on_progress,
+                           quarantine=self.quarantine_run if quarantine else None)
     
-    def delete_folder_contents(self, folder, extensions=None):
-        """Supprimer contenu d'un dossier"""
+    def delete_folder_contents(self, folder, extensions=None, expected_size=0):
+        """Supprimer contenu d'un dossier, retourne le rapport de suppression"""
+        return self.make_deleter(expected_size).delete_contents(folder, extensions=extensions)
+    
+    def log_deletion_report(self, name, report):
+        """Journaliser le résultat d'une suppression"""
+        if not report['failed'] and not report['scheduled']:
+            self.log_signal.emit(f"    ✅ {name} nettoyé")
+            return
+        
+        if report['scheduled']:
+            self.log_signal.emit(f"    🔁 {len(report['scheduled'])} éléments verrouillés supprimés au prochain redémarrage")
+        if report['failed']:
+            self.log_signal.emit(f"    ⚠️ {len(report['failed'])} éléments non supprimés :")
+            for line in summarize_failures(report):
+                self.log_signal.emit(line)
+
+
+class WinSxSAnalysisWorker(QThread):
+    """Worker pour rafraîchir l'analyse DISM du magasin de composants"""
+    finished_signal = pyqtSignal(object)  # analyse (dict) ou None
+    
+    def run(self):
+        analysis = run_analysis()
+        if analysis:
+            WinSxSCache().save(analysis)
+        self.finished_signal.emit(analysis)
+
+
+# Analyses en cours, conservées si la fenêtre est fermée avant la fin
+_winsxs_workers = []
+
+
+class SizeTreeWorker(QThread):
+    """Worker pour construire l'arborescence des tailles d'un dossier"""
+    status_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(object, str)  # DirNode (ou None), message
+    
+    def __init__(self, root):
+        super().__init__()
+        self.root = root
+        self.scanner = None
+    
+    def run(self):
+        """Scanner en réutilisant les sous-arbres inchangés du dernier passage"""
         try:
-            for item in folder.iterdir():
-                try:
-                    if item.is_file():
-                        # Filtrer par extension si spécifié
-                        if extensions and item.suffix.lower() not in extensions:
-                            continue
-                        item.unlink()
-                    elif item.is_dir():
-                        shutil.rmtree(item, ignore_errors=True)
-                except:
-                    pass
-            return True
-        except:
-            return False
+            cache = SizeTreeCache()
+            previous = cache.load(self.root)
+            
+            def on_progress(files, size, current_dir):
+                self.status_signal.emit(f"🔍 {files} fichiers • {size / (1024**3):.2f} Go • {current_dir}")
+            
+            self.scanner = SizeTreeScanner(progress_callback=on_progress)
+            tree = self.scanner.scan(self.root, previous)
+            if tree is None:
+                self.finished_signal.emit(None, "Scan interrompu")
+                return
+            
+            cache.save(self.root, tree)
+            self.finished_signal.emit(
+                tree,
+                f"{self.scanner.scanned_dirs} dossiers scannés, {self.scanner.reused_dirs} réutilisés (inchangés)"
+            )
+        except Exception as e:
+            self.finished_signal.emit(None, f"Erreur: {str(e)}")
+    
+    def stop(self):
+        if self.scanner:
+            self.scanner.stop()
+
+
+class SizeTreeItem(QTreeWidgetItem):
+    """Ligne de l'arborescence triée numériquement sur les colonnes de taille"""
+    
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn() if self.treeWidget() else 0
+        mine = self.data(column, Qt.ItemDataRole.UserRole)
+        theirs = other.data(column, Qt.ItemDataRole.UserRole)
+        if mine is not None and theirs is not None:
+            return mine < theirs
+        return self.text(column).lower() < other.text(column).lower()
+
+
+class QuarantineRestoreWorker(QThread):
+    """Worker pour restaurer un passage de quarantaine"""
+    finished_signal = pyqtSignal(dict)
+    
+    def __init__(self, run_id):
+        super().__init__()
+        self.run_id = run_id
+    
+    def run(self):
+        try:
+            self.finished_signal.emit(QuarantineStore().restore(self.run_id))
+        except OSError as e:
+            self.finished_signal.emit({'restored': 0, 'size': 0, 'conflicts': [], 'failed': {self.run_id: str(e)}})
+
+
+class QuarantineWindow(QDialog):
+    """Fenêtre des nettoyages en quarantaine (restauration en une fois)"""
+    
+    COLUMNS = ["Date", "Origine", "Fichiers", "Taille"]
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setWindowTitle("♻️ Quarantaine")
+        self.setMinimumSize(750, 450)
+        self.store = QuarantineStore()
+        self.runs = []
+        self.worker = None
+        
+        layout = QVBoxLayout()
+        
+        title = QLabel("♻️ NETTOYAGES RESTAURABLES")
+        title.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        layout.addWidget(title)
+        
+        self.info_label = QLabel("")
+        self.info_label.setStyleSheet("color: #888; font-size: 10px;")
+        layout.addWidget(self.info_label)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+        
+        btn_layout = QHBoxLayout()
+        self.restore_btn = QPushButton("♻️ Restaurer")
+        self.restore_btn.clicked.connect(self.restore_selected)
+        btn_layout.addWidget(self.restore_btn)
+        
+        self.purge_btn = QPushButton("🗑️ Supprimer définitivement")
+        self.purge_btn.clicked.connect(self.purge_selected)
+        self.purge_btn.setStyleSheet("background: #F44336;")
+        btn_layout.addWidget(self.purge_btn)
+        
+        btn_layout.addStretch()
+        close_btn = QPushButton("❌ Fermer")
+        close_btn.clicked.connect(self.close)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+        
+        self.setLayout(layout)
+        self.setStyleSheet("""
+            QDialog { background-color: #1e1e1e; color: white; }
+            QLabel { color: white; }
+            QPushButton {
+                background: #00BCD4;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 8px;
+                font-weight: bold;
+            }
+            QPushButton:disabled { background: #555; color: #888; }
+            QTableWidget { background: #0d1117; color: #c9d1d9; border: 2px solid #21262d; }
+            QHeaderView::section { background: #2b2b2b; color: white; padding: 4px; }
+        """)
+        
+        self.refresh()
+    
+    def refresh(self):
+        """Recharger la liste des passages"""
+        self.runs = self.store.runs()
+        self.table.setRowCount(len(self.runs))
+        for row, manifest in enumerate(self.runs):
+            created = datetime.fromtimestamp(manifest.get('created', 0)).strftime("%d/%m/%Y %H:%M")
+            values = [created, manifest.get('label', '?'), str(manifest.get('files', 0)),
+                      f"{manifest.get('size', 0) / (1024**2):.1f} Mo"]
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        
+        settings = load_settings()
+        self.info_label.setText(
+            f"{len(self.runs)} passage(s) • {self.store.usage() / (1024**2):.1f} Mo occupés • "
+            f"expiration après {settings['max_age_days']} jours ou au-delà de {settings['max_bytes'] / (1024**3):.0f} Go"
+        )
+    
+    def selected_run(self):
+        row = self.table.currentRow()
+        if row < 0 or row >= len(self.runs):
+            QMessageBox.information(self, "ℹ️", "Sélectionnez un passage.")
+            return None
+        return self.runs[row]
+    
+    def restore_selected(self):
+        manifest = self.selected_run()
+        if not manifest:
+            return
+        reply = QMessageBox.question(
+            self,
+            "♻️ Restaurer",
+            f"Remettre en place tous les fichiers de ce passage ?\n\n{describe_run(manifest)}",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        self.restore_btn.setEnabled(False)
+        self.purge_btn.setEnabled(False)
+        self.info_label.setText("♻️ Restauration en cours...")
+        self.worker = QuarantineRestoreWorker(manifest['id'])
+        self.worker.finished_signal.connect(self.on_restored)
+        self.worker.start()
+    
+    def on_restored(self, report):
+        self.restore_btn.setEnabled(True)
+        self.purge_btn.setEnabled(True)
+        self.refresh()
+        
+        message = f"{report['restored']} fichiers restaurés ({report['size'] / (1024**2):.1f} Mo)"
+        if report['conflicts']:
+            message += f"\n\n⚠️ {len(report['conflicts'])} fichiers laissés en quarantaine (emplacement occupé)"
+        if report['failed']:
+            message += f"\n\n❌ {len(report['failed'])} échecs :\n" + "\n".join(
+                f"• {path} : {error}" for path, error in list(report['failed'].items())[:5]
+            )
+        QMessageBox.information(self, "♻️ Restauration", message)
+    
+    def purge_selected(self):
+        manifest = self.selected_run()
+        if not manifest:
+            return
+        reply = QMessageBox.question(
+            self,
+            "🗑️ Supprimer définitivement",
+            f"Supprimer définitivement ce passage ?\n\n{describe_run(manifest)}",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.store.purge(manifest['id'])
+            self.refresh()
+    
+    def closeEvent(self, event):
+        if self.worker and self.worker.isRunning():
+            self.worker.wait()
+        super().closeEvent(event)
+
+
+class SizeTreeWindow(QDialog):
+    """Fenêtre arborescence des tailles (chargement à la demande)"""
+    
+    COLUMNS = ["Dossier", "Taille", "Alloué", "Fichiers", "% parent"]
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setWindowTitle("🌳 Arborescence des tailles")
+        self.setMinimumSize(950, 700)
+        
+        layout = QVBoxLayout()
+        
+        title = QLabel("🌳 QUELS DOSSIERS OCCUPENT LE DISQUE ?")
+        title.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
+        layout.addWidget(title)
+        
+        info = QLabel("Taille logique vs allouée (clusters) • Dépliez un dossier pour explorer • Clic sur une colonne pour trier")
+        info.setStyleSheet("color: #888; font-size: 10px;")
+        layout.addWidget(info)
+        
+        # Choix racine
+        root_layout = QHBoxLayout()
+        self.root_combo = QComboBox()
+        self.root_combo.setEditable(True)
+        self.root_combo.addItem(str(Path.home()))
+        if sys.platform == 'win32':
+            for letter in "CDEFGHIJ":
+                drive = f"{letter}:\\"
+                if os.path.exists(drive):
+                    self.root_combo.addItem(drive)
+        root_layout.addWidget(self.root_combo, 1)
+        
+        browse_btn = QPushButton("📁 Parcourir")
+        browse_btn.clicked.connect(self.browse_root)
+        root_layout.addWidget(browse_btn)
+        
+        self.scan_btn = QPushButton("🔍 Analyser")
+        self.scan_btn.clicked.connect(self.start_scan)
+        self.scan_btn.setStyleSheet("background: #2196F3;")
+        root_layout.addWidget(self.scan_btn)
+        layout.addLayout(root_layout)
+        
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #888; font-size: 10px;")
+        layout.addWidget(self.status_label)
+        
+        # Arborescence
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setSortingEnabled(True)
+        self.tree.sortByColumn(1, Qt.SortOrder.DescendingOrder)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tree.itemExpanded.connect(self.populate_item)
+        layout.addWidget(self.tree)
+        
+        close_btn = QPushButton("❌ Fermer")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+        
+        self.setLayout(layout)
+        self.setStyleSheet("""
+            QDialog { background-color: #1e1e1e; color: white; }
+            QLabel { color: white; }
+            QPushButton {
+                background: #00BCD4;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 8px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background: #0097A7; }
+            QPushButton:disabled { background: #555; color: #888; }
+            QTreeWidget {
+                background: #0d1117;
+                color: #c9d1d9;
+                border: 2px solid #21262d;
+                border-radius: 8px;
+            }
+            QHeaderView::section { background: #2b2b2b; color: white; padding: 4px; }
+            QComboBox { background: #2b2b2b; color: white; padding: 6px; }
+        """)
+        
+        self.worker = None
+    
+    def browse_root(self):
+        folder = QFileDialog.getExistingDirectory(self, "Dossier à analyser", self.root_combo.currentText())
+        if folder:
+            self.root_combo.setEditText(folder)
+    
+    def start_scan(self):
+        root = self.root_combo.currentText().strip()
+        if not root or not os.path.isdir(root):
+            QMessageBox.warning(self, "⚠️", "Dossier introuvable")
+            return
+        
+        self.scan_btn.setEnabled(False)
+        self.tree.clear()
+        self.status_label.setText("🔍 Scan en cours...")
+        
+        self.worker = SizeTreeWorker(root)
+        self.worker.status_signal.connect(self.status_label.setText)
+        self.worker.finished_signal.connect(self.on_scan_finished)
+        self.worker.start()
+    
+    def on_scan_finished(self, tree, message):
+        self.scan_btn.setEnabled(True)
+        if tree is None:
+            self.status_label.setText(f"❌ {message}")
+            return
+        
+        self.status_label.setText(
+            f"✅ {tree.files} fichiers • {tree.size / (1024**3):.2f} Go logiques • "
+            f"{tree.allocated / (1024**3):.2f} Go alloués • {message}"
+        )
+        item = self.make_item(tree, tree.name, tree.size)
+        self.tree.addTopLevelItem(item)
+        item.setExpanded(True)
+    
+    def make_item(self, node, path, parent_size):
+        """Créer une ligne ; les enfants ne sont créés qu'au dépliage"""
+        percent = (node.size / parent_size * 100) if parent_size else 100
+        item = SizeTreeItem([
+            node.name,
+            self.format_size(node.size),
+            self.format_size(node.allocated),
+            str(node.files),
+            f"{percent:5.1f}% {'█' * int(percent / 10)}"
+        ])
+        for column, value in ((1, node.size), (2, node.allocated), (3, node.files), (4, percent)):
+            item.setData(column, Qt.ItemDataRole.UserRole, value)
+        item.node = node
+        item.path = path
+        item.populated = False
+        if node.children or node.own_files:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        return item
+    
+    def populate_item(self, item):
+        """Créer les sous-dossiers d'une ligne au premier dépliage"""
+        if getattr(item, 'populated', True):
+            return
+        item.populated = True
+        node = item.node
+        
+        self.tree.setSortingEnabled(False)
+        for child in node.children:
+            item.addChild(self.make_item(child, os.path.join(item.path, child.name), node.size))
+        
+        # Fichiers situés directement dans ce dossier
+        if node.own_files:
+            percent = (node.own_size / node.size * 100) if node.size else 0
+            files_item = SizeTreeItem([
+                f"📄 [{node.own_files} fichiers]",
+                self.format_size(node.own_size),
+                self.format_size(node.own_allocated),
+                str(node.own_files),
+                f"{percent:5.1f}% {'█' * int(percent / 10)}"
+            ])
+            for column, value in ((1, node.own_size), (2, node.own_allocated), (3, node.own_files), (4, percent)):
+                files_item.setData(column, Qt.ItemDataRole.UserRole, value)
+            item.addChild(files_item)
+        self.tree.setSortingEnabled(True)
+    
+    @staticmethod
+    def format_size(size):
+        if size >= 1024**3:
+            return f"{size / (1024**3):.2f} Go"
+        if size >= 1024**2:
+            return f"{size / (1024**2):.1f} Mo"
+        return f"{size / 1024:.0f} Ko"
+    
+    def closeEvent(self, event):
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
+        event.accept()
 
 
 class DiskCleanupAdvancedWindow(QDialog):
@@ -663,13 +1225,13 @@ class DiskCleanupAdvancedWindow(QDialog):
         self.checkboxes = {}
         
         categories = [
-            ("browsers", "🌐 Navigateurs (Chrome, Edge, Firefox, Brave)", "Cache navigateurs web"),
+            ("browsers", "🌐 Navigateurs (Chrome, Edge, Firefox, Brave)", "Cache, Code Cache, GPUCache de tous les profils"),
             ("gaming", "🎮 Gaming (Steam, Epic, NVIDIA, AMD)", "Shader cache et fichiers temporaires"),
             ("windows_old", "🪟 Windows.old", "Ancienne installation Windows (peut être volumineux)"),
             ("winsxs", "📦 WinSxS Cleanup", "Nettoyage composants Windows (long)"),
             ("large_files", "📊 Fichiers volumineux (> 500 MB)", "Scan seulement, pas de suppression auto"),
             ("duplicates", "🔍 Doublons (Downloads)", "Détection fichiers en double"),
-            ("logs", "📝 Logs système", "Fichiers .log, .dmp anciens"),
+            ("logs", "📝 Logs système", "Logs > 14 jours, dumps (5 plus récents conservés)"),
             ("windows_store", "🏪 Windows Store Cache", "Cache Microsoft Store"),
         ]
         
@@ -692,6 +1254,17 @@ class DiskCleanupAdvancedWindow(QDialog):
         
         scroll_layout.addLayout(select_layout)
         
+        # Quarantaine (préférence partagée avec Nettoyage Windows)
+        self.quarantine_cb = QCheckBox("♻️ Mode quarantaine (fichiers restaurables)")
+        self.quarantine_cb.setToolTip(
+            f"Les fichiers sont déplacés au lieu d'être supprimés, puis effacés "
+            f"après {load_settings()['max_age_days']} jours ou au-delà de "
+            f"{load_settings()['max_bytes'] / (1024**3):.0f} Go"
+        )
+        self.quarantine_cb.setChecked(quarantine_enabled())
+        self.quarantine_cb.toggled.connect(set_quarantine_enabled)
+        scroll_layout.addWidget(self.quarantine_cb)
+        
         scroll_widget.setLayout(scroll_layout)
         scroll.setWidget(scroll_widget)
         layout.addWidget(scroll)
@@ -709,6 +1282,16 @@ class DiskCleanupAdvancedWindow(QDialog):
         self.clean_btn.setStyleSheet("background: #4CAF50;")
         btn_layout.addWidget(self.clean_btn)
         
+        tree_btn = QPushButton("🌳 Arborescence tailles")
+        tree_btn.clicked.connect(self.open_size_tree)
+        tree_btn.setStyleSheet("background: #9C27B0;")
+        btn_layout.addWidget(tree_btn)
+        
+        quarantine_btn = QPushButton("♻️ Quarantaine")
+        quarantine_btn.clicked.connect(self.open_quarantine)
+        quarantine_btn.setStyleSheet("background: #607D8B;")
+        btn_layout.addWidget(quarantine_btn)
+        
         btn_layout.addStretch()
         
         close_btn = QPushButton("❌ Fermer")
@@ -722,6 +1305,10 @@ class DiskCleanupAdvancedWindow(QDialog):
         self.progress.setVisible(False)
         layout.addWidget(self.progress)
         
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #888; font-size: 10px;")
+        layout.addWidget(self.status_label)
+        
         # Résultats
         results_label = QLabel("📄 RÉSULTATS")
         results_label.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
@@ -766,6 +1353,7 @@ class DiskCleanupAdvancedWindow(QDialog):
         
         self.show_welcome()
         self.worker = None
+        self.winsxs_worker = None
     
     def show_welcome(self):
         """Message d'accueil"""
@@ -790,7 +1378,7 @@ MODE NETTOYAGE:
 📁 CATÉGORIES DISPONIBLES
 
 🌐 NAVIGATEURS
-- Cache Chrome, Edge, Firefox, Brave
+- Cache Chrome, Edge, Firefox, Brave (tous les profils)
 - Peut libérer : 100 Mo - 2 Go
 
 🎮 GAMING
@@ -817,13 +1405,18 @@ MODE NETTOYAGE:
 - Suppression manuelle
 
 📝 LOGS SYSTÈME
-- Fichiers .log, .dmp anciens
+- Logs .log/.etl de plus de 14 jours
+- Dumps .dmp (5 plus récents conservés)
 - Peut libérer : 100 Mo - 1 Go
 
 🏪 WINDOWS STORE
 - Cache Microsoft Store
 - Peut libérer : 50-500 Mo
 
+🌳 ARBORESCENCE TAILLES
+- Quels dossiers occupent le disque (taille logique / allouée)
+- Dossiers inchangés réutilisés depuis le dernier scan
+
 ═══════════════════════════════════════════════════════════════
 
 💡 CONSEILS
@@ -847,6 +1440,14 @@ MODE NETTOYAGE:
 """
         self.results.setPlainText(text)
     
+    def open_size_tree(self):
+        """Ouvrir l'arborescence des tailles"""
+        SizeTreeWindow(self).exec()
+    
+    def open_quarantine(self):
+        """Ouvrir la quarantaine (restauration des nettoyages)"""
+        QuarantineWindow(self).exec()
+    
     def select_all(self):
         """Sélectionner tout"""
         for cb in self.checkboxes.values():
@@ -898,6 +1499,16 @@ MODE NETTOYAGE:
             if reply != QMessageBox.StandardButton.Yes:
                 return
         
+        # DISM n'accepte qu'une opération à la fois
+        if mode == "clean" and "winsxs" in selected and self.winsxs_worker and self.winsxs_worker.isRunning():
+            QMessageBox.information(
+                self,
+                "⏳ Analyse WinSxS en cours",
+                "L'analyse DISM du magasin de composants est en cours.\n\n"
+                "Réessayez dans quelques instants."
+            )
+            return
+        
         # Désactiver boutons
         self.analyze_btn.setEnabled(False)
         self.clean_btn.setEnabled(False)
@@ -906,18 +1517,54 @@ MODE NETTOYAGE:
         self.progress.setValue(0)
         self.results.clear()
         
+        if mode == "analyze" and "winsxs" in selected:
+            self.refresh_winsxs_analysis()
+        
         # Lancer worker
         self.worker = DiskCleanupWorker(selected, mode)
         self.worker.log_signal.connect(self.append_log)
         self.worker.progress_signal.connect(self.progress.setValue)
+        self.worker.status_signal.connect(self.status_label.setText)
+        self.worker.scan_signal.connect(self.show_scan_progress)
         self.worker.category_signal.connect(self.show_category_result)
         self.worker.finished_signal.connect(lambda r: self.on_operation_finished(r, mode))
         self.worker.start()
     
+    def refresh_winsxs_analysis(self):
+        """Relancer l'analyse DISM en arrière-plan si une maintenance a eu lieu"""
+        if self.winsxs_worker and self.winsxs_worker.isRunning():
+            return
+        if WinSxSCache.is_fresh(WinSxSCache().load()):
+            return
+        
+        worker = WinSxSAnalysisWorker()
+        worker.finished_signal.connect(self.on_winsxs_analyzed)
+        worker.finished.connect(lambda: _winsxs_workers.remove(worker))
+        _winsxs_workers.append(worker)
+        self.winsxs_worker = worker
+        worker.start()
+    
+    def on_winsxs_analyzed(self, analysis):
+        """Nouveau chiffre WinSxS disponible"""
+        if not analysis:
+            self.append_log("\n📦 WinSxS : analyse DISM en arrière-plan échouée")
+            return
+        reclaimable = analysis.get('reclaimable_mb', 0)
+        if reclaimable > 0:
+            self.append_log(f"\n📦 WinSxS (analyse DISM à jour) : {reclaimable} Mo récupérables")
+        else:
+            self.append_log("\n📦 WinSxS (analyse DISM à jour) : aucun nettoyage recommandé")
+    
     def append_log(self, text):
         """Ajouter au log"""
         self.results.append(text)
     
+    def show_scan_progress(self, files, size, current_dir):
+        """Progression live du scan (déjà limitée en fréquence par le worker)"""
+        if len(current_dir) > 70:
+            current_dir = "…" + current_dir[-69:]
+        self.status_label.setText(f"🔍 {files} fichiers • {size / (1024**2):.1f} Mo • {current_dir}")
+    
     def show_category_result(self, category, files, size_mb):
         """Afficher résultat d'une catégorie (inutilisé pour l'instant)"""
         pass
@@ -927,6 +1574,7 @@ MODE NETTOYAGE:
         self.analyze_btn.setEnabled(True)
         self.clean_btn.setEnabled(True)
         self.progress.setVisible(False)
+        self.status_label.setText("")
         
         if 'error' in results:
             self.append_log(f"\n❌ Erreur: {results['error']}")
@@ -935,11 +1583,13 @@ MODE NETTOYAGE:
         # Calculer totaux
         total_files = 0
         total_size = 0
+        total_allocated = 0
         
         for category, data in results.items():
             if isinstance(data, dict):
                 total_files += data.get('files', 0)
                 total_size += data.get('size', 0)
+                total_allocated += data.get('allocated', 0)
         
         # Résumé
         self.append_log("\n" + "╔" + "═"*70 + "╗")
@@ -949,15 +1599,23 @@ MODE NETTOYAGE:
         size_mb = total_size / (1024**2)
         size_gb = total_size / (1024**3)
         
+        allocated_mb = total_allocated / (1024**2)
+        
         if mode == "analyze":
             self.append_log(f"📂 Fichiers analysés: {total_files}")
-            self.append_log(f"💾 Espace libérable: {size_mb:.1f} Mo ({size_gb:.2f} Go)")
+            self.append_log(f"💾 Taille des fichiers: {size_mb:.1f} Mo ({size_gb:.2f} Go)")
+            self.append_log(f"💽 Espace disque libérable (clusters): {allocated_mb:.1f} Mo")
             self.append_log("\n💡 Cliquez 'NETTOYER' pour libérer cet espace")
         else:
             self.append_log(f"🗑️ Fichiers supprimés: {total_files}")
-            self.append_log(f"✅ Espace libéré: {size_mb:.1f} Mo ({size_gb:.2f} Go)")
+            self.append_log(f"✅ Taille supprimée: {size_mb:.1f} Mo ({size_gb:.2f} Go)")
+            self.append_log(f"💽 Espace disque libéré (clusters): {allocated_mb:.1f} Mo")
+            verification = results.get('verification')
+            if verification:
+                self.append_log(f"📏 Mesuré sur le volume: {verification['measured'] / (1024**2):.1f} Mo")
             self.append_log("\n🎉 Nettoyage terminé avec succès !")
         
+        self.show_forecast()
         self.append_log("")
         
         QMessageBox.information(
@@ -968,6 +1626,23 @@ MODE NETTOYAGE:
             f"Taille: {size_gb:.2f} Go"
         )
     
+    def show_forecast(self):
+        """Prévision de remplissage des volumes (historique du widget principal)"""
+        history = DiskHistory()
+        volumes = history.volumes()
+        if not volumes:
+            return
+        
+        growth = category_growth()
+        self.append_log("\n📈 PRÉVISION DE REMPLISSAGE")
+        for volume in volumes:
+            forecast = forecast_volume(history, volume, growth=growth)
+            if not forecast:
+                continue
+            self.append_log(f"  {volume} : {forecast['free'] / (1024**3):.1f} Go libres sur {forecast['total'] / (1024**3):.1f} Go")
+            for line in format_forecast(forecast, detailed=True):
+                self.append_log(line)
+    
     def show_help(self):
         """Aide"""
         help_text = """╔══════════════════════════════════════════════════════════════╗
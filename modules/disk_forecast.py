@@ -0,0 +1,304 @@
+# modules/disk_forecast.py
+"""
+Disk Forecast - Prévision de remplissage des disques
+Utilisé par : Widget principal (infos disques), Nettoyage disque avancé (résumé)
+
+- Échantillons d'espace libre par volume, compactés avec l'âge
+  (10 min sur 2 jours, 1 h sur 2 semaines, 6 h jusqu'à 90 jours)
+- Tendance linéaire (moindres carrés) depuis le dernier nettoyage
+- Date estimée du passage sous le seuil critique (10% libre)
+- Croissance attribuée aux catégories de nettoyage qui grossissent le plus
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+from modules.disk_walker import get_data_dir, ScanEstimates
+
+DAY = 86400
+GB = 1024 ** 3
+
+# Seuil critique (même seuil que l'alerte "CRITIQUE" du widget)
+CRITICAL_FREE_RATIO = 0.10
+
+# (âge max en secondes, espacement min entre deux échantillons conservés)
+RETENTION_TIERS = [
+    (2 * DAY, 600),
+    (14 * DAY, 3600),
+    (90 * DAY, 6 * 3600),
+]
+
+# Fenêtre et conditions minimales de la tendance
+TREND_WINDOW = 14 * DAY
+MIN_TREND_SPAN = 12 * 3600
+MIN_TREND_SAMPLES = 6
+
+# Hausse brutale d'espace libre considérée comme un nettoyage (rupture de tendance)
+JUMP_MIN_BYTES = 1 * GB
+JUMP_MIN_RATIO = 0.01
+
+# Noms affichés des catégories du nettoyage avancé
+CATEGORY_NAMES = {
+    'browsers': "Navigateurs",
+    'gaming': "Gaming",
+    'windows_old': "Windows.old",
+    'winsxs': "WinSxS",
+    'large_files': "Fichiers volumineux",
+    'duplicates': "Doublons",
+    'logs': "Logs",
+    'windows_store': "Windows Store",
+}
+
+
+class DiskHistory:
+    """Historique compact de l'espace libre par volume
+
+    Format JSON : {volume: {'total': octets, 'samples': [[t, libre_Mo], ...]}}
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_data_dir() / "disk_history.json"
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def record(self, volume, total, free, now=None):
+        """Ajouter un échantillon ; False s'il est trop proche du précédent"""
+        now = int(now if now is not None else time.time())
+        with self._lock:
+            entry = self.data.setdefault(volume, {'total': int(total), 'samples': []})
+            entry['total'] = int(total)
+            samples = entry['samples']
+            if samples and now - samples[-1][0] < RETENTION_TIERS[0][1]:
+                return False
+            samples.append([now, int(free // (1024 ** 2))])
+            entry['samples'] = compact_samples(samples, now)
+            return True
+
+    def samples(self, volume):
+        """[(t, octets libres), ...] du plus ancien au plus récent"""
+        with self._lock:
+            entry = self.data.get(volume)
+            if not entry:
+                return []
+            return [(t, free_mb * 1024 ** 2) for t, free_mb in entry['samples']]
+
+    def total(self, volume):
+        entry = self.data.get(volume)
+        return entry['total'] if entry else 0
+
+    def volumes(self):
+        return list(self.data)
+
+    def save(self):
+        with self._lock:
+            payload = json.dumps(self.data, separators=(',', ':'))
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def compact_samples(samples, now):
+    """Réduire la densité des anciens échantillons
+
+    Un échantillon (le plus récent) par tranche de temps alignée : le résultat
+    est stable d'une compaction à l'autre.
+    """
+    kept = []
+    buckets = set()
+    for sample in reversed(samples):
+        age = now - sample[0]
+        spacing = None
+        for max_age, tier_spacing in RETENTION_TIERS:
+            if age <= max_age:
+                spacing = tier_spacing
+                break
+        if spacing is None:
+            break  # trop ancien : cet échantillon et les précédents sont abandonnés
+        bucket = (spacing, sample[0] // spacing)
+        if bucket not in buckets:
+            buckets.add(bucket)
+            kept.append(sample)
+    kept.reverse()
+    return kept
+
+
+def fit_trend(samples, total):
+    """Pente (octets libres / jour) et r² depuis la dernière rupture
+
+    Retourne None si l'historique est trop court pour conclure.
+    """
+    if len(samples) < 2:
+        return None
+    now = samples[-1][0]
+    jump = max(JUMP_MIN_BYTES, total * JUMP_MIN_RATIO)
+
+    # Ne garder que la fenêtre récente, après le dernier nettoyage
+    start = 0
+    for i in range(1, len(samples)):
+        if samples[i][1] - samples[i - 1][1] >= jump:
+            start = i
+    window = [(t, free) for t, free in samples[start:] if now - t <= TREND_WINDOW]
+    if len(window) < MIN_TREND_SAMPLES or window[-1][0] - window[0][0] < MIN_TREND_SPAN:
+        return None
+
+    n = len(window)
+    t0 = window[0][0]
+    mean_x = sum((t - t0) / DAY for t, _ in window) / n
+    mean_y = sum(free for _, free in window) / n
+    sxx = sxy = syy = 0.0
+    for t, free in window:
+        dx = (t - t0) / DAY - mean_x
+        dy = free - mean_y
+        sxx += dx * dx
+        sxy += dx * dy
+        syy += dy * dy
+    if sxx == 0:
+        return None
+    slope = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy else 1.0
+    return {'slope_per_day': slope, 'r2': r2, 'samples': n, 'span_days': (window[-1][0] - t0) / DAY}
+
+
+def category_growth(estimates=None, window_days=30, now=None):
+    """Croissance des catégories de nettoyage (octets / jour), la plus rapide d'abord
+
+    Les nettoyages sont neutralisés : seule la hausse entre la taille restante
+    après un passage et la taille mesurée au passage suivant est comptée.
+    """
+    estimates = estimates or ScanEstimates()
+    now = now if now is not None else time.time()
+    growth = []
+    for category in CATEGORY_NAMES:
+        history = [h for h in estimates.size_history(category) if now - h[0] <= window_days * DAY]
+        if len(history) < 2:
+            continue
+        span_days = (history[-1][0] - history[0][0]) / DAY
+        if span_days < 1:
+            continue
+        grown = sum(max(0, history[i][1] - history[i - 1][2]) for i in range(1, len(history)))
+        if grown > 0:
+            growth.append((category, grown / span_days))
+    growth.sort(key=lambda item: item[1], reverse=True)
+    return growth
+
+
+def forecast_volume(history, volume, threshold=CRITICAL_FREE_RATIO, growth=None):
+    """Prévision pour un volume : tendance, jours avant le seuil, catégories en cause"""
+    samples = history.samples(volume)
+    total = history.total(volume)
+    if not samples or not total:
+        return None
+
+    free = samples[-1][1]
+    threshold_bytes = total * threshold
+    result = {
+        'volume': volume,
+        'total': total,
+        'free': free,
+        'threshold': threshold,
+        'trend': fit_trend(samples, total),
+        'eta_days': None,
+        'culprits': [],
+    }
+
+    trend = result['trend']
+    if free <= threshold_bytes:
+        result['eta_days'] = 0.0
+    elif trend and trend['slope_per_day'] < 0:
+        result['eta_days'] = (free - threshold_bytes) / -trend['slope_per_day']
+
+    # Part de la consommation expliquée par chaque catégorie
+    if trend and trend['slope_per_day'] < 0 and growth:
+        fill_rate = -trend['slope_per_day']
+        result['culprits'] = [
+            (category, rate, min(1.0, rate / fill_rate)) for category, rate in growth[:3]
+        ]
+    return result
+
+
+def format_forecast(forecast, detailed=False):
+    """Texte court ("⏳ 10% libre dans ~12 j") ou lignes détaillées"""
+    if not forecast:
+        return "" if not detailed else ["    Historique insuffisant"]
+
+    eta = forecast['eta_days']
+    trend = forecast['trend']
+    percent = int(forecast['threshold'] * 100)
+
+    if not detailed:
+        if eta is None or eta == 0 or eta > 365:
+            return ""
+        text = f" ⏳ <{percent}% libre dans ~{eta:.0f} j"
+        if eta < 30 and forecast['culprits']:
+            text += f" (↑ {CATEGORY_NAMES[forecast['culprits'][0][0]]})"
+        return text
+
+    lines = []
+    if trend is None:
+        lines.append("    Historique insuffisant (12 h d'échantillons minimum)")
+    else:
+        per_day = -trend['slope_per_day'] / GB
+        direction = "se remplit" if per_day > 0 else "se libère"
+        lines.append(f"    Tendance : {direction} de {abs(per_day):.2f} Go/jour "
+                     f"({trend['samples']} mesures sur {trend['span_days']:.1f} j, r²={trend['r2']:.2f})")
+    if eta == 0:
+        lines.append(f"    ⚠️ Déjà sous {percent}% d'espace libre")
+    elif eta is not None:
+        lines.append(f"    ⏳ Sous {percent}% d'espace libre dans ~{eta:.0f} jours")
+    for category, rate, share in forecast['culprits']:
+        lines.append(f"    ↑ {CATEGORY_NAMES[category]} : +{rate / (1024**2):.0f} Mo/jour (~{share * 100:.0f}%)")
+    return lines
+
+
+# ============ HISTORIQUE PARTAGÉ ============
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    """Instance partagée (chargée une fois par processus)"""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = DiskHistory()
+        return _history
+
+
+def cleanup_volumes():
+    """Volumes où se trouvent les catégories de nettoyage (système + profil)"""
+    volumes = {os.environ.get('SystemDrive', 'C:') + os.sep, Path.home().anchor or os.sep}
+    return {os.path.normcase(v) for v in volumes}
+
+
+def observe(volume, total, free):
+    """Enregistrer une mesure et retourner la prévision du volume"""
+    history = get_history()
+    if history.record(volume, total, free):
+        history.save()
+    growth = _cached_growth() if os.path.normcase(volume) in cleanup_volumes() else None
+    return forecast_volume(history, volume, growth=growth)
+
+
+_growth_cache = {'time': None, 'growth': []}
+
+
+def _cached_growth():
+    """Croissance par catégorie relue au plus toutes les 10 minutes"""
+    now = time.monotonic()
+    if _growth_cache['time'] is None or now - _growth_cache['time'] > 600:
+        _growth_cache['growth'] = category_growth()
+        _growth_cache['time'] = now
+    return _growth_cache['growth']
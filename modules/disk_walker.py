@@ -0,0 +1,436 @@
+# modules/disk_walker.py
+"""
+Disk Walker - Parcours disque en une seule passe (os.scandir)
+Utilisé par : Nettoyage disque avancé (catégories, arborescence des tailles)
+
+- Parcours de fichiers partagé avec progression limitée en fréquence
+- Agrégation "du" par dossier : taille logique ET taille allouée
+- Sous-arbres réutilisés si le mtime du dossier n'a pas changé
+- Seuls les dossiers sont gardés en mémoire (jamais la liste des fichiers)
+"""
+
+import os
+import sys
+import stat
+import json
+import time
+import shutil
+import threading
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+
+def get_data_dir():
+    """Dossier de données du nettoyage disque (caches, historiques)"""
+    data_dir = Path.home() / "Documents" / "Wapinator" / "DiskCleanup"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+# ============ TAILLE ALLOUÉE ============
+
+_cluster_cache = {}
+
+
+def get_cluster_size(path):
+    """Taille de cluster du volume contenant path (4096 par défaut)"""
+    anchor = Path(os.path.abspath(path)).anchor or "/"
+    if anchor in _cluster_cache:
+        return _cluster_cache[anchor]
+
+    cluster = 4096
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            sectors_per_cluster = ctypes.c_ulong(0)
+            bytes_per_sector = ctypes.c_ulong(0)
+            free_clusters = ctypes.c_ulong(0)
+            total_clusters = ctypes.c_ulong(0)
+            ok = ctypes.windll.kernel32.GetDiskFreeSpaceW(
+                ctypes.c_wchar_p(anchor),
+                ctypes.byref(sectors_per_cluster),
+                ctypes.byref(bytes_per_sector),
+                ctypes.byref(free_clusters),
+                ctypes.byref(total_clusters)
+            )
+            if ok:
+                cluster = sectors_per_cluster.value * bytes_per_sector.value
+        else:
+            vfs = os.statvfs(path)
+            cluster = vfs.f_frsize or vfs.f_bsize
+    except Exception:
+        pass
+
+    _cluster_cache[anchor] = cluster or 4096
+    return _cluster_cache[anchor]
+
+
+FILE_ATTRIBUTE_SPARSE_FILE = 0x200
+FILE_ATTRIBUTE_COMPRESSED = 0x800
+
+
+def get_compressed_size(path):
+    """Taille sur disque d'un fichier compressé/creux NTFS (None si inconnue)"""
+    if sys.platform != 'win32':
+        return None
+    try:
+        import ctypes
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        high = ctypes.c_ulong(0)
+        low = kernel32.GetCompressedFileSizeW(ctypes.c_wchar_p(str(path)), ctypes.byref(high))
+        if low == 0xFFFFFFFF and ctypes.get_last_error() != 0:
+            return None
+        return (high.value << 32) + low
+    except Exception:
+        return None
+
+
+def allocated_size(st, cluster, path=None):
+    """Taille réellement occupée sur disque
+
+    - POSIX : st_blocks (exact, fichiers creux/compressés compris)
+    - Windows : arrondi au cluster ; GetCompressedFileSizeW uniquement pour
+      les fichiers marqués creux/compressés (aucun appel en plus sinon)
+    """
+    blocks = getattr(st, 'st_blocks', None)
+    if blocks is not None:
+        return blocks * 512
+
+    size = st.st_size
+    if size == 0:
+        return 0
+    attrs = getattr(st, 'st_file_attributes', 0)
+    if path is not None and attrs & (FILE_ATTRIBUTE_SPARSE_FILE | FILE_ATTRIBUTE_COMPRESSED):
+        on_disk = get_compressed_size(path)
+        if on_disk is not None:
+            size = on_disk
+            if size == 0:
+                return 0
+    return -(-size // cluster) * cluster
+
+
+def get_free_space(path):
+    """Espace libre du volume contenant path (octets, None si inaccessible)"""
+    try:
+        return shutil.disk_usage(path).free
+    except OSError:
+        return None
+
+
+# ============ PROGRESSION ============
+
+class ScanProgress:
+    """Compteurs de scan (fichiers, octets, dossier courant) notifiés au plus
+    toutes les `interval` secondes pour ne pas inonder les signaux Qt"""
+
+    def __init__(self, callback=None, interval=0.25):
+        self.callback = callback  # callback(files, size, current_dir)
+        self.interval = interval
+        self.files = 0
+        self.size = 0
+        self.current_dir = ""
+        self._next_emit = 0.0
+        # Partageable entre plusieurs parcours parallèles
+        self._lock = threading.Lock()
+
+    def add(self, size):
+        with self._lock:
+            self.files += 1
+            self.size += size
+
+    def enter_dir(self, path):
+        self.current_dir = path
+        if self.callback is not None:
+            now = time.monotonic()
+            with self._lock:
+                if now < self._next_emit:
+                    return
+                self._next_emit = now + self.interval
+                files, size = self.files, self.size
+            self.callback(files, size, path)
+
+    def flush(self):
+        """Notifier immédiatement l'état courant"""
+        if self.callback is not None:
+            self._next_emit = time.monotonic() + self.interval
+            self.callback(self.files, self.size, self.current_dir)
+
+
+def iter_files(root, extensions=None, progress=None):
+    """Fichiers réguliers sous root : (chemin, stat), sans suivre liens/jonctions
+
+    Un seul stat par entrée (gratuit sous Windows : données de FindNextFile).
+    """
+    if extensions:
+        extensions = tuple(ext.lower() for ext in extensions)
+    stack = [os.fspath(root)]
+    while stack:
+        path = stack.pop()
+        if progress is not None:
+            progress.enter_dir(path)
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if entry.is_dir(follow_symlinks=False):
+                            if not _is_reparse_point(st):
+                                stack.append(entry.path)
+                            continue
+                        if not stat.S_ISREG(st.st_mode):
+                            continue
+                    except OSError:
+                        continue
+                    if extensions and not entry.name.lower().endswith(extensions):
+                        continue
+                    if progress is not None:
+                        progress.add(st.st_size)
+                    yield entry.path, st
+        except OSError:
+            pass
+
+
+# ============ ARBORESCENCE DES TAILLES ============
+
+class DirNode:
+    """Dossier agrégé : totaux propres (fichiers directs) + totaux cumulés"""
+    __slots__ = ('name', 'mtime', 'own_files', 'own_size', 'own_allocated',
+                 'files', 'size', 'allocated', 'children', '_child_map')
+
+    def __init__(self, name, mtime=0):
+        self.name = name
+        self.mtime = mtime
+        self.own_files = 0
+        self.own_size = 0
+        self.own_allocated = 0
+        self.files = 0
+        self.size = 0
+        self.allocated = 0
+        self.children = []
+        self._child_map = None
+
+    def child(self, name):
+        """Sous-dossier par nom (index construit à la demande)"""
+        if self._child_map is None:
+            self._child_map = {c.name: c for c in self.children}
+        return self._child_map.get(name)
+
+    def to_dict(self):
+        return {
+            'n': self.name, 'm': self.mtime,
+            'f': self.own_files, 's': self.own_size, 'a': self.own_allocated,
+            'c': [c.to_dict() for c in self.children]
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Reconstruire un arbre (itératif : pas de limite de profondeur)"""
+        root = DirNode(data['n'], data['m'])
+        stack = [(root, data)]
+        while stack:
+            node, d = stack.pop()
+            node.own_files = d['f']
+            node.own_size = d['s']
+            node.own_allocated = d['a']
+            for cd in d['c']:
+                child = DirNode(cd['n'], cd['m'])
+                node.children.append(child)
+                stack.append((child, cd))
+        root.compute_totals()
+        return root
+
+    def compute_totals(self):
+        """Recalculer les totaux cumulés (post-ordre itératif)"""
+        order = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children)
+        for node in reversed(order):
+            node.files = node.own_files
+            node.size = node.own_size
+            node.allocated = node.own_allocated
+            for c in node.children:
+                node.files += c.files
+                node.size += c.size
+                node.allocated += c.allocated
+
+
+class SizeTreeScanner:
+    """Construit l'arborescence des tailles en une seule passe"""
+
+    def __init__(self, progress_callback=None, progress_interval=0.25):
+        self.progress_callback = progress_callback  # callback(files, size, current_dir)
+        self.progress_interval = progress_interval
+        self.reused_dirs = 0
+        self.scanned_dirs = 0
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    def scan(self, root, previous=None):
+        """Scanner root ; previous = arbre précédent (réutilisé si mtime identique)
+
+        Retourne None si le scan a été arrêté avant la fin.
+        """
+        root = os.path.abspath(root)
+        cluster = get_cluster_size(root)
+        self.reused_dirs = 0
+        self.scanned_dirs = 0
+        progress = ScanProgress(self.progress_callback, self.progress_interval)
+
+        root_mtime = os.stat(root).st_mtime_ns
+        if previous is not None and previous.name != root:
+            previous = None
+        tree = None
+
+        # (chemin, nom, mtime, noeud en cache, parent)
+        stack = [(root, root, root_mtime, previous, None)]
+        order = []
+
+        while stack and not self._stopped:
+            path, name, mtime, cached, parent = stack.pop()
+            node = DirNode(name, mtime)
+            if parent is None:
+                tree = node
+            else:
+                parent.children.append(node)
+            order.append(node)
+
+            # Dossier inchangé : reprendre ses fichiers directs sans scandir
+            if cached is not None and cached.mtime == mtime:
+                self.reused_dirs += 1
+                node.own_files = cached.own_files
+                node.own_size = cached.own_size
+                node.own_allocated = cached.own_allocated
+                progress.files += node.own_files
+                progress.size += node.own_size
+                for cached_child in cached.children:
+                    child_path = os.path.join(path, cached_child.name)
+                    try:
+                        child_mtime = os.stat(child_path, follow_symlinks=False).st_mtime_ns
+                    except OSError:
+                        continue
+                    stack.append((child_path, cached_child.name, child_mtime, cached_child, node))
+                continue
+
+            self.scanned_dirs += 1
+            progress.enter_dir(path)
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                            if entry.is_dir(follow_symlinks=False):
+                                if _is_reparse_point(st):
+                                    continue
+                                child_cached = cached.child(entry.name) if cached is not None else None
+                                stack.append((entry.path, entry.name, st.st_mtime_ns, child_cached, node))
+                                continue
+                            if entry.is_symlink():
+                                continue
+                        except OSError:
+                            continue
+                        node.own_files += 1
+                        node.own_size += st.st_size
+                        node.own_allocated += allocated_size(st, cluster, entry.path)
+                        progress.add(st.st_size)
+            except OSError:
+                pass
+
+        progress.flush()
+        # Scan interrompu : arbre partiel, ni affiché ni mis en cache
+        if self._stopped or tree is None:
+            return None
+        tree.compute_totals()
+        return tree
+
+
+def _is_reparse_point(st):
+    """Jonction / lien de dossier Windows (jamais parcouru : évite les boucles)"""
+    attrs = getattr(st, 'st_file_attributes', 0)
+    return bool(attrs & getattr(stat, 'FILE_ATTRIBUTE_REPARSE_POINT', 0x400))
+
+
+class SizeTreeCache:
+    """Cache disque des arborescences (un fichier JSON par racine)"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_data_dir() / "size_trees"
+
+    def _file_for(self, root):
+        digest = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"tree_{digest}.json"
+
+    def load(self, root):
+        try:
+            with open(self._file_for(root), 'r', encoding='utf-8') as f:
+                return DirNode.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, root, tree):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            target = self._file_for(root)
+            tmp = target.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(tree.to_dict(), f, separators=(',', ':'))
+            os.replace(tmp, target)
+        except OSError:
+            pass
+
+
+class ScanEstimates:
+    """Totaux observés au dernier scan par catégorie (estimation de progression)
+    et historique des tailles par catégorie (prévision de remplissage)"""
+
+    HISTORY_LIMIT = 120
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_data_dir() / "scan_estimates.json"
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def get(self, category):
+        """(fichiers, octets) du dernier scan, ou None"""
+        entry = self.data.get(category)
+        if not entry or 'files' not in entry:
+            return None
+        return entry['files'], entry.get('size', 0)
+
+    def update(self, category, files, size):
+        entry = self.data.setdefault(category, {})
+        entry.update(files=files, size=size, timestamp=datetime.now().isoformat())
+
+    def record_size(self, category, before, after=None, now=None):
+        """Historique compact de la taille d'une catégorie : [t, avant, après]
+
+        `after` = taille restante après nettoyage (égale à `before` en analyse) ;
+        permet de mesurer la croissance entre deux passages malgré les nettoyages.
+        """
+        history = self.data.setdefault(category, {}).setdefault('history', [])
+        sample = [int(now if now is not None else time.time()), int(before)]
+        if after is not None and after != before:
+            sample.append(int(after))
+        history.append(sample)
+        del history[:-self.HISTORY_LIMIT]
+
+    def size_history(self, category):
+        """[(t, avant, après), ...] du plus ancien au plus récent"""
+        entry = self.data.get(category) or {}
+        return [(s[0], s[1], s[2] if len(s) > 2 else s[1]) for s in entry.get('history', [])]
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+        except OSError:
+            pass
@@ -0,0 +1,353 @@
+# modules/dns_bench.py
+"""
+DNS Bench - Comparatif de serveurs DNS (requêtes UDP construites à la main)
+Utilisé par : Network Tester (test DNS, étape DNS du test complet)
+
+- Requêtes envoyées directement aux résolveurs (pas de cache Windows)
+- Tous les résolveurs interrogés en parallèle, N requêtes en vol par résolveur
+- Passe "froide" (premières requêtes) puis "chaude" (mêmes domaines, en cache
+  chez le résolveur)
+- Percentiles de latence et taux d'échec par résolveur, classement
+- Serveur DNS local minimal pour les tests (StubDnsServer)
+"""
+
+import time
+import random
+import select
+import socket
+import struct
+import threading
+
+from modules.latency_stats import LatencySamples
+
+QTYPE_A = 1
+QCLASS_IN = 1
+
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+RCODE_REFUSED = 5
+
+DEFAULT_RESOLVERS = [
+    ("1.1.1.1", "Cloudflare"),
+    ("8.8.8.8", "Google DNS"),
+    ("9.9.9.9", "Quad9"),
+    ("208.67.222.222", "OpenDNS"),
+    ("80.67.169.12", "FDN"),
+]
+
+DEFAULT_DOMAINS = [
+    "google.com", "youtube.com", "facebook.com", "wikipedia.org", "amazon.fr",
+    "instagram.com", "reddit.com", "netflix.com", "microsoft.com", "apple.com",
+    "github.com", "twitch.tv", "discord.com", "steampowered.com", "epicgames.com",
+    "cloudflare.com", "live.com", "office.com", "bing.com", "linkedin.com",
+    "spotify.com", "ea.com", "riotgames.com", "ubisoft.com", "battle.net",
+    "lemonde.fr", "leboncoin.fr", "orange.fr", "free.fr", "sfr.fr",
+]
+
+
+# ============ FORMAT DNS ============
+
+def encode_name(name):
+    """Nom de domaine au format DNS (labels préfixés par leur longueur)"""
+    encoded = b""
+    for label in name.rstrip('.').split('.'):
+        raw = label.encode('idna')
+        if not 0 < len(raw) < 64:
+            raise ValueError(f"Label DNS invalide : {label!r}")
+        encoded += bytes([len(raw)]) + raw
+    return encoded + b"\0"
+
+
+def build_query(qid, name, qtype=QTYPE_A):
+    """Requête standard, récursion demandée (RD)"""
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)
+    return header + encode_name(name) + struct.pack("!HH", qtype, QCLASS_IN)
+
+
+def _skip_name(data, offset):
+    """Position après un nom (gère les pointeurs de compression)"""
+    while True:
+        length = data[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += length + 1
+
+
+def parse_response(data):
+    """(id, rcode, [adresses IPv4]) ; None si le paquet est illisible"""
+    if len(data) < 12:
+        return None
+    qid, flags, qdcount, ancount, _, _ = struct.unpack("!HHHHHH", data[:12])
+    if not flags & 0x8000:
+        return None  # pas une réponse
+    rcode = flags & 0x000F
+    addresses = []
+    try:
+        offset = 12
+        for _ in range(qdcount):
+            offset = _skip_name(data, offset) + 4
+        for _ in range(ancount):
+            offset = _skip_name(data, offset)
+            rtype, _, _, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+            offset += 10
+            if rtype == QTYPE_A and rdlength == 4:
+                addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+            offset += rdlength
+    except (IndexError, struct.error):
+        pass  # réponse tronquée : l'en-tête suffit pour la mesure
+    return qid, rcode, addresses
+
+
+# ============ BENCHMARK ============
+
+class _ResolverState:
+    """Socket et requêtes en vol d'un résolveur"""
+
+    def __init__(self, addr, port):
+        self.addr = (addr, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.queue = []
+        self.in_flight = {}  # id -> (domaine, instant d'envoi)
+        self._id = random.getrandbits(16)
+
+    def next_id(self):
+        """Identifiant suivant (départ aléatoire, jamais réutilisé pendant une passe)"""
+        self._id = (self._id + 1) & 0xFFFF
+        return self._id
+
+
+class DnsBenchmark:
+    """Comparatif de résolveurs : passes froide et chaude sur une liste de domaines"""
+
+    def __init__(self, resolvers=None, domains=None, timeout=2.0, concurrency=8, port=53):
+        self.resolvers = resolvers or DEFAULT_RESOLVERS
+        self.domains = domains or DEFAULT_DOMAINS
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.port = port
+        self.stop_requested = False
+
+    def run_pass(self, progress=None):
+        """Une passe : chaque domaine envoyé une fois à chaque résolveur
+
+        Retourne {ip: {domaine: (rcode, rtt_ms, adresses) ou None si timeout}}
+        """
+        states = {}
+        for ip, _ in self.resolvers:
+            state = _ResolverState(ip, self.port)
+            state.queue = list(reversed(self.domains))
+            states[ip] = state
+        by_sock = {state.sock: ip for ip, state in states.items()}
+        answers = {ip: {} for ip in states}
+        total = len(states) * len(self.domains)
+
+        try:
+            while not self.stop_requested:
+                now = time.perf_counter()
+                # Timeouts, puis remplissage des requêtes en vol
+                for ip, state in states.items():
+                    for qid, (domain, sent_at) in list(state.in_flight.items()):
+                        if now - sent_at > self.timeout:
+                            answers[ip][domain] = None
+                            del state.in_flight[qid]
+                    while state.queue and len(state.in_flight) < self.concurrency:
+                        domain = state.queue.pop()
+                        qid = state.next_id()
+                        try:
+                            packet = build_query(qid, domain)
+                            sent_at = time.perf_counter()
+                            state.sock.sendto(packet, state.addr)
+                            state.in_flight[qid] = (domain, sent_at)
+                        except (OSError, ValueError):
+                            answers[ip][domain] = None
+
+                if not any(state.queue or state.in_flight for state in states.values()):
+                    break
+
+                ready, _, _ = select.select(list(by_sock), [], [], 0.05)
+                for sock in ready:
+                    ip = by_sock[sock]
+                    state = states[ip]
+                    while True:
+                        try:
+                            data, source = sock.recvfrom(4096)
+                        except (BlockingIOError, InterruptedError):
+                            break
+                        except OSError:
+                            break  # ICMP port injoignable : les requêtes expireront
+                        received_at = time.perf_counter()
+                        parsed = parse_response(data)
+                        if parsed is None or source[0] != ip:
+                            continue
+                        qid, rcode, addresses = parsed
+                        pending = state.in_flight.pop(qid, None)
+                        if pending is None:
+                            continue  # réponse tardive ou usurpée
+                        domain, sent_at = pending
+                        answers[ip][domain] = (rcode, (received_at - sent_at) * 1000, addresses)
+
+                if progress:
+                    progress(sum(len(a) for a in answers.values()), total)
+        finally:
+            for state in states.values():
+                state.sock.close()
+        return answers
+
+    def run(self, progress=None):
+        """Passes froide puis chaude ; rapport par résolveur, le plus rapide d'abord"""
+        cold = self.run_pass(lambda done, total: progress and progress(done, total * 2))
+        warm = self.run_pass(lambda done, total: progress and progress(total + done, total * 2))
+
+        report = []
+        for ip, name in self.resolvers:
+            entry = {'ip': ip, 'name': name}
+            for label, answers in (('cold', cold[ip]), ('warm', warm[ip])):
+                entry[label] = summarize_pass(answers, len(self.domains))
+            report.append(entry)
+        report.sort(key=rank_key)
+        return report
+
+
+def summarize_pass(answers, expected):
+    """Latences et échecs d'une passe pour un résolveur
+
+    NXDOMAIN est une réponse valide ; SERVFAIL/REFUSED et les timeouts sont
+    des échecs.
+    """
+    samples = LatencySamples()
+    timeouts = errors = 0
+    for domain_answer in answers.values():
+        if domain_answer is None:
+            timeouts += 1
+            samples.add(None)
+            continue
+        rcode, rtt, _ = domain_answer
+        if rcode in (RCODE_NOERROR, RCODE_NXDOMAIN):
+            samples.add(rtt)
+        else:
+            errors += 1
+            samples.add(None)
+    summary = samples.summary()
+    summary.update(
+        timeouts=timeouts,
+        errors=errors,
+        failure_percent=(timeouts + errors) / expected * 100 if expected else 0,
+    )
+    return summary
+
+
+def rank_key(entry):
+    """Résolveurs fiables (< 5% d'échecs) d'abord, puis médiane froide + chaude"""
+    cold, warm = entry['cold'], entry['warm']
+    unreliable = max(cold['failure_percent'], warm['failure_percent']) >= 5
+    if not cold['success'] and not warm['success']:
+        return (2, 0)
+    return (1 if unreliable else 0, cold['p50'] + warm['p50'])
+
+
+def resolve_with(resolver, domain, timeout=2.0, port=53):
+    """Résoudre un domaine via un résolveur donné : {'success', 'ip', 'time'}"""
+    answers = DnsBenchmark([(resolver, resolver)], [domain], timeout=timeout, port=port).run_pass()
+    answer = answers[resolver].get(domain)
+    if not answer or answer[0] != RCODE_NOERROR or not answer[2]:
+        return {'success': False, 'ip': None, 'time': 0}
+    return {'success': True, 'ip': answer[2][0], 'time': answer[1]}
+
+
+# ============ SERVEUR DNS LOCAL (TESTS) ============
+
+class StubDnsServer:
+    """Serveur DNS UDP minimal : enregistrements A fixes, NXDOMAIN sinon
+
+    `delay` : latence ajoutée (s), `drop` : probabilité de ne pas répondre.
+    """
+
+    def __init__(self, records=None, host='127.0.0.1', port=0, delay=0.0, drop=0.0, seed=None):
+        self.records = {name.lower().rstrip('.'): ip for name, ip in (records or {}).items()}
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.address = self.sock.getsockname()
+        self.delay = delay
+        self.drop = drop
+        self.random = random.Random(seed)
+        self.queries = 0
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True, name="stub-dns")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1)
+        self.sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def answer(self, query):
+        """Réponse à une requête (bytes) ; None si illisible"""
+        if len(query) < 12:
+            return None
+        qid, flags = struct.unpack("!HH", query[:4])
+        labels = []
+        offset = 12
+        try:
+            while query[offset]:
+                length = query[offset]
+                labels.append(query[offset + 1:offset + 1 + length].decode('ascii', 'replace'))
+                offset += length + 1
+            question = query[12:offset + 5]
+            qtype = struct.unpack("!H", query[offset + 1:offset + 3])[0]
+        except (IndexError, struct.error):
+            return None
+        name = ".".join(labels).lower()
+        ip = self.records.get(name)
+        response_flags = 0x8180 | (flags & 0x0100)
+        if ip is None:
+            return struct.pack("!HHHHHH", qid, response_flags | RCODE_NXDOMAIN, 1, 0, 0, 0) + question
+        answers = b""
+        count = 0
+        if qtype == QTYPE_A:
+            answers = struct.pack("!HHHIH", 0xC00C, QTYPE_A, QCLASS_IN, 60, 4) + socket.inet_aton(ip)
+            count = 1
+        return struct.pack("!HHHHHH", qid, response_flags, 1, count, 0, 0) + question + answers
+
+    def _serve(self):
+        import heapq
+        queue = []
+        order = 0
+        while self._running:
+            now = time.perf_counter()
+            while queue and queue[0][0] <= now:
+                _, _, packet, peer = heapq.heappop(queue)
+                try:
+                    self.sock.sendto(packet, peer)
+                except OSError:
+                    pass
+            wait = 0.1 if not queue else max(0.0, queue[0][0] - now)
+            ready, _, _ = select.select([self.sock], [], [], min(wait, 0.1))
+            if not ready:
+                continue
+            try:
+                query, peer = self.sock.recvfrom(4096)
+            except OSError:
+                continue
+            self.queries += 1
+            if self.random.random() < self.drop:
+                continue
+            response = self.answer(query)
+            if response is not None:
+                order += 1
+                heapq.heappush(queue, (time.perf_counter() + self.delay, order, response, peer))
@@ -0,0 +1,214 @@
+# modules/game_services.py
+"""
+Game Services - Accessibilité des services de jeu (ports TCP/UDP)
+Utilisé par : Network Tester (test services de jeu)
+
+- Catalogue de services (Steam, Xbox, PlayStation, Battle.net, Riot...) :
+  hôte, port, protocole ; personnalisable via un fichier JSON
+- Toutes les vérifications en parallèle (nombre borné), délai par vérification
+- TCP : connexion complète ; UDP : requête STUN (réponse attendue) ou
+  datagramme simple (refus ICMP = bloqué, silence = filtré/inconnu)
+- Matrice service × vérification : OK/échec et latence, en quelques secondes
+"""
+
+import os
+import json
+import time
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from modules.net_probes import get_network_data_dir
+
+CHECK_TIMEOUT = 2.0
+CONCURRENCY = 32
+
+STATUS_OK = 'ok'
+STATUS_FAIL = 'fail'
+STATUS_FILTERED = 'filtered'
+STATUS_PARTIAL = 'partial'  # service : une partie des vérifications seulement
+
+STATUS_ICONS = {STATUS_OK: "✅", STATUS_FAIL: "❌", STATUS_FILTERED: "❔", STATUS_PARTIAL: "⚠️"}
+
+# Vérifications UDP : 'stun' (Binding Request RFC 5389) ou 'udp' (datagramme simple)
+DEFAULT_CATALOGUE = [
+    {'service': "Steam", 'host': "store.steampowered.com", 'port': 443, 'proto': 'tcp'},
+    {'service': "Steam", 'host': "api.steampowered.com", 'port': 443, 'proto': 'tcp'},
+    {'service': "Steam", 'host': "steamcommunity.com", 'port': 443, 'proto': 'tcp'},
+    # Serveurs de connexion Steam (CM) : plage TCP 27015-27050 du client
+    {'service': "Steam (connexion jeu)", 'host': "ext1-fra1.steamserver.net", 'port': 27017, 'proto': 'tcp'},
+    {'service': "Steam (connexion jeu)", 'host': "ext1-ams1.steamserver.net", 'port': 27018, 'proto': 'tcp'},
+    {'service': "Xbox Live", 'host': "user.auth.xboxlive.com", 'port': 443, 'proto': 'tcp'},
+    {'service': "Xbox Live", 'host': "xsts.auth.xboxlive.com", 'port': 443, 'proto': 'tcp'},
+    {'service': "PlayStation Network", 'host': "my.account.sony.com", 'port': 443, 'proto': 'tcp'},
+    # Port du service Battle.net (connexion, matchmaking) hors HTTPS
+    {'service': "Battle.net", 'host': "eu.actual.battle.net", 'port': 1119, 'proto': 'tcp'},
+    {'service': "Battle.net", 'host': "us.actual.battle.net", 'port': 1119, 'proto': 'tcp'},
+    {'service': "Riot Games", 'host': "auth.riotgames.com", 'port': 443, 'proto': 'tcp'},
+    {'service': "Riot Games", 'host': "clientconfig.rpg.riotgames.com", 'port': 443, 'proto': 'tcp'},
+    # Chat / amis Riot (XMPP) : sans lui, le client reste "hors ligne"
+    {'service': "Riot Games (chat)", 'host': "euw1.chat.si.riotgames.com", 'port': 5223, 'proto': 'tcp'},
+    {'service': "Riot Games (chat)", 'host': "na2.chat.si.riotgames.com", 'port': 5223, 'proto': 'tcp'},
+    {'service': "Epic Games", 'host': "account-public-service-prod.ol.epicgames.com", 'port': 443, 'proto': 'tcp'},
+    {'service': "EA App", 'host': "accounts.ea.com", 'port': 443, 'proto': 'tcp'},
+    {'service': "Nintendo", 'host': "ctest.cdn.nintendo.net", 'port': 80, 'proto': 'tcp'},
+    {'service': "Discord", 'host': "discord.com", 'port': 443, 'proto': 'tcp'},
+    # Xbox / PlayStation : les ports de jeu (3074, 3478-3480...) sont ceux des
+    # consoles et des autres joueurs, pas de serveurs joignables : testés via STUN
+    # UDP / NAT : les jeux en ligne et le chat vocal passent par STUN
+    {'service': "UDP / NAT (STUN)", 'host': "stun.l.google.com", 'port': 19302, 'proto': 'udp', 'check': 'stun'},
+    {'service': "UDP / NAT (STUN)", 'host': "stun.cloudflare.com", 'port': 3478, 'proto': 'udp', 'check': 'stun'},
+]
+
+STUN_BINDING_REQUEST = 0x0001
+STUN_BINDING_SUCCESS = 0x0101
+STUN_MAGIC_COOKIE = 0x2112A442
+
+
+def catalogue_path():
+    return get_network_data_dir() / "game_services.json"
+
+
+def load_catalogue(path=None):
+    """Catalogue personnalisé (JSON : liste d'entrées) sinon catalogue par défaut"""
+    path = path or catalogue_path()
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return [e for e in entries if {'service', 'host', 'port'} <= set(e)]
+        except (OSError, ValueError, TypeError):
+            pass
+    return [dict(entry) for entry in DEFAULT_CATALOGUE]
+
+
+def save_default_catalogue(path=None):
+    """Écrire le catalogue par défaut (point de départ pour le personnaliser)"""
+    path = path or catalogue_path()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(DEFAULT_CATALOGUE, f, indent=2, ensure_ascii=False)
+    return path
+
+
+# ============ VÉRIFICATIONS ============
+
+def build_stun_request(transaction_id):
+    return struct.pack("!HHI12s", STUN_BINDING_REQUEST, 0, STUN_MAGIC_COOKIE, transaction_id)
+
+
+def is_stun_response(data, transaction_id):
+    if len(data) < 20:
+        return False
+    msg_type, _, cookie, tid = struct.unpack("!HHI12s", data[:20])
+    return msg_type == STUN_BINDING_SUCCESS and cookie == STUN_MAGIC_COOKIE and tid == transaction_id
+
+
+def _check_tcp(address, timeout):
+    start = time.perf_counter()
+    with socket.create_connection(address, timeout=timeout):
+        return STATUS_OK, (time.perf_counter() - start) * 1000
+
+
+def _check_udp(address, timeout, kind):
+    with socket.socket(socket.AF_INET6 if ':' in address[0] else socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        # Socket connectée : le refus ICMP (port fermé) remonte en ConnectionRefusedError
+        sock.connect(address)
+        transaction_id = os.urandom(12)
+        payload = build_stun_request(transaction_id) if kind == 'stun' else b"WAPINATOR"
+        start = time.perf_counter()
+        sock.send(payload)
+        deadline = start + timeout
+        while True:
+            sock.settimeout(max(0.001, deadline - time.perf_counter()))
+            try:
+                data = sock.recv(2048)
+            except socket.timeout:
+                # Silence : pare-feu qui jette, ou service qui ignore ce datagramme
+                return (STATUS_FAIL if kind == 'stun' else STATUS_FILTERED), None
+            if kind != 'stun' or is_stun_response(data, transaction_id):
+                return STATUS_OK, (time.perf_counter() - start) * 1000
+
+
+def check_entry(entry, timeout=CHECK_TIMEOUT):
+    """{'status', 'latency' (ms), 'error', 'address'} pour une entrée du catalogue"""
+    proto = entry.get('proto', 'tcp').lower()
+    result = dict(entry, proto=proto, status=STATUS_FAIL, latency=None, error=None, address=None)
+    try:
+        socktype = socket.SOCK_STREAM if proto == 'tcp' else socket.SOCK_DGRAM
+        info = socket.getaddrinfo(entry['host'], int(entry['port']), socket.AF_UNSPEC, socktype)[0]
+        address = info[4][:2]
+        result['address'] = address[0]
+        if proto == 'tcp':
+            result['status'], result['latency'] = _check_tcp(address, timeout)
+        else:
+            result['status'], result['latency'] = _check_udp(address, timeout, entry.get('check', 'udp'))
+    except socket.gaierror:
+        result['error'] = "Nom introuvable (DNS)"
+    except ConnectionRefusedError:
+        result['error'] = "Port fermé / refusé"
+    except socket.timeout:
+        result['error'] = "Délai dépassé"
+    except OSError as e:
+        result['error'] = str(e) or type(e).__name__
+    return result
+
+
+# ============ MATRICE ============
+
+def check_services(catalogue=None, timeout=CHECK_TIMEOUT, concurrency=CONCURRENCY, progress=None):
+    """Vérifier tout le catalogue en parallèle ; retourne la matrice par service"""
+    catalogue = catalogue if catalogue is not None else load_catalogue()
+    start = time.perf_counter()
+    results = [None] * len(catalogue)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(catalogue))))
+    futures = {executor.submit(check_entry, entry, timeout): i for i, entry in enumerate(catalogue)}
+    done = 0
+    pending = set(futures)
+    # Borne globale : résolution DNS + vérification, même si getaddrinfo traîne
+    deadline = start + 2 * timeout + 1
+    while pending:
+        finished, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()),
+                                 return_when=FIRST_COMPLETED)
+        if not finished:
+            break
+        for future in finished:
+            results[futures[future]] = future.result()
+            done += 1
+            if progress:
+                progress(done, len(catalogue))
+    executor.shutdown(wait=False)
+    for i, entry in enumerate(catalogue):
+        if results[i] is None:
+            results[i] = dict(entry, proto=entry.get('proto', 'tcp').lower(), status=STATUS_FAIL,
+                              latency=None, error="Délai dépassé", address=None)
+
+    services = {}
+    for result in results:
+        services.setdefault(result['service'], []).append(result)
+    matrix = []
+    for name, checks in services.items():
+        passed = sum(1 for c in checks if c['status'] == STATUS_OK)
+        latencies = [c['latency'] for c in checks if c['latency'] is not None]
+        if passed == len(checks):
+            status = STATUS_OK
+        elif passed:
+            status = STATUS_PARTIAL
+        elif any(c['status'] == STATUS_FILTERED for c in checks):
+            status = STATUS_FILTERED
+        else:
+            status = STATUS_FAIL
+        matrix.append({
+            'service': name,
+            'status': status,
+            'passed': passed,
+            'total': len(checks),
+            'best_latency': min(latencies) if latencies else None,
+            'checks': checks,
+        })
+    return {
+        'duration': time.perf_counter() - start,
+        'services': matrix,
+        'passed': sum(1 for r in results if r['status'] == STATUS_OK),
+        'total': len(results),
+    }
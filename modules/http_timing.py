@@ -0,0 +1,284 @@
+# modules/http_timing.py
+"""
+HTTP Timing - Décomposition du temps d'une requête web par phase
+Utilisé par : Network Tester (test "Internet lent")
+
+- Chaque requête mesurée phase par phase sur une socket brute :
+  DNS, connexion TCP, négociation TLS, attente serveur (TTFB), transfert
+- Plusieurs URL en parallèle (nombre borné), plusieurs passes
+- Percentiles par phase (p50/p95) et phase dominante par URL
+- Comparaison avec les passes précédentes (historique JSON)
+- Serveur HTTP/HTTPS local pour vérifier les mesures sans internet
+"""
+
+import ssl
+import json
+import time
+import socket
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.net_probes import get_network_data_dir
+from modules.latency_stats import summarize
+
+DEFAULT_URLS = [
+    "https://www.google.com/",
+    "https://www.cloudflare.com/",
+    "https://www.microsoft.com/",
+    "https://www.wikipedia.org/",
+    "https://www.youtube.com/",
+    "https://store.steampowered.com/",
+]
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'transfer', 'total')
+PHASE_NAMES = {
+    'dns': "DNS",
+    'connect': "Connexion TCP",
+    'tls': "TLS",
+    'ttfb': "Attente serveur (TTFB)",
+    'transfer': "Transfert",
+    'total': "Total",
+}
+
+TIMEOUT = 5
+CONCURRENCY = 8
+ROUNDS = 5
+MAX_BODY = 2 * 1024 ** 2
+HISTORY_RUNS = 20
+USER_AGENT = "Wapinator-HttpTiming/1.0"
+
+
+def parse_urls(text):
+    """URL séparées par des espaces, virgules ou retours à la ligne ("https://" ajouté si absent)"""
+    urls = []
+    for item in text.replace(',', ' ').split():
+        urls.append(item if "://" in item else "https://" + item)
+    return urls
+
+
+# ============ MESURE D'UNE REQUÊTE ============
+
+def time_request(url, timeout=TIMEOUT, verify=True):
+    """Durée de chaque phase (ms) d'un GET ; {'error', 'phase'} en cas d'échec"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = parts.hostname
+    port = parts.port or (443 if scheme == 'https' else 80)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    result = {'url': url, 'tls': None}
+    phase = 'dns'
+    sock = None
+    try:
+        start = time.perf_counter()
+        infos = socket.getaddrinfo(host, port, socket.AF_UNSPEC, socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        result['dns'] = (resolved - start) * 1000
+
+        phase = 'connect'
+        family, socktype, proto, _, address = infos[0]
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(timeout)
+        sock.connect(address)
+        connected = time.perf_counter()
+        result['connect'] = (connected - resolved) * 1000
+        result['address'] = address[0]
+
+        if scheme == 'https':
+            phase = 'tls'
+            context = ssl.create_default_context()
+            if not verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            sock = context.wrap_socket(sock, server_hostname=host)  # négociation incluse
+            handshaken = time.perf_counter()
+            result['tls'] = (handshaken - connected) * 1000
+            result['tls_version'] = sock.version()
+        else:
+            handshaken = connected
+
+        phase = 'ttfb'
+        sock.sendall(
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+            "Accept: */*\r\nAccept-Encoding: identity\r\nConnection: close\r\n\r\n".encode('latin-1')
+        )
+        first = sock.recv(65536)
+        first_byte = time.perf_counter()
+        if not first:
+            raise ConnectionError("Connexion fermée sans réponse")
+        result['ttfb'] = (first_byte - handshaken) * 1000
+
+        phase = 'transfer'
+        received = len(first)
+        head = first
+        while received < MAX_BODY:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            received += len(chunk)
+            if len(head) < 4096:
+                head += chunk
+        finished = time.perf_counter()
+        result['transfer'] = (finished - first_byte) * 1000
+        result['total'] = (finished - start) * 1000
+        result['bytes'] = received
+        status_line = head.split(b"\r\n", 1)[0].split()
+        result['status'] = int(status_line[1]) if len(status_line) > 1 and status_line[1].isdigit() else None
+        return result
+    except (OSError, ssl.SSLError, ValueError) as e:
+        return {'url': url, 'error': str(e) or type(e).__name__, 'phase': phase}
+    finally:
+        if sock is not None:
+            sock.close()
+
+
+# ============ SÉRIE DE MESURES ============
+
+class HttpTimingProbe:
+    """Plusieurs passes sur plusieurs URL, en parallèle (nombre borné)"""
+
+    def __init__(self, urls=None, rounds=ROUNDS, concurrency=CONCURRENCY, timeout=TIMEOUT,
+                 verify=True, history_path=None):
+        self.urls = list(urls or DEFAULT_URLS)
+        self.rounds = max(1, int(rounds))
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.verify = verify
+        self.history_path = history_path or (get_network_data_dir() / "http_timing.json")
+
+    def run(self, progress=None):
+        """Mesurer (bloquant) ; retourne [{'url', 'phases', 'errors', ...}] par URL"""
+        samples = {url: [] for url in self.urls}
+        total = len(self.urls) * self.rounds
+        done = 0
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(self.urls))) as executor:
+            # Une passe = toutes les URL en parallèle, connexions neuves à chaque fois
+            for _ in range(self.rounds):
+                for sample in executor.map(lambda u: time_request(u, self.timeout, self.verify), self.urls):
+                    samples[sample['url']].append(sample)
+                    done += 1
+                    if progress:
+                        progress(done, total)
+
+        history = self._load_history()
+        report = [self._summarize(url, samples[url], history.get(url, [])) for url in self.urls]
+        self._save_history(history, report)
+        return report
+
+    @staticmethod
+    def _summarize(url, samples, previous_runs):
+        ok = [s for s in samples if 'error' not in s]
+        failures = [s for s in samples if 'error' in s]
+        phases = {}
+        for phase in PHASES:
+            values = [s[phase] for s in ok if s.get(phase) is not None]
+            if values:
+                phases[phase] = summarize(values)
+        previous = previous_runs[-1] if previous_runs else None
+        comparison = {}
+        if previous:
+            for phase, data in phases.items():
+                if phase in previous['p50']:
+                    comparison[phase] = data['p50'] - previous['p50'][phase]
+        dominant = None
+        if phases:
+            dominant = max((p for p in phases if p != 'total'), key=lambda p: phases[p]['p50'], default=None)
+        return {
+            'url': url,
+            'requests': len(samples),
+            'success': bool(ok),
+            'phases': phases,
+            'dominant': dominant,
+            'status': ok[-1].get('status') if ok else None,
+            'bytes': ok[-1].get('bytes', 0) if ok else 0,
+            'errors': [f"{PHASE_NAMES[s['phase']]}: {s['error']}" for s in failures],
+            'previous': previous,
+            'delta_p50': comparison,
+        }
+
+    def _load_history(self):
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_history(self, history, report):
+        now = datetime.now().isoformat(timespec='seconds')
+        for entry in report:
+            if not entry['success']:
+                continue
+            runs = history.setdefault(entry['url'], [])
+            runs.append({
+                'time': now,
+                'p50': {phase: data['p50'] for phase, data in entry['phases'].items()},
+                'p95': {phase: data['p95'] for phase, data in entry['phases'].items()},
+            })
+            del runs[:-HISTORY_RUNS]
+        try:
+            with open(self.history_path, 'w', encoding='utf-8') as f:
+                json.dump(history, f, indent=2)
+        except OSError:
+            pass
+
+
+# ============ SERVEUR LOCAL ============
+
+class _TimingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if server.delay:
+            time.sleep(server.delay)
+        body = b'\0' * server.size
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TimingServer:
+    """Serveur HTTP (ou HTTPS avec certfile/keyfile) au temps de réponse réglable"""
+
+    def __init__(self, host='127.0.0.1', port=0, certfile=None, keyfile=None, delay=0.0, size=16 * 1024):
+        self.server = ThreadingHTTPServer((host, port), _TimingHandler)
+        self.server.daemon_threads = True
+        self.server.delay = delay
+        self.server.size = size
+        self.scheme = 'http'
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            self.scheme = 'https'
+        self.address = self.server.server_address
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"{self.scheme}://{self.address[0]}:{self.address[1]}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True,
+                                        name="http-timing-server")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,277 @@
+# modules/lan_discovery.py
+"""
+LAN Discovery - Appareils présents sur le réseau local
+Utilisé par : Network Tester (scan du réseau local)
+
+- Balayage du /24 local (ou d'une plage CIDR) par connexions TCP asyncio
+  sur les ports courants, nombre de connexions simultanées borné
+- Un port fermé (refus) suffit à prouver que l'appareil est présent
+- Complété par le cache ARP (appareils sans port ouvert : téléphones, IoT)
+- Temps de réponse, ports ouverts, nom d'hôte (DNS inverse), adresse MAC
+- Résultats conservés entre deux scans : nouveaux appareils et absents signalés
+"""
+
+import re
+import sys
+import json
+import time
+import socket
+import asyncio
+import ipaddress
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from modules.net_probes import get_network_data_dir
+from modules.net_interfaces import default_interface
+
+if sys.platform == 'win32':
+    CREATE_NO_WINDOW = 0x08000000
+    STARTUPINFO = subprocess.STARTUPINFO()
+    STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+else:
+    CREATE_NO_WINDOW = 0
+    STARTUPINFO = None
+
+# Ports courants des appareils domestiques : {port: service}
+COMMON_PORTS = {
+    80: "HTTP",
+    443: "HTTPS",
+    22: "SSH",
+    139: "NetBIOS",
+    445: "Partage Windows (SMB)",
+    3389: "Bureau à distance",
+    8080: "HTTP alternatif",
+    554: "RTSP (caméra)",
+    9100: "Imprimante",
+    5000: "NAS / UPnP",
+    8009: "Chromecast",
+    62078: "iPhone / iPad",
+}
+
+CONNECT_TIMEOUT = 0.3
+CONCURRENCY = 512
+MAX_HOSTS = 1024
+HOSTNAME_TIMEOUT = 1.5
+
+ARP_LINE = re.compile(r"(\d{1,3}(?:\.\d{1,3}){3})\s+((?:[0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2})")
+
+
+def default_network():
+    """Réseau de la carte par défaut, limité au /24 autour de l'adresse locale"""
+    adapter = default_interface()
+    if not adapter or not adapter['ipv4']:
+        return None
+    address = adapter['ipv4'][0]
+    network = ipaddress.ip_network(f"{address}/{adapter['netmask'] or '255.255.255.0'}", strict=False)
+    if network.prefixlen < 24:
+        network = ipaddress.ip_network(f"{address}/24", strict=False)
+    return network
+
+
+def parse_network(text):
+    """CIDR ("192.168.1.0/24") ou adresse seule (/24 autour) ; ValueError si invalide"""
+    text = text.strip()
+    network = ipaddress.ip_network(text if '/' in text else f"{text}/24", strict=False)
+    if network.version != 4:
+        raise ValueError("Seul l'IPv4 est pris en charge")
+    if network.num_addresses > MAX_HOSTS + 2:
+        raise ValueError(f"Plage trop grande (max {MAX_HOSTS} adresses)")
+    return network
+
+
+# ============ CACHE ARP ============
+
+def _normalize_mac(mac):
+    return mac.replace('-', ':').lower()
+
+
+def parse_arp_output(output):
+    """{ip: mac} depuis `arp -a` (Windows) ; diffusion et multicast ignorés"""
+    entries = {}
+    for ip, mac in ARP_LINE.findall(output):
+        mac = _normalize_mac(mac)
+        if mac == "ff:ff:ff:ff:ff:ff" or mac.startswith("01:00:5e") or mac == "00:00:00:00:00:00":
+            continue
+        entries[ip] = mac
+    return entries
+
+
+def read_arp_cache():
+    """{ip: mac} des voisins connus du système"""
+    if sys.platform != 'win32':
+        entries = {}
+        try:
+            with open('/proc/net/arp', 'r') as f:
+                for line in f.readlines()[1:]:
+                    fields = line.split()
+                    # Drapeau 0x0 : entrée incomplète (aucune réponse)
+                    if len(fields) >= 4 and fields[2] != '0x0' and fields[3] != "00:00:00:00:00:00":
+                        entries[fields[0]] = fields[3].lower()
+        except OSError:
+            pass
+        return entries
+    try:
+        result = subprocess.run(
+            ["arp", "-a"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            creationflags=CREATE_NO_WINDOW,
+            startupinfo=STARTUPINFO
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return {}
+    return parse_arp_output(result.stdout)
+
+
+# ============ BALAYAGE ============
+
+class LanScanner:
+    """Balayage TCP asyncio d'une plage + cache ARP, résultats mis en cache"""
+
+    def __init__(self, network=None, ports=None, timeout=CONNECT_TIMEOUT, concurrency=CONCURRENCY,
+                 cache_path=None, resolve_names=True):
+        self.network = parse_network(str(network)) if network else default_network()
+        self.ports = list(ports or COMMON_PORTS)
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.resolve_names = resolve_names
+        self.cache_path = cache_path or (get_network_data_dir() / "lan_devices.json")
+
+    def hosts(self):
+        if self.network is None:
+            return []
+        if self.network.num_addresses == 1:
+            return [str(self.network.network_address)]
+        return [str(ip) for ip in self.network.hosts()]
+
+    async def _probe(self, semaphore, ip, port, found):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), self.timeout)
+            except ConnectionRefusedError:
+                # Refus (RST) : l'appareil est là, le port est fermé
+                self._seen(found, ip, time.perf_counter() - start)
+                return
+            except (asyncio.TimeoutError, OSError):
+                return
+            self._seen(found, ip, time.perf_counter() - start)['open_ports'].append(port)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _seen(found, ip, elapsed):
+        device = found.setdefault(ip, {'ip': ip, 'rtt': None, 'open_ports': []})
+        rtt = elapsed * 1000
+        if device['rtt'] is None or rtt < device['rtt']:
+            device['rtt'] = rtt
+        return device
+
+    async def _sweep(self, hosts, progress):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        found = {}
+        done = 0
+
+        async def scan_host(ip):
+            nonlocal done
+            await asyncio.gather(*(self._probe(semaphore, ip, port, found) for port in self.ports))
+            done += 1
+            if progress:
+                progress(done, len(hosts))
+
+        await asyncio.gather(*(scan_host(ip) for ip in hosts))
+        return found
+
+    def _hostnames(self, ips):
+        """DNS inverse en parallèle, abandonné après HOSTNAME_TIMEOUT s"""
+        names = {}
+        if not ips:
+            return names
+        executor = ThreadPoolExecutor(max_workers=min(32, len(ips)))
+        futures = {executor.submit(socket.gethostbyaddr, ip): ip for ip in ips}
+        finished, _ = wait(futures, timeout=HOSTNAME_TIMEOUT)
+        for future in finished:
+            try:
+                names[futures[future]] = future.result()[0]
+            except OSError:
+                pass
+        executor.shutdown(wait=False)
+        return names
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def run(self, progress=None):
+        """Scanner la plage (bloquant) ; retourne le rapport"""
+        hosts = self.hosts()
+        if not hosts:
+            return {'success': False, 'error': "Aucun réseau local détecté"}
+        start = time.perf_counter()
+        found = asyncio.run(self._sweep(hosts, progress))
+
+        in_range = set(hosts)
+        arp = {ip: mac for ip, mac in read_arp_cache().items() if ip in in_range}
+        for ip in arp:
+            found.setdefault(ip, {'ip': ip, 'rtt': None, 'open_ports': []})
+        names = self._hostnames(list(found)) if self.resolve_names else {}
+
+        adapter = default_interface()
+        local_ips = set(adapter['ipv4']) if adapter else set()
+        gateway = adapter['gateway'] if adapter else None
+
+        now = time.time()
+        cache = self.load_cache()
+        devices = []
+        for ip in sorted(found, key=lambda a: ipaddress.ip_address(a)):
+            device = found[ip]
+            previous = cache.get(ip, {})
+            device['open_ports'].sort()
+            device.update({
+                'mac': arp.get(ip) or previous.get('mac'),
+                'hostname': names.get(ip) or previous.get('hostname'),
+                'is_self': ip in local_ips,
+                'is_gateway': ip == gateway,
+                'first_seen': previous.get('first_seen', now),
+                'last_seen': now,
+                'new': ip not in cache,
+            })
+            devices.append(device)
+
+        missing = [dict(cache[ip], ip=ip) for ip in sorted(cache, key=lambda a: ipaddress.ip_address(a))
+                   if ip not in found and ip in in_range]
+        self._save_cache(cache, devices)
+        return {
+            'success': True,
+            'network': str(self.network),
+            'scanned': len(hosts),
+            'ports': self.ports,
+            'duration': time.perf_counter() - start,
+            'devices': devices,
+            'new': [d for d in devices if d['new'] and cache],
+            'missing': missing,
+        }
+
+    def _save_cache(self, cache, devices):
+        for device in devices:
+            cache[device['ip']] = {key: device[key] for key in
+                                   ('mac', 'hostname', 'open_ports', 'rtt', 'first_seen', 'last_seen')}
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+        except OSError:
+            pass
+
+
+def describe_ports(ports):
+    """Ports avec leur service, ex. : 80 (HTTP), 22 (SSH)"""
+    return ", ".join(f"{port} ({COMMON_PORTS[port]})" if port in COMMON_PORTS else str(port)
+                     for port in ports)
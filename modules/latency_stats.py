@@ -0,0 +1,131 @@
+# modules/latency_stats.py
+"""
+Latency Stats - Statistiques de latence (percentiles, jitter RFC 3550)
+Utilisé par : Network Tester
+
+- Échantillons stockés dans un tableau compact (array 'd', 8 octets/mesure)
+- Jitter de l'interarrivée selon RFC 3550 (lissage 1/16), mis à jour à chaque
+  mesure : coût constant, compatible avec un échantillonnage à 50 Hz
+- p50/p95/p99, écart-type, histogramme texte
+"""
+
+import math
+from array import array
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencySamples:
+    """Série de RTT (ms) avec pertes"""
+
+    __slots__ = ('values', 'lost', 'jitter', '_last')
+
+    def __init__(self):
+        self.values = array('d')
+        self.lost = 0
+        self.jitter = 0.0
+        self._last = None
+
+    def add(self, rtt):
+        """Ajouter une mesure (None = perte)"""
+        if rtt is None:
+            self.lost += 1
+            return
+        # RFC 3550 §6.4.1 : J += (|D| - J) / 16, D = écart de temps de transit
+        # entre deux paquets ; pour des echos, l'écart des RTT successifs
+        if self._last is not None:
+            self.jitter += (abs(rtt - self._last) - self.jitter) / 16
+        self._last = rtt
+        self.values.append(rtt)
+
+    def extend(self, rtts):
+        for rtt in rtts:
+            self.add(rtt)
+
+    @property
+    def sent(self):
+        return len(self.values) + self.lost
+
+    def percentile(self, p, ordered=None):
+        """Percentile p (interpolation linéaire entre rangs)"""
+        ordered = ordered if ordered is not None else sorted(self.values)
+        if not ordered:
+            return 0.0
+        rank = (len(ordered) - 1) * p / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    def histogram(self, bins=10, ordered=None):
+        """[(début_ms, fin_ms, nombre)] ; classe finale (p99, None) pour les valeurs au-delà"""
+        ordered = ordered if ordered is not None else sorted(self.values)
+        if not ordered:
+            return []
+        low = ordered[0]
+        # Borne haute au p99 : une valeur aberrante n'écrase pas le graphe
+        high = max(self.percentile(99, ordered), low + 0.1)
+        width = (high - low) / bins
+        counts = [0] * bins
+        overflow = 0
+        for value in ordered:
+            if value > high:
+                overflow += 1
+            else:
+                counts[min(int((value - low) / width), bins - 1)] += 1
+        edges = [(low + i * width, low + (i + 1) * width, counts[i]) for i in range(bins)]
+        if overflow:
+            edges.append((high, None, overflow))
+        return edges
+
+    def summary(self, bins=10):
+        """Résumé sérialisable (utilisé dans les résultats des tests)"""
+        sent = self.sent
+        result = {
+            'success': bool(self.values),
+            'sent': sent,
+            'received': len(self.values),
+            'loss_percent': self.lost / sent * 100 if sent else 0,
+            'avg': 0, 'min': 0, 'max': 0, 'stdev': 0,
+            'p50': 0, 'p95': 0, 'p99': 0,
+            'jitter': 0, 'histogram': [],
+        }
+        if not self.values:
+            return result
+        ordered = sorted(self.values)
+        n = len(ordered)
+        mean = math.fsum(ordered) / n
+        variance = math.fsum((v - mean) ** 2 for v in ordered) / (n - 1) if n > 1 else 0.0
+        result.update(
+            avg=mean,
+            min=ordered[0],
+            max=ordered[-1],
+            stdev=math.sqrt(variance),
+            jitter=self.jitter,
+            histogram=self.histogram(bins, ordered),
+        )
+        for p in PERCENTILES:
+            result[f'p{p}'] = self.percentile(p, ordered)
+        return result
+
+
+def summarize(rtts, bins=10):
+    """Résumé d'une série de RTT (None = perte)"""
+    samples = LatencySamples()
+    samples.extend(rtts)
+    return samples.summary(bins)
+
+
+def format_histogram(histogram, width=40):
+    """Lignes de barres texte ("  12.0-14.0 ms │████████ 42")"""
+    if not histogram:
+        return []
+    peak = max(count for _, _, count in histogram) or 1
+    # Précision adaptée à la largeur des classes (réseau local < 1 ms)
+    step = histogram[0][1] - histogram[0][0]
+    digits = 1 if step >= 0.5 else 2 if step >= 0.05 else 3
+    lines = []
+    for low, high, count in histogram:
+        bar = "█" * round(count / peak * width) if count else ""
+        label = f"> {low:.{digits}f}" if high is None else f"{low:.{digits}f}-{high:.{digits}f}"
+        lines.append(f"  {label:>13} ms │{bar} {count}")
+    return lines
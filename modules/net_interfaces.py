@@ -0,0 +1,345 @@
+# modules/net_interfaces.py
+"""
+Net Interfaces - Inventaire des cartes réseau et de la table de routage
+Utilisé par : Network Tester (infos connexion, surveillance), Widget principal
+
+- Cartes lues via psutil (adresses, état, vitesse du lien, MTU)
+- Passerelle par carte et route par défaut depuis la table de routage
+- DNS par carte et type de média (Ethernet, WiFi, virtuel, VPN) depuis le
+  registre Windows (pas de lecture de ipconfig /all)
+- Inventaire mis en cache : recalculé seulement si les cartes changent
+"""
+
+import os
+import sys
+import socket
+import threading
+import subprocess
+
+import psutil
+
+if sys.platform == 'win32':
+    import winreg
+    CREATE_NO_WINDOW = 0x08000000
+    STARTUPINFO = subprocess.STARTUPINFO()
+    STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+else:
+    winreg = None
+    CREATE_NO_WINDOW = 0
+    STARTUPINFO = None
+
+MEDIA_ETHERNET = "Ethernet (Câble)"
+MEDIA_WIFI = "WiFi (Sans fil)"
+MEDIA_MOBILE = "Réseau mobile"
+MEDIA_VPN = "VPN / Tunnel"
+MEDIA_VIRTUAL = "Virtuelle"
+MEDIA_LOOPBACK = "Bouclage"
+MEDIA_UNKNOWN = "Inconnu"
+
+# IANA ifType (clé *IfType des pilotes réseau)
+IF_TYPES = {
+    6: MEDIA_ETHERNET,
+    71: MEDIA_WIFI,
+    24: MEDIA_LOOPBACK,
+    53: MEDIA_VIRTUAL,
+    131: MEDIA_VPN,
+    243: MEDIA_MOBILE,
+    244: MEDIA_MOBILE,
+}
+
+VIRTUAL_HINTS = ("hyper-v", "vethernet", "virtualbox", "vmware", "docker", "wsl", "loopback",
+                 "virtual", "veth", "br-", "virbr")
+VPN_HINTS = ("vpn", "tap-", "tap ", "tun", "wireguard", "wintun", "tailscale", "zerotier",
+             "openvpn", "nordlynx", "fortinet", "cisco anyconnect", "proton")
+
+NETWORK_CLASS = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e972-e325-11ce-bfc1-08002be10318}"
+NETWORK_CONNECTIONS = r"SYSTEM\CurrentControlSet\Control\Network\{4D36E972-E325-11CE-BFC1-08002BE10318}"
+TCPIP_INTERFACES = r"SYSTEM\CurrentControlSet\Services\Tcpip\Parameters\Interfaces"
+
+
+# ============ TABLE DE ROUTAGE ============
+
+def read_routes():
+    """Routes IPv4 : [{'destination','netmask','gateway','interface','metric'}]
+
+    `interface` : nom de carte (Linux) ou adresse IP locale de la carte (Windows).
+    `gateway` : None pour une route directe ("On-link").
+    """
+    if sys.platform != 'win32':
+        return _read_proc_routes()
+    try:
+        result = subprocess.run(
+            ["route", "print", "-4"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            creationflags=CREATE_NO_WINDOW,
+            startupinfo=STARTUPINFO
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+    return parse_route_print(result.stdout)
+
+
+def _is_ipv4(text):
+    try:
+        socket.inet_aton(text)
+        return text.count('.') == 3
+    except OSError:
+        return False
+
+
+def parse_route_print(output):
+    """Lignes de routes actives de `route print -4` (indépendant de la langue)
+
+    Format : destination, masque, passerelle ("On-link"/"Sur la liaison"),
+    interface, métrique. Les routes persistantes (sans interface) sont ignorées.
+    """
+    routes = []
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) < 5 or not (_is_ipv4(fields[0]) and _is_ipv4(fields[1])):
+            continue
+        if not fields[-1].isdigit() or not _is_ipv4(fields[-2]):
+            continue
+        gateway = fields[2] if _is_ipv4(fields[2]) else None
+        routes.append({
+            'destination': fields[0],
+            'netmask': fields[1],
+            'gateway': gateway,
+            'interface': fields[-2],
+            'metric': int(fields[-1]),
+        })
+    return routes
+
+
+def _read_proc_routes():
+    routes = []
+    try:
+        with open('/proc/net/route', 'r') as f:
+            lines = f.readlines()[1:]
+    except OSError:
+        return routes
+    for line in lines:
+        fields = line.split()
+        try:
+            flags = int(fields[3], 16)
+            if not flags & 1:  # RTF_UP
+                continue
+            gateway = socket.inet_ntoa(int(fields[2], 16).to_bytes(4, 'little')) if flags & 2 else None
+            routes.append({
+                'destination': socket.inet_ntoa(int(fields[1], 16).to_bytes(4, 'little')),
+                'netmask': socket.inet_ntoa(int(fields[7], 16).to_bytes(4, 'little')),
+                'gateway': gateway,
+                'interface': fields[0],
+                'metric': int(fields[6]),
+            })
+        except (IndexError, ValueError):
+            continue
+    return routes
+
+
+# ============ REGISTRE WINDOWS (DNS, TYPE DE MÉDIA) ============
+
+def _reg_value(key, name, default=None):
+    try:
+        return winreg.QueryValueEx(key, name)[0]
+    except OSError:
+        return default
+
+
+def _windows_adapters():
+    """{nom de connexion: {'guid','if_type','description'}} depuis le registre"""
+    adapters = {}
+    drivers = {}
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, NETWORK_CLASS) as root:
+            index = 0
+            while True:
+                try:
+                    sub = winreg.EnumKey(root, index)
+                except OSError:
+                    break
+                index += 1
+                try:
+                    with winreg.OpenKey(root, sub) as key:
+                        guid = _reg_value(key, "NetCfgInstanceId")
+                        if guid:
+                            drivers[guid.upper()] = (
+                                _reg_value(key, "*IfType"),
+                                _reg_value(key, "DriverDesc", ""),
+                            )
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+    for guid, (if_type, description) in drivers.items():
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                                rf"{NETWORK_CONNECTIONS}\{guid}\Connection") as key:
+                name = _reg_value(key, "Name")
+        except OSError:
+            continue
+        if name:
+            adapters[name] = {'guid': guid, 'if_type': if_type, 'description': description}
+    return adapters
+
+
+def _windows_dns(guid):
+    """Serveurs DNS d'une carte (statiques, sinon reçus par DHCP)"""
+    try:
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, rf"{TCPIP_INTERFACES}\{guid}") as key:
+            servers = _reg_value(key, "NameServer", "") or _reg_value(key, "DhcpNameServer", "")
+    except OSError:
+        return []
+    return [s for s in servers.replace(',', ' ').split() if s]
+
+
+def _resolv_conf_dns():
+    servers = []
+    try:
+        with open('/etc/resolv.conf', 'r') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == 'nameserver':
+                    servers.append(fields[1])
+    except OSError:
+        pass
+    return servers
+
+
+def guess_media(name, description="", if_type=None, is_loopback=False):
+    """Type de média : ifType du pilote, sinon indices dans le nom/la description"""
+    if is_loopback:
+        return MEDIA_LOOPBACK
+    text = f"{name} {description}".lower()
+    # Les commutateurs virtuels Hyper-V se déclarent Ethernet (ifType 6)
+    if any(hint in text for hint in VPN_HINTS):
+        return MEDIA_VPN
+    if any(hint in text for hint in VIRTUAL_HINTS):
+        return MEDIA_VIRTUAL
+    if if_type in IF_TYPES:
+        return IF_TYPES[if_type]
+    if sys.platform != 'win32':
+        if os.path.isdir(f"/sys/class/net/{name}/wireless"):
+            return MEDIA_WIFI
+        if not os.path.exists(f"/sys/class/net/{name}/device"):
+            return MEDIA_VIRTUAL
+        return MEDIA_ETHERNET
+    if "wi-fi" in text or "wifi" in text or "wireless" in text or "wlan" in text or "802.11" in text:
+        return MEDIA_WIFI
+    if "ethernet" in text:
+        return MEDIA_ETHERNET
+    return MEDIA_UNKNOWN
+
+
+# ============ INVENTAIRE ============
+
+def _signature(addrs, stats):
+    """Empreinte bon marché des cartes (change si une adresse/un état change)"""
+    return tuple(sorted(
+        (name, stats[name].isup if name in stats else None,
+         stats[name].speed if name in stats else None,
+         tuple(sorted((a.family, a.address) for a in addrs.get(name, []) if a.family == socket.AF_INET)))
+        for name in set(addrs) | set(stats)
+    ))
+
+
+def build_inventory(addrs, stats, routes, registry=None, resolv_dns=None):
+    """Liste d'enregistrements par carte, carte de la route par défaut en premier"""
+    registry = registry or {}
+    interfaces = []
+    by_ip = {}
+    for name in sorted(set(addrs) | set(stats)):
+        stat = stats.get(name)
+        ipv4, ipv6, mac, netmask = [], [], None, None
+        for addr in addrs.get(name, []):
+            if addr.family == socket.AF_INET:
+                ipv4.append(addr.address)
+                netmask = netmask or addr.netmask
+            elif addr.family == socket.AF_INET6:
+                ipv6.append(addr.address.split('%')[0])
+            elif addr.family == psutil.AF_LINK:
+                mac = addr.address
+        reg = registry.get(name, {})
+        is_loopback = name.lower().startswith(('lo', 'loopback')) or any(ip.startswith('127.') for ip in ipv4)
+        record = {
+            'name': name,
+            'description': reg.get('description', ''),
+            'media': guess_media(name, reg.get('description', ''), reg.get('if_type'), is_loopback),
+            'is_up': bool(stat and stat.isup),
+            'speed_mbps': stat.speed if stat else 0,
+            'mtu': stat.mtu if stat else 0,
+            'mac': mac,
+            'ipv4': ipv4,
+            'ipv6': ipv6,
+            'netmask': netmask,
+            'gateway': None,
+            'dns': [] if is_loopback else _windows_dns(reg['guid']) if reg.get('guid') else list(resolv_dns or []),
+            'default_route': False,
+            'metric': None,
+        }
+        interfaces.append(record)
+        for ip in ipv4:
+            by_ip[ip] = record
+
+    by_name = {record['name']: record for record in interfaces}
+    default = None
+    for route in routes:
+        record = by_name.get(route['interface']) or by_ip.get(route['interface'])
+        if record is None:
+            continue
+        if route['destination'] == '0.0.0.0' and route['netmask'] == '0.0.0.0':
+            if record['gateway'] is None or route['metric'] < (record['metric'] or 0):
+                record['gateway'] = route['gateway']
+                record['metric'] = route['metric']
+            if record['is_up'] and (default is None or route['metric'] < default['metric']):
+                default = record
+    if default is not None:
+        default['default_route'] = True
+
+    interfaces.sort(key=lambda r: (not r['default_route'], not r['is_up'],
+                                   r['media'] in (MEDIA_LOOPBACK, MEDIA_VIRTUAL), r['name']))
+    return interfaces
+
+
+_cache = {'signature': None, 'interfaces': []}
+_cache_lock = threading.Lock()
+
+
+def get_interfaces(force=False):
+    """Inventaire des cartes (mis en cache tant que les cartes ne changent pas)"""
+    addrs = psutil.net_if_addrs()
+    stats = psutil.net_if_stats()
+    signature = _signature(addrs, stats)
+    with _cache_lock:
+        if not force and signature == _cache['signature']:
+            return _cache['interfaces']
+        registry = _windows_adapters() if winreg else {}
+        resolv_dns = None if winreg else _resolv_conf_dns()
+        interfaces = build_inventory(addrs, stats, read_routes(), registry, resolv_dns)
+        _cache['signature'] = signature
+        _cache['interfaces'] = interfaces
+        return interfaces
+
+
+def default_interface(interfaces=None):
+    """Carte portant la route par défaut (None si hors ligne)"""
+    for record in interfaces if interfaces is not None else get_interfaces():
+        if record['default_route']:
+            return record
+    return None
+
+
+def default_gateway():
+    """Passerelle IPv4 par défaut (None si introuvable)"""
+    record = default_interface()
+    return record['gateway'] if record else None
+
+
+def format_speed(mbps):
+    if not mbps:
+        return "N/A"
+    return f"{mbps / 1000:g} Gbps" if mbps >= 1000 else f"{mbps} Mbps"
@@ -0,0 +1,416 @@
+# modules/net_monitor.py
+"""
+Net Monitor - Surveillance réseau continue et détection de coupures
+Utilisé par : Network Tester (mode surveillance)
+
+- Chaque seconde : ping passerelle, ping hôte public, requête au DNS public
+- Mesures dans un tampon circulaire borné (tableaux compacts, ~3 jours)
+- Coupure ouverte après 3 s d'échecs, fermée après 3 s de retour à la normale
+- Cause déduite des cibles en échec : réseau local (LAN), fournisseur (FAI), DNS
+- Incidents enregistrés au fil de l'eau et exportables en chronologie texte
+"""
+
+import json
+import math
+import time
+import select
+import socket
+import threading
+from array import array
+from datetime import datetime
+
+from modules.net_probes import (IcmpSocket, IcmpApi, IP_SUCCESS, ICMP_ECHO_REPLY,
+                                resolve, get_network_data_dir)
+from modules.dns_bench import build_query, parse_response, RCODE_NOERROR, RCODE_NXDOMAIN
+from modules.net_interfaces import default_gateway
+
+PUBLIC_HOST = "1.0.0.1"
+PUBLIC_RESOLVER = "8.8.8.8"
+DNS_PROBE_DOMAIN = "www.google.com"
+
+INTERVAL = 1.0
+PROBE_TIMEOUT = 0.8
+RING_CAPACITY = 3 * 86400
+
+# Secondes d'échec avant d'ouvrir une coupure / de retour avant de la fermer
+OPEN_AFTER = 3
+CLOSE_AFTER = 3
+
+STATUS_OK = 'ok'
+STATUS_LAN = 'lan'
+STATUS_ISP = 'isp'
+STATUS_DNS = 'dns'
+
+# Du plus grave au moins grave (une coupure prend la cause la plus grave vue)
+SEVERITY = {STATUS_LAN: 3, STATUS_ISP: 2, STATUS_DNS: 1, STATUS_OK: 0}
+
+STATUS_NAMES = {
+    STATUS_OK: "OK",
+    STATUS_LAN: "Réseau local (box/WiFi/câble)",
+    STATUS_ISP: "Fournisseur d'accès (internet)",
+    STATUS_DNS: "DNS",
+}
+
+
+def classify(gateway_rtt, host_rtt, dns_rtt, gateway_known=True):
+    """Cause probable d'après les cibles qui ne répondent pas"""
+    if gateway_known and gateway_rtt is None:
+        return STATUS_LAN
+    if host_rtt is None:
+        return STATUS_ISP
+    if dns_rtt is None:
+        return STATUS_DNS
+    return STATUS_OK
+
+
+# ============ TAMPON CIRCULAIRE ============
+
+class SampleRing:
+    """Dernières mesures (instant, RTT passerelle, hôte, DNS ; NaN = échec)
+
+    20 octets par seconde : 3 jours ≈ 5 Mo.
+    """
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self.times = array('d', [0.0]) * capacity
+        self.rtts = [array('f', [math.nan]) * capacity for _ in range(3)]
+        self.count = 0
+        self.next = 0
+
+    def append(self, t, gateway_rtt, host_rtt, dns_rtt):
+        i = self.next
+        self.times[i] = t
+        for column, rtt in zip(self.rtts, (gateway_rtt, host_rtt, dns_rtt)):
+            column[i] = math.nan if rtt is None else rtt
+        self.next = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def __len__(self):
+        return self.count
+
+    def samples(self, since=None):
+        """(t, rtt passerelle, rtt hôte, rtt DNS) du plus ancien au plus récent"""
+        start = (self.next - self.count) % self.capacity
+        for k in range(self.count):
+            i = (start + k) % self.capacity
+            t = self.times[i]
+            if since is not None and t < since:
+                continue
+            yield (t,) + tuple(None if math.isnan(column[i]) else column[i] for column in self.rtts)
+
+    def stats(self, since=None):
+        """Perte et latence moyenne par cible sur la période"""
+        names = ('gateway', 'host', 'dns')
+        totals = {name: [0, 0, 0.0] for name in names}  # envoyés, reçus, somme RTT
+        for sample in self.samples(since):
+            for name, rtt in zip(names, sample[1:]):
+                totals[name][0] += 1
+                if rtt is not None:
+                    totals[name][1] += 1
+                    totals[name][2] += rtt
+        return {
+            name: {
+                'loss_percent': (sent - received) / sent * 100 if sent else 0,
+                'avg': total / received if received else 0,
+            }
+            for name, (sent, received, total) in totals.items()
+        }
+
+
+# ============ DÉTECTION DES COUPURES ============
+
+class OutageDetector:
+    """Ouvre/ferme les incidents à partir du statut de chaque seconde"""
+
+    def __init__(self, open_after=OPEN_AFTER, close_after=CLOSE_AFTER, interval=INTERVAL):
+        self.interval = interval
+        self.open_after = open_after
+        self.close_after = close_after
+        self.current = None
+        self._failures = []   # statuts en échec consécutifs (avant ouverture)
+        self._recovered = 0
+
+    def feed(self, t, status):
+        """Retourne ('start'|'end', incident) ou None"""
+        if status != STATUS_OK:
+            self._recovered = 0
+            if self.current is None:
+                self._failures.append((t, status))
+                if len(self._failures) >= self.open_after:
+                    start = self._failures[0][0]
+                    self.current = {'start': start, 'end': None, 'kind': status, 'counts': {},
+                                    'last_failure': t}
+                    for _, failed in self._failures:
+                        self._count(failed)
+                    self._failures = []
+                    return 'start', self.current
+                return None
+            self._count(status)
+            self.current['last_failure'] = t
+            return None
+
+        self._failures = []
+        if self.current is None:
+            return None
+        self._recovered += 1
+        if self._recovered >= self.close_after:
+            incident = self.current
+            incident['end'] = incident.get('last_failure', incident['start']) + self.interval
+            incident.pop('last_failure', None)
+            incident['duration'] = incident['end'] - incident['start']
+            self.current = None
+            self._recovered = 0
+            return 'end', incident
+        return None
+
+    def _count(self, status):
+        counts = self.current['counts']
+        counts[status] = counts.get(status, 0) + 1
+        if SEVERITY[status] > SEVERITY[self.current['kind']]:
+            self.current['kind'] = status
+
+
+# ============ SONDES D'UNE SECONDE ============
+
+class TickProber:
+    """Une mesure de chaque cible, en parallèle, sur des sockets persistantes"""
+
+    def __init__(self, timeout=PROBE_TIMEOUT):
+        self.timeout = timeout
+        self.icmp = None
+        self.api = None
+        try:
+            self.icmp = IcmpSocket()
+        except OSError:
+            try:
+                self.api = IcmpApi()
+            except OSError:
+                pass  # ni ICMP ni API : connexion TCP à la place
+        self.dns = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.dns.setblocking(False)
+        self.seq = 0
+        self._api_results = {}
+
+    def probe(self, gateway, host, resolver, domain=DNS_PROBE_DOMAIN):
+        """(rtt passerelle, rtt hôte, rtt DNS) en ms ; None = pas de réponse"""
+        self.seq = (self.seq + 1) & 0xFFFF
+        results = {'gateway': None, 'host': None, 'dns': None}
+        pending = {}  # clé -> instant d'envoi
+
+        threads = []
+        for key, addr in (('gateway', gateway), ('host', host)):
+            if not addr:
+                continue
+            if self.icmp is not None:
+                seq = (self.seq * 2 + (key == 'host')) & 0xFFFF
+                try:
+                    pending[('icmp', addr, seq)] = (key, self.icmp.send(addr, seq))
+                except OSError:
+                    pass
+            else:
+                thread = threading.Thread(target=self._blocking_probe, args=(key, addr, results),
+                                          daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        qid = self.seq
+        try:
+            self.dns.sendto(build_query(qid, domain), (resolver, 53))
+            pending[('dns', resolver, qid)] = ('dns', time.perf_counter())
+        except OSError:
+            pass
+
+        deadline = time.perf_counter() + self.timeout
+        sockets = [self.dns] + ([self.icmp.sock] if self.icmp is not None else [])
+        while pending:
+            wait = deadline - time.perf_counter()
+            if wait <= 0:
+                break
+            ready, _, _ = select.select(sockets, [], [], wait)
+            if self.icmp is not None and self.icmp.sock in ready:
+                for addr, icmp_type, seq, received_at in self.icmp.receive(0):
+                    probe = pending.pop(('icmp', addr, seq), None)
+                    if probe and icmp_type == ICMP_ECHO_REPLY:
+                        results[probe[0]] = (received_at - probe[1]) * 1000
+            if self.dns in ready:
+                self._read_dns(pending, results)
+
+        for thread in threads:
+            thread.join(timeout=self.timeout)
+        return results['gateway'], results['host'], results['dns']
+
+    def _read_dns(self, pending, results):
+        while True:
+            try:
+                data, source = self.dns.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            received_at = time.perf_counter()
+            parsed = parse_response(data)
+            if parsed is None:
+                continue
+            qid, rcode, _ = parsed
+            probe = pending.pop(('dns', source[0], qid), None)
+            if probe and rcode in (RCODE_NOERROR, RCODE_NXDOMAIN):
+                results['dns'] = (received_at - probe[1]) * 1000
+
+    def _blocking_probe(self, key, addr, results):
+        """IcmpSendEcho, ou à défaut connexion TCP (un refus prouve que l'hôte répond)"""
+        if self.api is not None:
+            status, _, rtt = self.api.echo(addr, self.timeout)
+            if status == IP_SUCCESS:
+                results[key] = rtt
+            return
+        start = time.perf_counter()
+        try:
+            with socket.create_connection((addr, 80 if key == 'gateway' else 443), timeout=self.timeout):
+                pass
+        except ConnectionRefusedError:
+            pass
+        except OSError:
+            return
+        results[key] = (time.perf_counter() - start) * 1000
+
+    def close(self):
+        if self.icmp is not None:
+            self.icmp.close()
+        self.dns.close()
+
+
+# ============ SURVEILLANCE ============
+
+class NetworkMonitor:
+    """Boucle de surveillance (à lancer dans un thread)"""
+
+    def __init__(self, gateway=None, host=PUBLIC_HOST, resolver=PUBLIC_RESOLVER,
+                 interval=INTERVAL, capacity=RING_CAPACITY, incidents_path=None):
+        self.gateway = gateway
+        self.host = host
+        self.resolver = resolver
+        self.interval = interval
+        self.ring = SampleRing(capacity)
+        self.detector = OutageDetector(interval=interval)
+        self.incidents = []
+        self.started = None
+        self.incidents_path = incidents_path or get_network_data_dir() / "incidents.json"
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, on_sample=None, on_incident=None):
+        """Mesurer chaque `interval` s jusqu'à stop()"""
+        self.gateway = self.gateway or default_gateway()
+        host = resolve(self.host) or self.host
+        prober = TickProber(min(PROBE_TIMEOUT, self.interval * 0.8))
+        self.started = time.time()
+        next_tick = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                t = time.time()
+                gateway_rtt, host_rtt, dns_rtt = prober.probe(self.gateway, host, self.resolver)
+                self.ring.append(t, gateway_rtt, host_rtt, dns_rtt)
+                status = classify(gateway_rtt, host_rtt, dns_rtt, gateway_known=bool(self.gateway))
+
+                event = self.detector.feed(t, status)
+                if event:
+                    kind, incident = event
+                    if kind == 'end':
+                        self.incidents.append(incident)
+                        self._save_incident(incident)
+                    if on_incident:
+                        on_incident(kind, dict(incident))
+                if on_sample:
+                    on_sample({'time': t, 'gateway': gateway_rtt, 'host': host_rtt,
+                               'dns': dns_rtt, 'status': status})
+
+                next_tick += self.interval
+                delay = next_tick - time.monotonic()
+                if delay < 0:
+                    next_tick = time.monotonic()  # mise en veille : on repart sans rattrapage
+                    delay = 0
+                self._stop.wait(delay)
+        finally:
+            prober.close()
+            # Coupure encore en cours à l'arrêt : enregistrée comme telle
+            current, self.detector.current = self.detector.current, None
+            if current:
+                incident = dict(current, end=time.time(), ongoing=True)
+                incident.pop('last_failure', None)
+                incident['duration'] = incident['end'] - incident['start']
+                self.incidents.append(incident)
+                self._save_incident(incident)
+
+    def _save_incident(self, incident):
+        """Ajouter l'incident au journal (500 derniers conservés)"""
+        try:
+            with open(self.incidents_path, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+        except (OSError, ValueError):
+            history = []
+        history.append(incident)
+        try:
+            with open(self.incidents_path, 'w', encoding='utf-8') as f:
+                json.dump(history[-500:], f, indent=1)
+        except OSError:
+            pass
+
+    def summary(self):
+        """Disponibilité et statistiques depuis le démarrage"""
+        elapsed = time.time() - self.started if self.started else 0
+        down = sum(i['duration'] for i in self.incidents)
+        if self.detector.current:
+            down += time.time() - self.detector.current['start']
+        return {
+            'elapsed': elapsed,
+            'samples': len(self.ring),
+            'incidents': len(self.incidents) + (1 if self.detector.current else 0),
+            'downtime': down,
+            'availability': (1 - down / elapsed) * 100 if elapsed else 100.0,
+            'targets': self.ring.stats(),
+        }
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min {seconds % 60:02d} s"
+    return f"{seconds // 3600} h {seconds % 3600 // 60:02d} min"
+
+
+def format_incident(incident):
+    """Ligne de chronologie d'un incident"""
+    start = datetime.fromtimestamp(incident['start']).strftime('%d/%m %H:%M:%S')
+    end = datetime.fromtimestamp(incident['end']).strftime('%H:%M:%S') if incident.get('end') else "en cours"
+    text = f"{start} → {end}  ({format_duration(incident.get('duration', 0))})  {STATUS_NAMES[incident['kind']]}"
+    if incident.get('ongoing'):
+        text += " [en cours à l'arrêt]"
+    return text
+
+
+def export_timeline(path, incidents, summary=None):
+    """Écrire la chronologie des incidents (texte)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("═" * 70 + "\n")
+        f.write("  CHRONOLOGIE DES COUPURES RÉSEAU - WAPINATOR\n")
+        f.write(f"  Généré le: {datetime.now().strftime('%d/%m/%Y à %H:%M:%S')}\n")
+        f.write("═" * 70 + "\n\n")
+        if summary:
+            f.write(f"Durée de surveillance : {format_duration(summary['elapsed'])}\n")
+            f.write(f"Disponibilité : {summary['availability']:.3f}%\n")
+            f.write(f"Coupures : {summary['incidents']} (total {format_duration(summary['downtime'])})\n")
+            names = {'gateway': "Passerelle", 'host': "Hôte public", 'dns': "DNS public"}
+            for key, stats in summary['targets'].items():
+                f.write(f"  {names[key]} : perte {stats['loss_percent']:.2f}%, moyenne {stats['avg']:.1f} ms\n")
+            f.write("\n")
+        if not incidents:
+            f.write("Aucune coupure détectée.\n")
+        for incident in incidents:
+            f.write(format_incident(incident) + "\n")
+            details = ", ".join(f"{STATUS_NAMES[k]}: {n}" for k, n in sorted(incident['counts'].items()))
+            f.write(f"    Mesures en échec : {details}\n")
@@ -0,0 +1,825 @@
+# modules/net_probes.py
+"""
+Net Probes - Sondes ICMP en processus (sans lancer ping.exe)
+Utilisé par : Network Tester
+
+- Socket ICMP non privilégié (Linux/macOS), socket brut (admin/root),
+  sinon IcmpSendEcho (Windows, sans droits admin)
+- Toutes les cibles sondées en même temps : durée fixe quel que soit
+  le nombre de cibles
+- RTT mesuré avec perf_counter au plus près de l'envoi et de la réception
+- Sondes numérotées à cadence fixe (ICMP ou UDP vers un serveur d'écho) :
+  pertes, retards, doublons, déséquencements, rafales, perte dans le temps
+- Traceroute MTR : tous les TTL d'un tour envoyés d'un coup, sauts muets
+  conservés comme trous, latence et perte par saut sur plusieurs tours
+"""
+
+import os
+import sys
+import time
+import errno
+import random
+import select
+import socket
+import struct
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from modules.latency_stats import LatencySamples
+
+ICMP_ECHO_REPLY = 0
+ICMP_DEST_UNREACHABLE = 3
+ICMP_ECHO_REQUEST = 8
+ICMP_TIME_EXCEEDED = 11
+
+PAYLOAD = b"WAPINATOR-PROBE-" + bytes(range(16))
+
+# Port utilisé si aucune méthode ICMP n'est disponible (connexion TCP chronométrée)
+FALLBACK_PORT = 443
+
+# Méthodes bloquantes (IcmpSendEcho, TCP) : echos simultanés max, et retard
+# d'envoi (s) au-delà duquel un echo est compté perdu
+MAX_PING_THREADS = 128
+PING_LATE = 0.05
+
+
+def get_network_data_dir():
+    """Dossier de données des outils réseau (historiques, caches, incidents)"""
+    data_dir = Path.home() / "Documents" / "Wapinator" / "Network"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
+def checksum(data):
+    """Somme de contrôle Internet (RFC 1071)"""
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo(ident, seq, payload=PAYLOAD):
+    """Paquet ICMP echo request"""
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, csum, ident, seq) + payload
+
+
+def _strip_ip_header(packet):
+    """Retirer l'en-tête IPv4 s'il est présent (sockets bruts)"""
+    if packet and packet[0] >> 4 == 4:
+        return packet[(packet[0] & 0x0F) * 4:]
+    return packet
+
+
+def parse_reply(packet):
+    """(type, ident, seq) d'une réponse ICMP
+
+    Pour "TTL dépassé" et "destination injoignable", ident/seq sont ceux de
+    la requête d'origine recopiée dans le message d'erreur.
+    """
+    icmp = _strip_ip_header(packet)
+    if len(icmp) < 8:
+        return None
+    icmp_type, _, _, ident, seq = struct.unpack("!BBHHH", icmp[:8])
+    if icmp_type == ICMP_ECHO_REPLY:
+        return icmp_type, ident, seq
+    if icmp_type in (ICMP_TIME_EXCEEDED, ICMP_DEST_UNREACHABLE):
+        inner = icmp[8:]
+        if len(inner) < 20:
+            return None
+        original = inner[(inner[0] & 0x0F) * 4:]
+        if len(original) < 8 or original[0] != ICMP_ECHO_REQUEST:
+            return None
+        _, _, _, ident, seq = struct.unpack("!BBHHH", original[:8])
+        return icmp_type, ident, seq
+    return None
+
+
+# ============ SOCKET ICMP ============
+
+class IcmpSocket:
+    """Socket ICMP : non privilégié si possible, sinon brut"""
+
+    def __init__(self):
+        self.sock = None
+        self.kind = None
+        for kind, sock_type in (('dgram', socket.SOCK_DGRAM), ('raw', socket.SOCK_RAW)):
+            try:
+                self.sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+                self.kind = kind
+                break
+            except (OSError, AttributeError):
+                continue
+        if self.sock is None:
+            raise OSError(errno.EPERM, "ICMP indisponible (droits insuffisants)")
+        self.sock.setblocking(False)
+        # Identifiant propre au processus (remplacé par le noyau en mode dgram)
+        self.ident = (os.getpid() ^ random.getrandbits(16)) & 0xFFFF
+
+    def send(self, addr, seq, ttl=None):
+        """Envoyer un echo ; retourne l'instant d'envoi (perf_counter)"""
+        if ttl is not None:
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+        packet = build_echo(self.ident, seq)
+        sent_at = time.perf_counter()
+        self.sock.sendto(packet, (addr, 0))
+        return sent_at
+
+    def receive(self, timeout):
+        """Réponses disponibles sous `timeout` s : [(adresse, type, seq, instant)]"""
+        replies = []
+        ready, _, _ = select.select([self.sock], [], [], max(0.0, timeout))
+        if not ready:
+            return replies
+        while True:
+            try:
+                packet, (addr, _) = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            received_at = time.perf_counter()
+            parsed = parse_reply(packet)
+            if parsed is None:
+                continue
+            icmp_type, ident, seq = parsed
+            # En mode brut, on reçoit aussi les réponses des autres processus
+            if self.kind == 'raw' and ident != self.ident:
+                continue
+            replies.append((addr, icmp_type, seq, received_at))
+        return replies
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+# ============ ICMP WINDOWS (IcmpSendEcho) ============
+
+IP_SUCCESS = 0
+IP_TTL_EXPIRED_TRANSIT = 11013
+
+
+class IcmpApi:
+    """IcmpSendEcho (iphlpapi) : ICMP sans droits admin sous Windows
+
+    Appel bloquant : un appel par thread, RTT pris par perf_counter autour.
+    """
+
+    def __init__(self):
+        if sys.platform != 'win32':
+            raise OSError(errno.ENOSYS, "IcmpSendEcho indisponible")
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+
+        class IP_OPTION_INFORMATION(ctypes.Structure):
+            _fields_ = [("Ttl", ctypes.c_ubyte), ("Tos", ctypes.c_ubyte),
+                        ("Flags", ctypes.c_ubyte), ("OptionsSize", ctypes.c_ubyte),
+                        ("OptionsData", ctypes.c_void_p)]
+
+        class ICMP_ECHO_REPLY_STRUCT(ctypes.Structure):
+            _fields_ = [("Address", ctypes.c_ulong), ("Status", ctypes.c_ulong),
+                        ("RoundTripTime", ctypes.c_ulong), ("DataSize", ctypes.c_ushort),
+                        ("Reserved", ctypes.c_ushort), ("Data", ctypes.c_void_p),
+                        ("Options", IP_OPTION_INFORMATION)]
+
+        self.IP_OPTION_INFORMATION = IP_OPTION_INFORMATION
+        self.ICMP_ECHO_REPLY = ICMP_ECHO_REPLY_STRUCT
+        self.iphlpapi = ctypes.WinDLL('iphlpapi')
+        self.iphlpapi.IcmpCreateFile.restype = wintypes.HANDLE
+        self.iphlpapi.IcmpCloseHandle.argtypes = [wintypes.HANDLE]
+        self.iphlpapi.IcmpSendEcho.argtypes = [
+            wintypes.HANDLE, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_ushort,
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong
+        ]
+        self.iphlpapi.IcmpSendEcho.restype = ctypes.c_ulong
+        self._local = threading.local()
+
+    def _handle(self):
+        handle = getattr(self._local, 'handle', None)
+        if handle is None:
+            handle = self.iphlpapi.IcmpCreateFile()
+            self._local.handle = handle
+        return handle
+
+    def echo(self, addr, timeout, ttl=None):
+        """(statut, adresse de réponse, rtt_ms) ; statut None si aucune réponse"""
+        ctypes = self.ctypes
+        dest = struct.unpack("<L", socket.inet_aton(addr))[0]
+        request = ctypes.create_string_buffer(PAYLOAD)
+        reply_size = ctypes.sizeof(self.ICMP_ECHO_REPLY) + len(PAYLOAD) + 8
+        reply = ctypes.create_string_buffer(reply_size)
+        options = None
+        if ttl is not None:
+            options = self.IP_OPTION_INFORMATION(Ttl=ttl)
+            options = ctypes.byref(options)
+
+        start = time.perf_counter()
+        count = self.iphlpapi.IcmpSendEcho(
+            self._handle(), dest, request, len(PAYLOAD), options,
+            reply, reply_size, int(timeout * 1000)
+        )
+        rtt = (time.perf_counter() - start) * 1000
+        if not count:
+            return None, None, None
+        parsed = self.ICMP_ECHO_REPLY.from_buffer(reply)
+        source = socket.inet_ntoa(struct.pack("<L", parsed.Address))
+        return parsed.Status, source, rtt
+
+
+# ============ PING MULTI-CIBLES ============
+
+def resolve(target):
+    """Adresse IPv4 d'une cible (None si non résolue)"""
+    try:
+        return socket.gethostbyname(target)
+    except OSError:
+        return None
+
+
+def tcp_connect_time(addr, port=FALLBACK_PORT, timeout=1.0):
+    """Durée d'établissement d'une connexion TCP en ms (None si échec)"""
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((addr, port), timeout=timeout):
+            return (time.perf_counter() - start) * 1000
+    except OSError:
+        return None
+
+
+class Pinger:
+    """Ping simultané de plusieurs cibles
+
+    Méthode choisie automatiquement : socket ICMP, IcmpSendEcho (Windows),
+    ou à défaut durée de connexion TCP (signalée dans `method`).
+    """
+
+    def __init__(self, timeout=1.0):
+        self.timeout = timeout
+        self.method = None
+
+    def ping_many(self, targets, count=10, interval=0.2):
+        """{cible: [rtt_ms ou None, ...]} ; durée ≈ count × interval + timeout"""
+        addrs = {target: resolve(target) for target in targets}
+        results = {target: [None] * count for target in targets}
+        reachable = {target: addr for target, addr in addrs.items() if addr}
+        if not reachable or count <= 0:
+            return results
+
+        try:
+            icmp = IcmpSocket()
+        except OSError:
+            icmp = None
+
+        if icmp is not None:
+            self.method = f"icmp-{icmp.kind}"
+            try:
+                self._ping_socket(icmp, reachable, results, count, interval)
+            finally:
+                icmp.close()
+            return results
+
+        try:
+            api = IcmpApi()
+        except OSError:
+            api = None
+
+        if api is not None:
+            def probe(addr):
+                status, _, rtt = api.echo(addr, self.timeout)
+                return rtt if status == IP_SUCCESS else None
+
+            self.method = "icmp-api"
+            self._ping_threads(probe, reachable, results, count, interval)
+            return results
+
+        self.method = f"tcp-{FALLBACK_PORT}"
+        self._ping_threads(lambda addr: tcp_connect_time(addr, timeout=self.timeout),
+                           reachable, results, count, interval)
+        return results
+
+    def _ping_socket(self, icmp, reachable, results, count, interval):
+        """Une seule socket : envoi cadencé de tous les echos, réception multiplexée"""
+        pending = {}  # seq -> (cible, index, instant d'envoi)
+        by_addr = {}
+        for target, addr in reachable.items():
+            by_addr.setdefault(addr, []).append(target)
+
+        seq = random.getrandbits(16)
+        start = time.perf_counter()
+        deadline = start + (count - 1) * interval + self.timeout
+        next_round = start
+        sent_rounds = 0
+
+        while True:
+            now = time.perf_counter()
+            if sent_rounds < count and now >= next_round:
+                for target, addr in reachable.items():
+                    seq = (seq + 1) & 0xFFFF
+                    try:
+                        pending[seq] = (target, sent_rounds, icmp.send(addr, seq))
+                    except OSError:
+                        pass
+                sent_rounds += 1
+                next_round = start + sent_rounds * interval
+                continue
+
+            if now >= deadline or (sent_rounds >= count and not pending):
+                break
+
+            wait = deadline - now
+            if sent_rounds < count:
+                wait = min(wait, next_round - now)
+            for addr, icmp_type, reply_seq, received_at in icmp.receive(wait):
+                if icmp_type != ICMP_ECHO_REPLY:
+                    continue
+                probe = pending.get(reply_seq)
+                if probe is None or addr not in by_addr or probe[0] not in by_addr[addr]:
+                    continue
+                target, index, sent_at = probe
+                if received_at - sent_at <= self.timeout:
+                    results[target][index] = (received_at - sent_at) * 1000
+                del pending[reply_seq]
+
+    def _ping_threads(self, probe, reachable, results, count, interval):
+        """Appels bloquants sur un pool : chaque echo part à son instant prévu
+
+        Plusieurs echos en vol par cible ; à l'échéance (count × interval + timeout),
+        un echo non envoyé ou sans réponse compte comme perdu.
+        """
+        start = time.perf_counter()
+        deadline = start + (count - 1) * interval + self.timeout
+        in_flight = min(count, int(self.timeout / interval) + 1) if interval > 0 else count
+        closed = threading.Event()
+
+        def run(target, addr, index, scheduled):
+            # Parti en retard (pool saturé) : perdu plutôt qu'un RTT décalé
+            if closed.is_set() or time.perf_counter() - scheduled > max(interval, PING_LATE):
+                return
+            rtt = probe(addr)
+            if rtt is not None and rtt <= self.timeout * 1000 and not closed.is_set():
+                results[target][index] = rtt
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(MAX_PING_THREADS, len(reachable) * in_flight)),
+                                  thread_name_prefix="ping")
+        futures = []
+        try:
+            for index in range(count):
+                scheduled = start + index * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                for target, addr in reachable.items():
+                    futures.append(pool.submit(run, target, addr, index, scheduled))
+            wait(futures, timeout=max(0.0, deadline - time.perf_counter()))
+        finally:
+            closed.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ============ SONDES CADENCÉES (PERTE DE PAQUETS) ============
+
+class IcmpTransport:
+    """Echos ICMP numérotés vers une cible (socket ICMP, sinon IcmpSendEcho)"""
+
+    max_count = 0xFFFF
+
+    def __init__(self, addr, timeout=1.0):
+        self.addr = addr
+        self.method = None
+        self._api = None
+        self._pool = None
+        self._replies = []
+        self._lock = threading.Lock()
+        try:
+            self._icmp = IcmpSocket()
+            self.method = f"icmp-{self._icmp.kind}"
+        except OSError:
+            self._icmp = None
+            # Appels bloquants : un pool de threads garde la cadence d'envoi
+            self._api = IcmpApi()
+            self._timeout = timeout
+            self._pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="icmp")
+            self.method = "icmp-api"
+
+    def send(self, seq):
+        if self._icmp is not None:
+            return self._icmp.send(self.addr, seq & 0xFFFF)
+        sent_at = time.perf_counter()
+        self._pool.submit(self._echo, seq, sent_at)
+        return sent_at
+
+    def _echo(self, seq, sent_at):
+        status, _, rtt = self._api.echo(self.addr, self._timeout)
+        if status == IP_SUCCESS:
+            with self._lock:
+                self._replies.append((seq, sent_at + rtt / 1000))
+
+    def receive(self, timeout):
+        """[(seq, instant de réception)] arrivés sous `timeout` s"""
+        if self._icmp is not None:
+            return [(seq, received_at)
+                    for addr, icmp_type, seq, received_at in self._icmp.receive(timeout)
+                    if icmp_type == ICMP_ECHO_REPLY and addr == self.addr]
+        time.sleep(max(0.0, timeout))
+        with self._lock:
+            replies, self._replies = self._replies, []
+        return replies
+
+    def close(self):
+        if self._icmp is not None:
+            self._icmp.close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+UDP_PROBE = struct.Struct("!4sIIQ")  # magic, session, seq, réservé
+UDP_MAGIC = b"WPNP"
+
+
+class UdpTransport:
+    """Sondes UDP numérotées vers un serveur d'écho"""
+
+    max_count = 0xFFFFFFFF
+
+    def __init__(self, host, port, payload_size=64):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((host, port))
+        self.sock.setblocking(False)
+        self.session = random.getrandbits(32)
+        self.padding = b'\0' * max(0, payload_size - UDP_PROBE.size)
+        self.method = "udp"
+
+    def send(self, seq):
+        packet = UDP_PROBE.pack(UDP_MAGIC, self.session, seq, 0) + self.padding
+        sent_at = time.perf_counter()
+        try:
+            self.sock.send(packet)
+        except OSError:
+            pass  # ICMP "port injoignable" d'un envoi précédent : compté comme perte
+        return sent_at
+
+    def receive(self, timeout):
+        replies = []
+        ready, _, _ = select.select([self.sock], [], [], max(0.0, timeout))
+        if not ready:
+            return replies
+        while True:
+            try:
+                packet = self.sock.recv(2048)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            received_at = time.perf_counter()
+            if len(packet) < UDP_PROBE.size:
+                continue
+            magic, session, seq, _ = UDP_PROBE.unpack_from(packet)
+            if magic == UDP_MAGIC and session == self.session:
+                replies.append((seq, received_at))
+        return replies
+
+    def close(self):
+        self.sock.close()
+
+
+class PacedProber:
+    """Envoi cadencé de sondes numérotées et analyse des réponses
+
+    Durée prévisible : count / rate + timeout. Une réponse arrivée après le
+    délai est comptée en retard (pas en perte, ni en RTT).
+    """
+
+    def __init__(self, transport, rate=50, timeout=1.0):
+        self.transport = transport
+        self.rate = max(1.0, float(rate))
+        self.timeout = timeout
+        self.stop_requested = False
+
+    def run(self, count, progress=None):
+        """Envoyer `count` sondes ; retourne le rapport de analyze_probes()"""
+        count = min(count, self.transport.max_count)
+        interval = 1.0 / self.rate
+        sent = []       # seq -> instant d'envoi
+        arrivals = []   # (seq, rtt_ms) dans l'ordre d'arrivée
+        answered = set()
+        start = time.perf_counter()
+        deadline = start + count * interval + self.timeout
+        next_report = start + 1.0
+
+        while not self.stop_requested:
+            now = time.perf_counter()
+            # Envois dus (rattrapage si la boucle a pris du retard)
+            while len(sent) < count and now >= start + len(sent) * interval:
+                sent.append(self.transport.send(len(sent)))
+            if len(sent) >= count:
+                deadline = min(deadline, sent[-1] + self.timeout)
+                if now >= deadline or len(answered) >= count:
+                    break
+
+            wait = deadline - now
+            if len(sent) < count:
+                wait = min(wait, start + len(sent) * interval - now)
+            for seq, received_at in self.transport.receive(wait):
+                if seq < len(sent):
+                    arrivals.append((seq, (received_at - sent[seq]) * 1000))
+                    answered.add(seq)
+
+            if progress and now >= next_report:
+                progress(len(sent), count)
+                next_report += 1.0
+
+        return analyze_probes(sent, arrivals, self.timeout, start)
+
+
+def analyze_probes(sent, arrivals, timeout, start=None, bucket_seconds=1.0):
+    """Pertes, retards, doublons, déséquencements, rafales et perte dans le temps
+
+    `sent` : instants d'envoi indexés par numéro de séquence
+    `arrivals` : (seq, rtt_ms) dans l'ordre de réception
+    """
+    count = len(sent)
+    timeout_ms = timeout * 1000
+    seen = set()
+    rtt_by_seq = {}
+    late = duplicates = reordered = 0
+    highest = -1
+    for seq, rtt in arrivals:
+        if seq in seen:
+            duplicates += 1
+            continue
+        seen.add(seq)
+        if seq < highest:
+            reordered += 1
+        highest = max(highest, seq)
+        if rtt > timeout_ms:
+            late += 1
+        else:
+            rtt_by_seq[seq] = rtt
+
+    lost_flags = [seq not in seen for seq in range(count)]
+
+    # Rafales de pertes consécutives : {longueur: nombre}
+    bursts = {}
+    run = 0
+    for lost in lost_flags + [False]:
+        if lost:
+            run += 1
+        elif run:
+            bursts[run] = bursts.get(run, 0) + 1
+            run = 0
+
+    # Perte par tranche de temps (selon l'instant d'envoi)
+    start = start if start is not None else (sent[0] if sent else 0)
+    timeline = []
+    for seq, sent_at in enumerate(sent):
+        index = int((sent_at - start) // bucket_seconds)
+        while len(timeline) <= index:
+            timeline.append([0, 0])
+        timeline[index][0] += 1
+        timeline[index][1] += lost_flags[seq]
+
+    # Latence dans l'ordre d'envoi (le jitter RFC 3550 suit la séquence)
+    latency = LatencySamples()
+    for seq in sorted(rtt_by_seq):
+        latency.add(rtt_by_seq[seq])
+
+    lost = sum(lost_flags)
+    return {
+        'sent': count,
+        'received': len(rtt_by_seq),
+        'lost': lost,
+        'late': late,
+        'loss_percent': lost / count * 100 if count else 0,
+        'duplicates': duplicates,
+        'reordered': reordered,
+        'bursts': bursts,
+        'max_burst': max(bursts) if bursts else 0,
+        'timeline': [(i * bucket_seconds, total, missing) for i, (total, missing) in enumerate(timeline)],
+        'latency': latency.summary(),
+    }
+
+
+def measure_loss(target, count=500, rate=50, timeout=1.0, port=None, progress=None):
+    """Test de perte vers une cible : ICMP, ou UDP si `port` (serveur d'écho)"""
+    addr = resolve(target)
+    if addr is None:
+        raise OSError(f"Cible introuvable : {target}")
+    transport = UdpTransport(addr, port) if port else IcmpTransport(addr, timeout)
+    try:
+        report = PacedProber(transport, rate=rate, timeout=timeout).run(count, progress)
+    finally:
+        transport.close()
+    report['method'] = transport.method
+    return report
+
+
+class UdpEchoServer:
+    """Serveur d'écho UDP local (tests), avec dégradations optionnelles
+
+    `drop`, `duplicate` : probabilités ; `delay` : retard aléatoire max (s),
+    qui provoque des arrivées déséquencées.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, drop=0.0, duplicate=0.0, delay=0.0, seed=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.address = self.sock.getsockname()
+        self.drop = drop
+        self.duplicate = duplicate
+        self.delay = delay
+        self.random = random.Random(seed)
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True, name="udp-echo")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1)
+        self.sock.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _serve(self):
+        import heapq
+        queue = []  # (instant d'émission, ordre, paquet, adresse)
+        order = 0
+        while self._running:
+            now = time.perf_counter()
+            while queue and queue[0][0] <= now:
+                _, _, packet, peer = heapq.heappop(queue)
+                try:
+                    self.sock.sendto(packet, peer)
+                except OSError:
+                    pass
+            wait = 0.1 if not queue else max(0.0, queue[0][0] - now)
+            ready, _, _ = select.select([self.sock], [], [], min(wait, 0.1))
+            if not ready:
+                continue
+            try:
+                packet, peer = self.sock.recvfrom(65535)
+            except OSError:
+                continue
+            if self.random.random() < self.drop:
+                continue
+            copies = 2 if self.random.random() < self.duplicate else 1
+            for _ in range(copies):
+                order += 1
+                heapq.heappush(queue, (time.perf_counter() + self.random.random() * self.delay,
+                                       order, packet, peer))
+
+
+# ============ TRACEROUTE (TTL EN PARALLÈLE) ============
+
+class _HopStats:
+    """Réponses reçues pour un TTL donné"""
+
+    def __init__(self, ttl, rounds):
+        self.ttl = ttl
+        self.rtts = [None] * rounds
+        self.responders = {}
+
+    def record(self, round_index, addr, rtt):
+        self.rtts[round_index] = rtt
+        self.responders[addr] = self.responders.get(addr, 0) + 1
+
+    def report(self):
+        samples = LatencySamples()
+        samples.extend(self.rtts)
+        summary = samples.summary(bins=5)
+        # Adresse la plus fréquente (plusieurs en cas de routes multiples)
+        addrs = sorted(self.responders, key=self.responders.get, reverse=True)
+        return {
+            'ttl': self.ttl,
+            'addr': addrs[0] if addrs else None,
+            'other_addrs': addrs[1:],
+            'latency': summary,
+            'loss_percent': summary['loss_percent'],
+        }
+
+
+def traceroute(target, max_hops=30, rounds=5, interval=0.25, timeout=1.0):
+    """Traceroute MTR : tous les TTL sondés en même temps, `rounds` tours
+
+    Durée ≈ (rounds - 1) × interval + timeout. Retourne None si aucune
+    méthode ICMP ne permet de recevoir les "TTL dépassé" (socket ICMP non
+    privilégié sous Linux, sans socket brut).
+    """
+    addr = resolve(target)
+    if addr is None:
+        return None
+    hops = [_HopStats(ttl, rounds) for ttl in range(1, max_hops + 1)]
+    reached = [None]  # plus petit TTL ayant atteint la destination
+
+    def on_reply(ttl, round_index, source, icmp_type, rtt):
+        hops[ttl - 1].record(round_index, source, rtt)
+        if icmp_type != ICMP_TIME_EXCEEDED and (reached[0] is None or ttl < reached[0]):
+            reached[0] = ttl
+
+    method = None
+    try:
+        icmp = IcmpSocket()
+    except OSError:
+        icmp = None
+    if icmp is not None and icmp.kind == 'raw':
+        method = "icmp-raw"
+        try:
+            _trace_socket(icmp, addr, max_hops, rounds, interval, timeout, on_reply)
+        finally:
+            icmp.close()
+    else:
+        if icmp is not None:
+            icmp.close()
+        try:
+            api = IcmpApi()
+        except OSError:
+            return None
+        method = "icmp-api"
+        _trace_api(api, addr, max_hops, rounds, interval, timeout, on_reply)
+
+    # Sauts au-delà de la destination ignorés ; sinon jusqu'au dernier qui répond
+    last = reached[0]
+    if last is None:
+        answered = [hop.ttl for hop in hops if hop.responders]
+        last = answered[-1] if answered else 0
+    path = [hop.report() for hop in hops[:last]]
+    return {
+        'target': target,
+        'addr': addr,
+        'method': method,
+        'reached': reached[0] is not None,
+        'rounds': rounds,
+        'hops': path,
+    }
+
+
+def _trace_socket(icmp, addr, max_hops, rounds, interval, timeout, on_reply):
+    """Socket brut : un echo par TTL et par tour, réponses multiplexées"""
+    pending = {}  # seq -> (ttl, tour, instant d'envoi)
+    base = random.getrandbits(16)
+    start = time.perf_counter()
+    next_round = start
+    sent_rounds = 0
+    deadline = start + (rounds - 1) * interval + timeout
+
+    while True:
+        now = time.perf_counter()
+        if sent_rounds < rounds and now >= next_round:
+            for ttl in range(1, max_hops + 1):
+                seq = (base + sent_rounds * max_hops + ttl) & 0xFFFF
+                try:
+                    pending[seq] = (ttl, sent_rounds, icmp.send(addr, seq, ttl=ttl))
+                except OSError:
+                    pass
+            sent_rounds += 1
+            next_round = start + sent_rounds * interval
+            continue
+        if now >= deadline:
+            break
+        wait = deadline - now
+        if sent_rounds < rounds:
+            wait = min(wait, next_round - now)
+        for source, icmp_type, seq, received_at in icmp.receive(wait):
+            probe = pending.pop(seq, None)
+            if probe is None:
+                continue
+            if icmp_type == ICMP_ECHO_REPLY and source != addr:
+                continue
+            ttl, round_index, sent_at = probe
+            on_reply(ttl, round_index, source, icmp_type, (received_at - sent_at) * 1000)
+
+
+def _trace_api(api, addr, max_hops, rounds, interval, timeout, on_reply):
+    """IcmpSendEcho : un thread par TTL, mêmes instants d'envoi pour tous"""
+    start = time.perf_counter()
+
+    def run(ttl):
+        for round_index in range(rounds):
+            delay = start + round_index * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            status, source, rtt = api.echo(addr, timeout, ttl=ttl)
+            if status == IP_TTL_EXPIRED_TRANSIT:
+                on_reply(ttl, round_index, source, ICMP_TIME_EXCEEDED, rtt)
+            elif status == IP_SUCCESS:
+                on_reply(ttl, round_index, source, ICMP_ECHO_REPLY, rtt)
+
+    with ThreadPoolExecutor(max_workers=max_hops, thread_name_prefix="trace") as pool:
+        list(pool.map(run, range(1, max_hops + 1)))
@@ -0,0 +1,247 @@
+# modules/net_repair.py
+"""
+Net Repair - Réparation réseau adaptative (échelle de réparations)
+Utilisé par : Network Tester (réparation adaptative)
+
+- Sonde rapide (< 1 s) : passerelle, internet, DNS système, page HTTP
+- Réparations de la moins coûteuse à la plus lourde, sonde après chaque étape
+- Arrêt dès que la connexion est rétablie (pas de reset inutile)
+- Statistiques "étape → symptôme réparé" enregistrées pour réordonner l'échelle
+- Les resets qui exigent un redémarrage sont évalués au lancement suivant
+"""
+
+import json
+import time
+import socket
+import threading
+import http.client
+
+import psutil
+
+from modules.net_probes import get_network_data_dir
+from modules.net_monitor import (TickProber, PUBLIC_HOST, PUBLIC_RESOLVER,
+                                 STATUS_OK, STATUS_LAN, STATUS_ISP, STATUS_DNS, STATUS_NAMES)
+from modules.net_interfaces import default_gateway
+
+PROBE_TIMEOUT = 0.8
+
+# Page de test de connectivité de Windows (NCSI)
+HTTP_CHECK_HOST = "www.msftconnecttest.com"
+HTTP_CHECK_PATH = "/connecttest.txt"
+HTTP_CHECK_BODY = b"Microsoft Connect Test"
+DNS_CHECK_DOMAIN = "www.msftncsi.com"
+
+# DNS et internet OK mais pas le web : proxy, pare-feu, Winsock
+STATUS_HTTP = 'http'
+SYMPTOM_NAMES = dict(STATUS_NAMES, **{STATUS_HTTP: "Web (HTTP bloqué : proxy, pare-feu, Winsock)"})
+
+# Temps laissé au réseau pour revenir après une étape qui coupe la carte
+SETTLE_SECONDS = 8
+
+# (clé, libellé, coût relatif, redémarrage requis)
+STEPS = [
+    ('dns', "Vidage cache DNS", 1, False),
+    ('ip', "Renouvellement IP", 2, False),
+    ('tcp', "Reset TCP/IP stack", 3, True),
+    ('winsock', "Reset Winsock", 3, True),
+    ('firewall', "Reset Windows Firewall", 5, False),
+]
+STEP_NAMES = {key: label for key, label, _, _ in STEPS}
+
+
+# ============ SONDE RAPIDE ============
+
+def _check_dns(domain=DNS_CHECK_DOMAIN):
+    socket.getaddrinfo(domain, 80, socket.AF_INET, socket.SOCK_STREAM)
+    return True
+
+
+def _check_http(timeout=PROBE_TIMEOUT):
+    conn = http.client.HTTPConnection(HTTP_CHECK_HOST, 80, timeout=timeout)
+    try:
+        conn.request('GET', HTTP_CHECK_PATH, headers={'Connection': 'close'})
+        response = conn.getresponse()
+        return response.status == 200 and response.read(64).startswith(HTTP_CHECK_BODY)
+    finally:
+        conn.close()
+
+
+def _run_check(results, key, check):
+    try:
+        results[key] = bool(check())
+    except (OSError, http.client.HTTPException):
+        results[key] = False
+
+
+def symptom(probe):
+    """Symptôme le plus en amont d'une sonde rapide"""
+    if probe['gateway_known'] and probe['gateway'] is None:
+        return STATUS_LAN
+    if probe['host'] is None:
+        return STATUS_ISP
+    if not probe['dns']:
+        return STATUS_DNS
+    if not probe['http']:
+        return STATUS_HTTP
+    return STATUS_OK
+
+
+def quick_probe(timeout=PROBE_TIMEOUT):
+    """Passerelle, internet, DNS système et HTTP en parallèle (< 1 s)"""
+    start = time.perf_counter()
+    gateway = default_gateway()
+    checks = {}
+    threads = [
+        threading.Thread(target=_run_check, args=(checks, 'dns', _check_dns), daemon=True),
+        threading.Thread(target=_run_check, args=(checks, 'http', lambda: _check_http(timeout)), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    prober = TickProber(timeout=timeout)
+    try:
+        gateway_rtt, host_rtt, _ = prober.probe(gateway, PUBLIC_HOST, PUBLIC_RESOLVER)
+    finally:
+        prober.close()
+
+    # getaddrinfo n'a pas de délai : un DNS muet compte comme un échec
+    deadline = start + timeout + 0.1
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.perf_counter()))
+    probe = {
+        'gateway_known': gateway is not None,
+        'gateway': gateway_rtt,
+        'host': host_rtt,
+        'dns': checks.get('dns', False),
+        'http': checks.get('http', False),
+        'duration': time.perf_counter() - start,
+    }
+    probe['symptom'] = symptom(probe)
+    return probe
+
+
+# ============ STATISTIQUES ============
+
+class RepairStats:
+    """Essais et réussites par symptôme et par étape
+
+    Format JSON : {'steps': {symptôme: {étape: [essais, réussites]}},
+                   'pending': {'step', 'symptom', 'time'} ou null}
+    """
+
+    def __init__(self, path=None):
+        self.path = path or (get_network_data_dir() / "repair_stats.json")
+        self.steps = {}
+        self.pending = None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.steps = data.get('steps', {})
+            self.pending = data.get('pending')
+        except (OSError, ValueError):
+            pass
+
+    def record(self, symptom_key, step, fixed):
+        tried_fixed = self.steps.setdefault(symptom_key, {}).setdefault(step, [0, 0])
+        tried_fixed[0] += 1
+        tried_fixed[1] += 1 if fixed else 0
+
+    def success_rate(self, symptom_key, step):
+        """Taux de réussite lissé (1/2 sans donnée)"""
+        tried, fixed = self.steps.get(symptom_key, {}).get(step, (0, 0))
+        return (fixed + 1) / (tried + 2)
+
+    def order(self, symptom_key, steps=STEPS):
+        """Étapes triées par réussite attendue / coût (sans donnée : par coût)"""
+        return sorted(steps, key=lambda step: (-self.success_rate(symptom_key, step[0]) / step[2], step[2]))
+
+    def save(self):
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'steps': self.steps, 'pending': self.pending}, f, indent=2)
+        except OSError:
+            pass
+
+
+# ============ ÉCHELLE DE RÉPARATIONS ============
+
+class RepairLadder:
+    """Réparations de la moins coûteuse à la plus lourde, arrêt dès que c'est réparé
+
+    `actions` : {clé d'étape: fonction() -> bool (commande réussie)}
+    """
+
+    def __init__(self, actions, probe=quick_probe, stats=None, settle=SETTLE_SECONDS):
+        self.actions = actions
+        self.probe = probe
+        self.stats = stats if stats is not None else RepairStats()
+        self.settle = settle
+
+    def _probe_until_ok(self, seconds):
+        """Sonder jusqu'au retour de la connexion ou pendant `seconds` s"""
+        deadline = time.monotonic() + seconds
+        probe = self.probe()
+        while probe['symptom'] != STATUS_OK and time.monotonic() < deadline:
+            time.sleep(0.5)
+            probe = self.probe()
+        return probe
+
+    def run(self, log=None, progress=None):
+        log = log or (lambda text: None)
+        progress = progress or (lambda percent: None)
+        report = {'initial': None, 'final': None, 'steps': [], 'fixed_by': None, 'reboot_needed': False}
+
+        probe = self.probe()
+        report['initial'] = probe
+        self._resolve_pending(probe, log)
+        if probe['symptom'] == STATUS_OK:
+            log(f"  ✅ Connexion fonctionnelle (sonde en {probe['duration'] * 1000:.0f} ms) : aucune réparation nécessaire")
+            report['final'] = probe
+            self.stats.save()
+            return report
+
+        start_symptom = probe['symptom']
+        log(f"  ❌ Symptôme : {SYMPTOM_NAMES[start_symptom]}")
+        ladder = [step for step in self.stats.order(start_symptom) if step[0] in self.actions]
+        for index, (key, label, _, reboot) in enumerate(ladder, 1):
+            before = probe['symptom']
+            log(f"\n📊 ÉTAPE {index}/{len(ladder)} : {label}")
+            ran = self.actions[key]()
+            probe = self._probe_until_ok(self.settle if key == 'ip' else 0)
+            fixed = probe['symptom'] == STATUS_OK
+            report['steps'].append({'step': key, 'ran': ran, 'before': before, 'after': probe['symptom']})
+            progress(int(index / len(ladder) * 100))
+
+            if fixed:
+                self.stats.record(start_symptom, key, True)
+                report['fixed_by'] = key
+                log(f"  ✅ Connexion rétablie par : {label} (sonde en {probe['duration'] * 1000:.0f} ms)")
+                break
+            if reboot and ran:
+                # Effet seulement après redémarrage : évalué au prochain lancement
+                self.stats.pending = {'step': key, 'symptom': start_symptom, 'time': time.time()}
+                report['reboot_needed'] = True
+                log(f"  ⏸️ {label} ne s'applique qu'après redémarrage : arrêt de l'échelle")
+                break
+            self.stats.record(start_symptom, key, False)
+            log(f"  ❌ Toujours en échec : {SYMPTOM_NAMES[probe['symptom']]}")
+
+        report['final'] = probe
+        self.stats.save()
+        return report
+
+    def _resolve_pending(self, probe, log):
+        """Créditer le reset du lancement précédent (appliqué au redémarrage)"""
+        pending = self.stats.pending
+        if not pending:
+            return
+        label = STEP_NAMES.get(pending['step'], pending['step'])
+        if psutil.boot_time() < pending['time']:
+            # Pas encore redémarré : le reset n'est pas appliqué, rien à évaluer
+            log(f"  ⏸️ {label} en attente : redémarrez le PC pour l'appliquer")
+            return
+        self.stats.pending = None
+        fixed = probe['symptom'] == STATUS_OK
+        self.stats.record(pending['symptom'], pending['step'], fixed)
+        if fixed:
+            log(f"  ✅ Réparation précédente ({label}) : problème réglé après redémarrage")
@@ -6,17 +6,30 @@ Version 2.0 - Avec réparations réseau intégrées
 
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                             QTextEdit, QProgressBar, QMessageBox, QComboBox, QCheckBox,
-                            QGroupBox, QWidget, QScrollArea)
+                            QGroupBox, QWidget, QScrollArea, QLineEdit, QSpinBox)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
 import subprocess
-import socket
 import time
 import re
 import platform
 from datetime import datetime
 from pathlib import Path
 
+from modules.net_probes import Pinger, measure_loss, traceroute as trace_route
+from modules.latency_stats import summarize, format_histogram
+from modules.dns_bench import DnsBenchmark, DEFAULT_RESOLVERS, RCODE_NOERROR
+from modules.net_interfaces import get_interfaces, default_interface, format_speed, MEDIA_LOOPBACK
+from modules.net_monitor import NetworkMonitor, STATUS_NAMES, STATUS_OK, format_incident, export_timeline
+from modules.bufferbloat import BufferbloatTest, GRADE_TEXT
+from modules.bandwidth_monitor import BandwidthMonitor, format_rate, RATE_NAMES
+from modules.net_repair import RepairLadder, SYMPTOM_NAMES, STEP_NAMES
+from modules.lan_discovery import LanScanner, describe_ports
+from modules.http_timing import HttpTimingProbe, PHASES, PHASE_NAMES, parse_urls
+from modules.game_services import (check_services, load_catalogue, catalogue_path, save_default_catalogue,
+                                   STATUS_ICONS, STATUS_OK as CHECK_OK)
+from modules.throughput import ThroughputTest, ThroughputServer, DEFAULT_ENDPOINT, DEFAULT_PORT, local_addresses
+
 # Flags pour subprocess (masquer CMD)
 import sys
 if sys.platform == 'win32':
@@ -35,9 +48,11 @@ class NetworkTestWorker(QThread):
     progress_signal = pyqtSignal(int)
     finished_signal = pyqtSignal(dict)
     
-    def __init__(self, test_type):
+    def __init__(self, test_type, options=None):
         super().__init__()
         self.test_type = test_type
+        self.options = options or {}
+        self.active_test = None
     
     def run(self):
         """Exécuter les tests"""
@@ -52,6 +67,14 @@ class NetworkTestWorker(QThread):
                 results = self.run_latency_test()
             elif self.test_type == "dns":
                 results = self.run_dns_test()
+            elif self.test_type == "bufferbloat":
+                results = self.run_bufferbloat_test()
+            elif self.test_type == "lan":
+                results = self.run_lan_scan()
+            elif self.test_type == "web":
+                results = self.run_web_timing()
+            elif self.test_type == "games":
+                results = self.run_game_services_test()
             
             self.finished_signal.emit(results)
         
@@ -84,16 +107,18 @@ class NetworkTestWorker(QThread):
             ("9.9.9.9", "Quad9")
         ]
         
+        self.log_signal.emit(f"  → Test simultané de {len(servers)} serveurs...")
+        ping_by_ip = self.ping_servers([ip for ip, _ in servers], count=50)
+        
         ping_results = []
         for ip, name in servers:
-            self.log_signal.emit(f"  → Test {name} ({ip})...")
-            ping_data = self.ping_server(ip, count=4)
+            ping_data = ping_by_ip[ip]
             ping_results.append((name, ping_data))
             
             if ping_data['success']:
-                self.log_signal.emit(f"    ✅ Moy: {ping_data['avg']:.1f}ms | Min: {ping_data['min']:.1f}ms | Max: {ping_data['max']:.1f}ms")
+                self.log_signal.emit(f"    ✅ {name} ({ip}) - Médiane: {ping_data['p50']:.1f}ms | p95: {ping_data['p95']:.1f}ms | Jitter: {ping_data['jitter']:.1f}ms")
             else:
-                self.log_signal.emit(f"    ❌ Échec")
+                self.log_signal.emit(f"    ❌ {name} ({ip}) - Échec")
         
         results['ping'] = ping_results
         self.log_signal.emit("")
@@ -110,16 +135,21 @@ class NetworkTestWorker(QThread):
             "microsoft.com"
         ]
         
+        # Requêtes directes au résolveur (sans le cache DNS de Windows)
+        resolver_ip, resolver_name = DEFAULT_RESOLVERS[0]
+        self.log_signal.emit(f"  → Résolution via {resolver_name} ({resolver_ip}), en parallèle...")
+        answers = DnsBenchmark([(resolver_ip, resolver_name)], test_domains).run_pass()[resolver_ip]
+        
         dns_results = []
         for domain in test_domains:
-            self.log_signal.emit(f"  → Résolution {domain}...")
-            dns_data = self.resolve_dns(domain)
-            dns_results.append((domain, dns_data))
-            
-            if dns_data['success']:
-                self.log_signal.emit(f"    ✅ IP: {dns_data['ip']} | Temps: {dns_data['time']:.2f}ms")
+            answer = answers.get(domain)
+            if answer and answer[0] == RCODE_NOERROR and answer[2]:
+                dns_data = {'success': True, 'ip': answer[2][0], 'time': answer[1]}
+                self.log_signal.emit(f"    ✅ {domain} - IP: {dns_data['ip']} | Temps: {dns_data['time']:.2f}ms")
             else:
-                self.log_signal.emit(f"    ❌ Échec")
+                dns_data = {'success': False, 'ip': None, 'time': 0}
+                self.log_signal.emit(f"    ❌ {domain} - Échec")
+            dns_results.append((domain, dns_data))
         
         results['dns'] = dns_results
         self.log_signal.emit("")
@@ -129,13 +159,25 @@ class NetworkTestWorker(QThread):
         self.log_signal.emit("─" * 70)
         self.progress_signal.emit(60)
         
-        self.log_signal.emit("  → Test 100 pings vers 8.8.8.8...")
-        packet_loss = self.test_packet_loss("8.8.8.8", count=100)
+        self.log_signal.emit("  → 500 sondes vers 8.8.8.8 (50/s, ~10 s)...")
+        packet_loss = self.test_packet_loss("8.8.8.8", count=500, rate=50)
         results['packet_loss'] = packet_loss
         
         self.log_signal.emit(f"    Paquets envoyés: {packet_loss['sent']}")
         self.log_signal.emit(f"    Paquets reçus: {packet_loss['received']}")
         self.log_signal.emit(f"    Perte: {packet_loss['loss_percent']:.1f}%")
+        latency = packet_loss['latency']
+        if latency['success']:
+            self.log_signal.emit(f"    Latence: p50 {latency['p50']:.1f}ms | p95 {latency['p95']:.1f}ms | p99 {latency['p99']:.1f}ms | Jitter {latency['jitter']:.1f}ms")
+        if packet_loss['late']:
+            self.log_signal.emit(f"    Réponses en retard (> 1 s): {packet_loss['late']}")
+        if packet_loss['duplicates'] or packet_loss['reordered']:
+            self.log_signal.emit(f"    Doublons: {packet_loss['duplicates']} | Déséquencés: {packet_loss['reordered']}")
+        if packet_loss['lost']:
+            bursts = ", ".join(f"{length}×{n}" for length, n in sorted(packet_loss['bursts'].items()))
+            self.log_signal.emit(f"    Rafales de pertes (longueur×nombre): {bursts} | Pire rafale: {packet_loss['max_burst']}")
+            worst = [f"{int(t)}s: {missing}/{total}" for t, total, missing in packet_loss['timeline'] if missing]
+            self.log_signal.emit(f"    Pertes dans le temps: {' | '.join(worst[:10])}")
         
         if packet_loss['loss_percent'] == 0:
             self.log_signal.emit("    ✅ Aucune perte de paquets")
@@ -153,14 +195,29 @@ class NetworkTestWorker(QThread):
         self.log_signal.emit("─" * 70)
         self.progress_signal.emit(80)
         
-        self.log_signal.emit("  → Traceroute vers 8.8.8.8...")
+        self.log_signal.emit("  → Traceroute vers 8.8.8.8 (5 tours, tous les sauts en parallèle)...")
         traceroute_data = self.traceroute("8.8.8.8")
         results['traceroute'] = traceroute_data
         
         if traceroute_data['success']:
-            self.log_signal.emit(f"    ✅ {traceroute_data['hops']} sauts jusqu'à destination")
-            for i, hop in enumerate(traceroute_data['path'][:10], 1):
-                self.log_signal.emit(f"       {i}. {hop}")
+            if traceroute_data['reached']:
+                self.log_signal.emit(f"    ✅ {traceroute_data['hops']} sauts jusqu'à destination")
+            else:
+                self.log_signal.emit(f"    ⚠️ Destination non atteinte ({traceroute_data['hops']} sauts répondent)")
+            if traceroute_data['detail']:
+                self.log_signal.emit(f"       {'#':>2}  {'Adresse':<16} {'Perte':>6} {'Moy':>8} {'p95':>8} {'Jitter':>8}")
+                for hop in traceroute_data['detail']:
+                    latency = hop['latency']
+                    if hop['addr'] is None:
+                        self.log_signal.emit(f"       {hop['ttl']:>2}. {'*':<16} {'100%':>6}   (pas de réponse)")
+                        continue
+                    self.log_signal.emit(
+                        f"       {hop['ttl']:>2}. {hop['addr']:<16} {hop['loss_percent']:>5.0f}% "
+                        f"{latency['avg']:>6.1f}ms {latency['p95']:>6.1f}ms {latency['jitter']:>6.1f}ms"
+                    )
+            else:
+                for i, hop in enumerate(traceroute_data['path'], 1):
+                    self.log_signal.emit(f"       {i}. {hop}")
         else:
             self.log_signal.emit("    ⚠️ Traceroute partiel ou échoué")
         
@@ -178,177 +235,195 @@ class NetworkTestWorker(QThread):
         self.log_signal.emit(f"  • Passerelle par défaut: {connection_info.get('gateway', 'N/A')}")
         self.log_signal.emit(f"  • Serveur DNS: {connection_info.get('dns', 'N/A')}")
         self.log_signal.emit(f"  • Type connexion: {connection_info.get('connection_type', 'N/A')}")
+        self.log_signal.emit(f"  • Carte: {connection_info.get('adapter', 'N/A')} | Lien: {connection_info.get('link_speed', 'N/A')} | MTU: {connection_info.get('mtu', 'N/A')}")
+        
+        others = [i for i in connection_info.get('interfaces', [])
+                  if i['is_up'] and not i['default_route'] and i['media'] != MEDIA_LOOPBACK and i['ipv4']]
+        if others:
+            self.log_signal.emit("  • Autres cartes actives:")
+            for adapter in others:
+                self.log_signal.emit(f"      - {adapter['name']} ({adapter['media']}) : {', '.join(adapter['ipv4'])}")
         
         return results
     
-    def ping_server(self, ip, count=4):
-        """Ping un serveur - Version universelle"""
-        times = []
-        
-        for i in range(count):
-            try:
-                start_time = time.time()
-                
-                result = subprocess.run(
-                    ["ping", "-n", "1", ip],
-                    capture_output=True,
-                    text=True,
-                    timeout=2,
-                    creationflags=CREATE_NO_WINDOW if CREATE_NO_WINDOW else 0,
-                    startupinfo=STARTUPINFO if STARTUPINFO else None
-                )
-                
-                elapsed = (time.time() - start_time) * 1000
-                
-                if result.returncode == 0:
-                    times.append(elapsed)
-                
-                time.sleep(0.1)
-            except:
-                pass
-        
-        if not times:
-            return {'success': False, 'avg': 0, 'min': 0, 'max': 0, 'jitter': 0}
-        
-        return {
-            'success': True,
-            'avg': sum(times) / len(times),
-            'min': min(times),
-            'max': max(times),
-            'jitter': max(times) - min(times)
-        }
+    def ping_servers(self, ips, count=50, interval=0.02):
+        """Ping simultané de plusieurs serveurs (ICMP en processus)
+        
+        Durée fixe ≈ count × interval + 1 s, quel que soit le nombre de serveurs.
+        """
+        pinger = Pinger(timeout=1.0)
+        rtts = pinger.ping_many(ips, count=count, interval=interval)
+        if pinger.method and pinger.method.startswith('tcp'):
+            self.log_signal.emit("  ⚠️ ICMP indisponible : temps de connexion TCP mesuré à la place")
+        return {ip: summarize(rtts[ip]) for ip in ips}
     
-    def resolve_dns(self, domain):
-        """Résoudre un nom de domaine"""
+    def test_packet_loss(self, ip, count=500, rate=50):
+        """Test perte de paquets (sondes numérotées, cadence fixe)"""
+        def progress(sent, total):
+            self.log_signal.emit(f"    Progress: {sent}/{total} sondes...")
+        
         try:
-            start = time.time()
-            ip = socket.gethostbyname(domain)
-            elapsed = (time.time() - start) * 1000
-            
-            return {
-                'success': True,
-                'ip': ip,
-                'time': elapsed
-            }
-        except:
-            return {'success': False, 'ip': None, 'time': 0}
+            return measure_loss(ip, count=count, rate=rate, timeout=1.0, progress=progress)
+        except OSError:
+            return {'sent': count, 'received': 0, 'lost': count, 'late': 0, 'loss_percent': 100.0,
+                    'duplicates': 0, 'reordered': 0, 'bursts': {}, 'max_burst': 0, 'timeline': [], 'latency': summarize([])}
     
-    def test_packet_loss(self, ip, count=100):
-        """Test perte de paquets"""
-        sent = count
-        received = 0
-        
-        for i in range(count):
-            try:
-                result = subprocess.run(
-                    ["ping", "-n", "1", ip],
-                    capture_output=True,
-                    timeout=1,
-                    creationflags=CREATE_NO_WINDOW if CREATE_NO_WINDOW else 0,
-                    startupinfo=STARTUPINFO if STARTUPINFO else None
-                )
-                
-                if result.returncode == 0:
-                    received += 1
-                
-                if (i + 1) % 20 == 0:
-                    self.log_signal.emit(f"    Progress: {i+1}/{count} pings...")
-            except:
-                pass
-        
-        lost = sent - received
-        loss_percent = (lost / sent * 100) if sent > 0 else 0
+    def traceroute(self, ip, max_hops=30, rounds=5):
+        """Traceroute vers IP (TTL sondés en parallèle, statistiques par saut)"""
+        trace = trace_route(ip, max_hops=max_hops, rounds=rounds)
+        if trace is None:
+            return self.traceroute_tracert(ip, max_hops)
         
+        path = [hop['addr'] or '*' for hop in trace['hops']]
         return {
-            'sent': sent,
-            'received': received,
-            'lost': lost,
-            'loss_percent': loss_percent
+            'success': bool(trace['hops']),
+            'reached': trace['reached'],
+            'hops': len(path),
+            'path': path,
+            'detail': trace['hops'],
         }
     
-    def traceroute(self, ip):
-        """Traceroute vers IP"""
+    def traceroute_tracert(self, ip, max_hops=30):
+        """Traceroute via tracert (si ICMP en processus indisponible)"""
         try:
             result = subprocess.run(
-                ["tracert", "-d", "-h", "15", ip],
+                ["tracert", "-d", "-w", "1000", "-h", str(max_hops), ip],
                 capture_output=True,
                 text=True,
-                timeout=60,
+                timeout=max_hops * 4,
                 creationflags=CREATE_NO_WINDOW if CREATE_NO_WINDOW else 0,
                 startupinfo=STARTUPINFO if STARTUPINFO else None
             )
             
-            output = result.stdout
             path = []
-            hops = 0
+            for line in result.stdout.split('\n'):
+                # "  3    12 ms     *       11 ms  10.0.0.1" ou "  4     *        *        *     Délai..."
+                match = re.match(r'\s*(\d+)\s+((?:(?:<?\d+\s*ms|\*)\s+){3})(.*)$', line)
+                if not match:
+                    continue
+                address = re.search(r'(\d{1,3}(?:\.\d{1,3}){3})', match.group(3))
+                path.append(address.group(1) if address else '*')
             
-            for line in output.split('\n'):
-                match = re.search(r'\d+\s+\d+\s*ms\s+\d+\s*ms\s+\d+\s*ms\s+([\d.]+)', line)
-                if match:
-                    ip_hop = match.group(1)
-                    path.append(ip_hop)
-                    hops += 1
+            while path and path[-1] == '*':
+                path.pop()
             
             return {
-                'success': hops > 0,
-                'hops': hops,
-                'path': path
+                'success': bool(path),
+                'reached': bool(path) and path[-1] == ip,
+                'hops': len(path),
+                'path': path,
+                'detail': [],
             }
         
         except:
-            return {'success': False, 'hops': 0, 'path': []}
+            return {'success': False, 'reached': False, 'hops': 0, 'path': [], 'detail': []}
     
     def get_connection_info(self):
-        """Récupérer infos connexion"""
+        """Récupérer infos connexion (carte de la route par défaut)"""
         info = {
             'local_ip': 'N/A',
             'gateway': 'N/A',
             'dns': 'N/A',
-            'connection_type': 'N/A'
+            'connection_type': 'N/A',
+            'adapter': 'N/A',
+            'link_speed': 'N/A',
+            'mtu': 'N/A',
+            'interfaces': [],
         }
         
         try:
-            result = subprocess.run(
-                ["ipconfig", "/all"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=CREATE_NO_WINDOW if CREATE_NO_WINDOW else 0,
-                startupinfo=STARTUPINFO if STARTUPINFO else None
-            )
-            
-            output = result.stdout
-            
-            private_ips = re.findall(r'\b(?:192\.168|10\.|172\.(?:1[6-9]|2[0-9]|3[01]))\.\d{1,3}\.\d{1,3}\b', output)
-            if private_ips:
-                info['local_ip'] = private_ips[0]
+            interfaces = get_interfaces()
+        except Exception:
+            return info
+        
+        info['interfaces'] = interfaces
+        adapter = default_interface(interfaces)
+        if adapter is None:
+            return info
+        
+        info.update(
+            local_ip=adapter['ipv4'][0] if adapter['ipv4'] else 'N/A',
+            gateway=adapter['gateway'] or 'N/A',
+            dns=", ".join(adapter['dns']) or 'N/A',
+            connection_type=adapter['media'],
+            adapter=adapter['description'] or adapter['name'],
+            link_speed=format_speed(adapter['speed_mbps']),
+            mtu=adapter['mtu'] or 'N/A',
+        )
+        return info
+    
+    def run_speed_test(self):
+        """Test de débit multi-flux (download puis upload)"""
+        endpoint = self.options.get('endpoint') or DEFAULT_ENDPOINT
+        streams = self.options.get('streams', 4)
+        results = {'speed': {}}
+        
+        self.log_signal.emit("🚀 Test de débit multi-flux")
+        self.log_signal.emit(f"  Point de test: {endpoint} | {streams} flux | 10 s par sens (2 s de montée ignorées)\n")
+        
+        for step, (direction, label) in enumerate((("download", "⬇️ DOWNLOAD"), ("upload", "⬆️ UPLOAD"))):
+            self.log_signal.emit(label)
+            self.log_signal.emit("─" * 70)
             
-            gateway_match = re.search(r'(?:gateway|passerelle)[\s\S]{0,100}?((?:\d{1,3}\.){3}\d{1,3})', output, re.IGNORECASE)
-            if gateway_match:
-                gateway_ip = gateway_match.group(1)
-                if gateway_ip != '0.0.0.0':
-                    info['gateway'] = gateway_ip
+            def progress(elapsed, duration, mbps, step=step):
+                self.progress_signal.emit(int((step + elapsed / duration) * 50))
+                self.log_signal.emit(f"  {elapsed:4.1f}s  {mbps:8.1f} Mbps")
             
-            dns_match = re.search(r'DNS[\s\S]{0,100}?((?:\d{1,3}\.){3}\d{1,3})', output, re.IGNORECASE)
-            if dns_match:
-                info['dns'] = dns_match.group(1)
+            try:
+                test = ThroughputTest(endpoint, streams=streams, duration=10, warmup=2, direction=direction)
+            except ValueError as e:
+                return {'error': str(e)}
+            self.active_test = test
+            data = test.run(progress)
+            self.active_test = None
+            results['speed'][direction] = data
             
-            if 'ethernet' in output.lower():
-                info['connection_type'] = 'Ethernet (Câble)'
-            elif any(word in output.lower() for word in ['wi-fi', 'wifi', 'wireless', 'sans fil']):
-                info['connection_type'] = 'WiFi (Sans fil)'
-        
-        except:
-            pass
+            if data['success']:
+                self.log_signal.emit(f"\n  ✅ Débit: {data['mbps']:.1f} Mbps")
+                per_stream = " | ".join(f"#{i + 1}: {mbps:.1f}" for i, mbps in enumerate(data['per_stream']))
+                self.log_signal.emit(f"  Par flux (Mbps): {per_stream}")
+            else:
+                self.log_signal.emit("  ❌ Échec")
+            for error in sorted(set(data['errors'])):
+                self.log_signal.emit(f"  ⚠️ {error}")
+            self.log_signal.emit("")
         
-        return info
+        self.progress_signal.emit(100)
+        return results
     
-    def run_speed_test(self):
-        """Test de vitesse (simplifié)"""
-        self.log_signal.emit("⚠️ Speedtest complet nécessite speedtest-cli")
-        self.log_signal.emit("Test de latence uniquement...\n")
+    def run_bufferbloat_test(self):
+        """Latence sous charge (bufferbloat)"""
+        endpoint = self.options.get('endpoint') or DEFAULT_ENDPOINT
+        streams = max(self.options.get('streams', 4), 4)
+        
+        self.log_signal.emit("🎮 Test bufferbloat (latence sous charge)")
+        self.log_signal.emit(f"  Point de test: {endpoint} | {streams} flux\n")
+        
+        test = BufferbloatTest(endpoint, streams=streams)
+        self.active_test = test
+        report = test.run(log=self.log_signal.emit, progress=self.progress_signal.emit)
+        self.active_test = None
         
-        return self.run_latency_test()
+        if not report['success']:
+            self.log_signal.emit(f"\n❌ {report['error']}")
+            return {'bufferbloat': report}
+        
+        self.log_signal.emit("")
+        for direction, label in (("download", "⬇️ Download"), ("upload", "⬆️ Upload")):
+            data = report.get(direction)
+            if not data:
+                continue
+            if not data['load_ok']:
+                self.log_signal.emit(f"{label} : ⚠️ Charge non établie (point de test injoignable) : pas de note")
+                continue
+            self.log_signal.emit(f"{label} : +{data['added_p50']:.0f} ms (médiane) | +{data['added_p95']:.0f} ms (p95) → {data['grade']}")
+        
+        if report['grade']:
+            self.log_signal.emit(f"\n🏅 Note bufferbloat : {report['grade']} - {GRADE_TEXT[report['grade']]}")
+        else:
+            self.log_signal.emit("\n⚠️ Aucune note : le lien n'a pas pu être chargé")
+        
+        return {'bufferbloat': report}
     
     def run_latency_test(self):
         """Test latence détaillé"""
@@ -363,14 +438,18 @@ class NetworkTestWorker(QThread):
         
         self.log_signal.emit("🌍 Test de latence vers serveurs internationaux\n")
         
+        self.log_signal.emit("  250 mesures par serveur à 50 Hz, tous les serveurs en parallèle (~6 s)\n")
+        ping_by_ip = self.ping_servers([ip for ip, _ in servers], count=250, interval=0.02)
+        
         for ip, name in servers:
             self.log_signal.emit(f"→ {name}")
-            ping_data = self.ping_server(ip, count=10)
+            ping_data = ping_by_ip[ip]
             results['servers'].append((name, ping_data))
             
             if ping_data['success']:
-                self.log_signal.emit(f"  Latence moyenne: {ping_data['avg']:.1f}ms")
-                self.log_signal.emit(f"  Jitter: {ping_data['jitter']:.1f}ms")
+                self.log_signal.emit(f"  Latence moyenne: {ping_data['avg']:.1f}ms (écart-type {ping_data['stdev']:.1f}ms)")
+                self.log_signal.emit(f"  p50: {ping_data['p50']:.1f}ms | p95: {ping_data['p95']:.1f}ms | p99: {ping_data['p99']:.1f}ms")
+                self.log_signal.emit(f"  Jitter (RFC 3550): {ping_data['jitter']:.1f}ms | Perte: {ping_data['loss_percent']:.1f}%")
                 
                 if ping_data['avg'] < 30:
                     self.log_signal.emit("  ✅ Excellent (< 30ms)")
@@ -380,6 +459,13 @@ class NetworkTestWorker(QThread):
                     self.log_signal.emit("  ⚠️ Correct (50-100ms)")
                 else:
                     self.log_signal.emit("  ❌ Élevé (> 100ms)")
+                
+                if ping_data['jitter'] < 5:
+                    self.log_signal.emit("  ✅ Jitter faible : OK gaming/VoIP")
+                elif ping_data['jitter'] < 20:
+                    self.log_signal.emit("  ⚠️ Jitter modéré : micro-saccades possibles en jeu/appel")
+                else:
+                    self.log_signal.emit("  ❌ Jitter élevé : gaming/VoIP dégradés")
             else:
                 self.log_signal.emit("  ❌ Échec connexion")
             
@@ -388,46 +474,225 @@ class NetworkTestWorker(QThread):
         return results
     
     def run_dns_test(self):
-        """Test DNS détaillé"""
-        results = {'dns_servers': [], 'domains': []}
+        """Comparatif des serveurs DNS (passes froide et chaude)"""
+        results = {'dns_servers': [], 'dns_bench': []}
         
-        dns_servers = [
-            ("8.8.8.8", "Google DNS"),
-            ("1.1.1.1", "Cloudflare"),
-            ("208.67.222.222", "OpenDNS")
-        ]
+        bench = DnsBenchmark()
+        self.log_signal.emit("🔍 Comparaison serveurs DNS\n")
+        self.log_signal.emit(f"  {len(bench.resolvers)} serveurs × {len(bench.domains)} domaines, "
+                             "interrogés en parallèle (passe froide puis chaude)\n")
         
-        test_domain = "google.com"
+        last_percent = [-1]
         
-        self.log_signal.emit("🔍 Comparaison serveurs DNS\n")
+        def progress(done, total):
+            percent = int(done / total * 100)
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.progress_signal.emit(percent)
+        
+        report = bench.run(progress)
+        results['dns_bench'] = report
         
-        for dns_ip, dns_name in dns_servers:
-            self.log_signal.emit(f"→ Test {dns_name} ({dns_ip})")
+        for rank, entry in enumerate(report, 1):
+            cold, warm = entry['cold'], entry['warm']
+            ok = cold['success'] or warm['success']
+            results['dns_servers'].append((entry['name'], ok))
             
-            try:
-                result = subprocess.run(
-                    ["nslookup", test_domain, dns_ip],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    creationflags=CREATE_NO_WINDOW if CREATE_NO_WINDOW else 0,
-                    startupinfo=STARTUPINFO if STARTUPINFO else None
+            self.log_signal.emit(f"{rank}. {entry['name']} ({entry['ip']})")
+            if not ok:
+                self.log_signal.emit("  ❌ Aucune réponse")
+                self.log_signal.emit("")
+                continue
+            for label, data in (("Froid", cold), ("Chaud", warm)):
+                self.log_signal.emit(
+                    f"  {label}: p50 {data['p50']:.1f}ms | p95 {data['p95']:.1f}ms | p99 {data['p99']:.1f}ms"
+                    f" | Échecs {data['failure_percent']:.0f}% ({data['timeouts']} timeout, {data['errors']} erreur)"
                 )
-                
-                if result.returncode == 0:
-                    self.log_signal.emit("  ✅ Résolution réussie")
-                    results['dns_servers'].append((dns_name, True))
-                else:
-                    self.log_signal.emit("  ❌ Échec")
-                    results['dns_servers'].append((dns_name, False))
-            
-            except:
-                self.log_signal.emit("  ❌ Timeout")
-                results['dns_servers'].append((dns_name, False))
-            
             self.log_signal.emit("")
         
+        best = report[0] if report and (report[0]['cold']['success'] or report[0]['warm']['success']) else None
+        if best:
+            self.log_signal.emit(f"🏆 Serveur recommandé : {best['name']} ({best['ip']})")
+        
         return results
+    
+    def run_lan_scan(self):
+        """Appareils présents sur le réseau local"""
+        try:
+            scanner = LanScanner(self.options.get('lan_range') or None)
+        except ValueError as e:
+            self.log_signal.emit(f"❌ Plage invalide : {e}")
+            return {'lan': {'success': False, 'error': str(e)}}
+        if scanner.network is None:
+            self.log_signal.emit("❌ Aucun réseau local détecté (carte réseau déconnectée ?)")
+            return {'lan': {'success': False}}
+        
+        self.log_signal.emit("📡 Scan du réseau local")
+        self.log_signal.emit(f"  Plage {scanner.network} | {len(scanner.ports)} ports courants | "
+                             f"{scanner.concurrency} connexions simultanées\n")
+        
+        last_percent = [-1]
+        
+        def progress(done, total):
+            percent = int(done / total * 100)
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.progress_signal.emit(percent)
+        
+        report = scanner.run(progress)
+        devices = report['devices']
+        self.log_signal.emit(f"✅ {len(devices)} appareil(s) trouvé(s) sur {report['scanned']} adresses "
+                             f"en {report['duration']:.1f} s\n")
+        
+        for device in devices:
+            tags = []
+            if device['is_gateway']:
+                tags.append("box/routeur")
+            if device['is_self']:
+                tags.append("ce PC")
+            if device['new'] and report['new']:
+                tags.append("🆕 nouveau")
+            label = f" [{', '.join(tags)}]" if tags else ""
+            rtt = f"{device['rtt']:.1f} ms" if device['rtt'] is not None else "ARP seul"
+            self.log_signal.emit(f"• {device['ip']}{label} - {device['hostname'] or 'nom inconnu'}")
+            self.log_signal.emit(f"    MAC: {device['mac'] or 'N/A'} | Réponse: {rtt}")
+            if device['open_ports']:
+                self.log_signal.emit(f"    Ports ouverts: {describe_ports(device['open_ports'])}")
+        
+        if report['missing']:
+            self.log_signal.emit(f"\n💤 Absents depuis le dernier scan ({len(report['missing'])}) :")
+            for device in report['missing']:
+                self.log_signal.emit(f"  • {device['ip']} - {device.get('hostname') or 'nom inconnu'} "
+                                     f"(MAC {device.get('mac') or 'N/A'})")
+        if report['new']:
+            self.log_signal.emit(f"\n🆕 {len(report['new'])} nouvel(s) appareil(s) depuis le dernier scan")
+        
+        return {'lan': report}
+    
+    def run_web_timing(self):
+        """Temps de chaque phase d'une requête web (DNS, TCP, TLS, serveur, transfert)"""
+        urls = parse_urls(self.options.get('web_urls', ''))
+        probe = HttpTimingProbe(urls or None)
+        
+        self.log_signal.emit("⏱️ Décomposition des temps de chargement web")
+        self.log_signal.emit(f"  {len(probe.urls)} sites × {probe.rounds} passes, en parallèle\n")
+        
+        def progress(done, total):
+            self.progress_signal.emit(int(done / total * 100))
+        
+        report = probe.run(progress)
+        
+        for entry in report:
+            self.log_signal.emit(f"🌐 {entry['url']}")
+            if not entry['success']:
+                self.log_signal.emit(f"  ❌ {entry['errors'][0] if entry['errors'] else 'Échec'}")
+                self.log_signal.emit("")
+                continue
+            for phase in PHASES:
+                data = entry['phases'].get(phase)
+                if not data:
+                    continue
+                line = f"  {PHASE_NAMES[phase]:<24} p50 {data['p50']:7.1f} ms | p95 {data['p95']:7.1f} ms"
+                delta = entry['delta_p50'].get(phase)
+                if delta is not None and abs(delta) >= 1:
+                    line += f" | {'+' if delta > 0 else ''}{delta:.0f} ms vs {entry['previous']['time'][:16].replace('T', ' ')}"
+                self.log_signal.emit(line)
+            if entry['errors']:
+                self.log_signal.emit(f"  ⚠️ {len(entry['errors'])}/{entry['requests']} échec(s) : {entry['errors'][0]}")
+            if entry['dominant']:
+                self.log_signal.emit(f"  → Phase la plus longue : {PHASE_NAMES[entry['dominant']]}")
+            self.log_signal.emit("")
+        
+        # Phase dominante la plus fréquente : où chercher la lenteur
+        dominants = [e['dominant'] for e in report if e['dominant']]
+        if dominants:
+            worst = max(set(dominants), key=dominants.count)
+            advice = {
+                'dns': "DNS lent : essayez un autre serveur DNS (Test DNS)",
+                'connect': "Connexion lente : latence élevée vers internet (Test Latence, Bufferbloat)",
+                'tls': "Négociation TLS lente : latence élevée ou antivirus qui inspecte le HTTPS",
+                'ttfb': "Attente serveur : les sites eux-mêmes répondent lentement (pas votre connexion)",
+                'transfer': "Transfert lent : débit insuffisant (Test Débit)",
+            }
+            self.log_signal.emit(f"💡 {advice[worst]}")
+        
+        return {'web_timing': report}
+    
+    def run_game_services_test(self):
+        """Matrice d'accessibilité des services de jeu (ports TCP/UDP)"""
+        path = catalogue_path()
+        if not path.exists():
+            try:
+                save_default_catalogue(path)
+            except OSError:
+                pass
+        catalogue = load_catalogue(path)
+        
+        self.log_signal.emit("🎮 Accessibilité des services de jeu")
+        self.log_signal.emit(f"  {len(catalogue)} vérifications TCP/UDP en parallèle")
+        self.log_signal.emit(f"  Catalogue personnalisable : {path}\n")
+        
+        def progress(done, total):
+            self.progress_signal.emit(int(done / total * 100))
+        
+        report = check_services(catalogue, progress=progress)
+        
+        for service in report['services']:
+            latency = f" | {service['best_latency']:.0f} ms" if service['best_latency'] is not None else ""
+            self.log_signal.emit(f"{STATUS_ICONS[service['status']]} {service['service']} "
+                                 f"({service['passed']}/{service['total']}){latency}")
+            for check in service['checks']:
+                target = f"{check['host']}:{check['port']}/{check['proto'].upper()}"
+                if check['status'] == CHECK_OK:
+                    detail = f"{check['latency']:.0f} ms"
+                else:
+                    detail = check['error'] or "pas de réponse (filtré ou ignoré)"
+                self.log_signal.emit(f"    {STATUS_ICONS[check['status']]} {target:<52} {detail}")
+        
+        self.log_signal.emit(f"\n📊 {report['passed']}/{report['total']} vérifications réussies "
+                             f"en {report['duration']:.1f} s")
+        blocked = [s['service'] for s in report['services'] if s['status'] != CHECK_OK]
+        if blocked:
+            self.log_signal.emit(f"💡 Services à vérifier : {', '.join(blocked)}")
+            self.log_signal.emit("   Pare-feu Windows/antivirus, redirection de ports (NAT) ou filtrage de la box")
+        else:
+            self.log_signal.emit("✅ Tous les services de jeu sont joignables")
+        
+        return {'game_services': report}
+
+
+class NetworkMonitorWorker(QThread):
+    """Worker pour la surveillance continue (1 mesure/seconde)"""
+    sample_signal = pyqtSignal(dict)
+    incident_signal = pyqtSignal(str, dict)
+    
+    def __init__(self):
+        super().__init__()
+        self.monitor = NetworkMonitor()
+    
+    def run(self):
+        self.monitor.run(
+            on_sample=self.sample_signal.emit,
+            on_incident=self.incident_signal.emit
+        )
+    
+    def stop(self):
+        self.monitor.stop()
+
+
+class BandwidthMonitorWorker(QThread):
+    """Worker pour le débit par carte et par processus (2 relevés/seconde)"""
+    sample_signal = pyqtSignal(dict)
+    
+    def __init__(self):
+        super().__init__()
+        self.monitor = BandwidthMonitor()
+    
+    def run(self):
+        self.monitor.run(on_sample=self.sample_signal.emit)
+    
+    def stop(self):
+        self.monitor.stop()
 
 
 class NetworkRepairWorker(QThread):
@@ -446,7 +711,9 @@ class NetworkRepairWorker(QThread):
         results = {'success': True, 'errors': []}
         
         try:
-            if self.repair_type == "full":
+            if self.repair_type == "adaptive":
+                results['report'] = self.adaptive_repair()
+            elif self.repair_type == "full":
                 self.full_repair()
             elif self.repair_type == "quick":
                 self.quick_repair()
@@ -508,6 +775,34 @@ class NetworkRepairWorker(QThread):
         self.log_signal.emit("⚠️ REDÉMARRAGE REQUIS")
         self.log_signal.emit("Redémarrez votre PC pour appliquer tous les changements.\n")
     
+    def adaptive_repair(self):
+        """Réparation adaptative : étape la moins coûteuse d'abord, arrêt dès que réparé"""
+        self.log_signal.emit("╔" + "═"*70 + "╗")
+        self.log_signal.emit("║" + " "*18 + "🧠 RÉPARATION RÉSEAU ADAPTATIVE" + " "*20 + "║")
+        self.log_signal.emit("╚" + "═"*70 + "╝\n")
+        
+        self.log_signal.emit("🔍 Sonde rapide (passerelle, internet, DNS, web)...")
+        ladder = RepairLadder({
+            'dns': self.flush_dns,
+            'ip': self.release_renew_ip,
+            'tcp': self.reset_tcp_ip,
+            'winsock': self.reset_winsock,
+            'firewall': self.reset_firewall,
+        })
+        report = ladder.run(log=self.log_signal.emit, progress=self.progress_signal.emit)
+        self.progress_signal.emit(100)
+        
+        self.log_signal.emit("")
+        if report['fixed_by']:
+            self.log_signal.emit(f"✅ Réparé en {len(report['steps'])} étape(s) - aucun redémarrage nécessaire\n")
+        elif report['reboot_needed']:
+            self.log_signal.emit("⚠️ REDÉMARRAGE REQUIS")
+            self.log_signal.emit("Redémarrez puis relancez la réparation adaptative pour vérifier.\n")
+        elif report['steps']:
+            self.log_signal.emit(f"❌ Toujours en échec : {SYMPTOM_NAMES[report['final']['symptom']]}")
+            self.log_signal.emit("💡 Vérifiez la box, le câble/WiFi ou contactez votre FAI.\n")
+        return report
+    
     def quick_repair(self):
         """Réparation rapide (DNS + IP + TCP)"""
         self.log_signal.emit("╔" + "═"*70 + "╗")
@@ -579,10 +874,13 @@ class NetworkRepairWorker(QThread):
             
             if result.returncode == 0:
                 self.log_signal.emit("  ✅ Cache DNS vidé avec succès")
+                return True
             else:
                 self.log_signal.emit("  ⚠️ Erreur lors du vidage DNS")
+                return False
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
+            return False
     
     def release_renew_ip(self):
         """Release + Renew IP"""
@@ -609,10 +907,13 @@ class NetworkRepairWorker(QThread):
             
             if result.returncode == 0:
                 self.log_signal.emit("  ✅ IP renouvelée avec succès")
+                return True
             else:
                 self.log_signal.emit("  ⚠️ Erreur lors du renouvellement IP")
+                return False
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
+            return False
     
     def reset_tcp_ip(self):
         """Reset TCP/IP stack"""
@@ -630,10 +931,13 @@ class NetworkRepairWorker(QThread):
             if result.returncode == 0:
                 self.log_signal.emit("  ✅ TCP/IP réinitialisé avec succès")
                 self.log_signal.emit("  ℹ️ Redémarrage requis pour appliquer")
+                return True
             else:
                 self.log_signal.emit("  ⚠️ Erreur lors du reset TCP/IP")
+                return False
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
+            return False
     
     def reset_winsock(self):
         """Reset Winsock"""
@@ -651,10 +955,13 @@ class NetworkRepairWorker(QThread):
             if result.returncode == 0:
                 self.log_signal.emit("  ✅ Winsock réinitialisé avec succès")
                 self.log_signal.emit("  ℹ️ Redémarrage requis pour appliquer")
+                return True
             else:
                 self.log_signal.emit("  ⚠️ Erreur lors du reset Winsock")
+                return False
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
+            return False
     
     def reset_firewall(self):
         """Reset Windows Firewall"""
@@ -671,10 +978,13 @@ class NetworkRepairWorker(QThread):
             
             if result.returncode == 0:
                 self.log_signal.emit("  ✅ Firewall réinitialisé avec succès")
+                return True
             else:
                 self.log_signal.emit("  ⚠️ Erreur lors du reset Firewall")
+                return False
         except Exception as e:
             self.log_signal.emit(f"  ❌ Erreur: {str(e)}")
+            return False
 
 
 class NetworktesterWindow(QDialog):
@@ -746,11 +1056,78 @@ class NetworktesterWindow(QDialog):
             "🌐 Test Complet (5 étapes)",
             "⚡ Test Latence Détaillé",
             "🔍 Test DNS",
+            "🚀 Test Débit (multi-flux)",
+            "🎮 Test Bufferbloat (latence sous charge)",
+            "📡 Scan Réseau Local (appareils)",
+            "⏱️ Test Web (DNS / TCP / TLS / serveur)",
+            "🎮 Test Services de Jeu (Steam, Xbox, PSN...)",
         ])
         test_type_layout.addWidget(self.test_combo)
         test_type_layout.addStretch()
         test_layout.addLayout(test_type_layout)
         
+        # Options test débit
+        speed_layout = QHBoxLayout()
+        speed_layout.addWidget(QLabel("Point de test débit:"))
+        self.endpoint_input = QLineEdit()
+        self.endpoint_input.setPlaceholderText(f"{DEFAULT_ENDPOINT}  (ou tcp://IP:{DEFAULT_PORT}, http://IP:{DEFAULT_PORT})")
+        speed_layout.addWidget(self.endpoint_input, 1)
+        speed_layout.addWidget(QLabel("Flux:"))
+        self.streams_spin = QSpinBox()
+        self.streams_spin.setRange(1, 16)
+        self.streams_spin.setValue(4)
+        speed_layout.addWidget(self.streams_spin)
+        self.server_btn = QPushButton("🖥️ Serveur local")
+        self.server_btn.setCheckable(True)
+        self.server_btn.setToolTip("Servir de point de test pour les autres PC du réseau (LAN, sans internet)")
+        self.server_btn.toggled.connect(self.toggle_local_server)
+        speed_layout.addWidget(self.server_btn)
+        test_layout.addLayout(speed_layout)
+        
+        # Options scan réseau local
+        lan_layout = QHBoxLayout()
+        lan_layout.addWidget(QLabel("Plage scan local:"))
+        self.lan_range_input = QLineEdit()
+        self.lan_range_input.setPlaceholderText("Automatique (/24 de la carte active) ou CIDR, ex. 192.168.1.0/24")
+        lan_layout.addWidget(self.lan_range_input, 1)
+        test_layout.addLayout(lan_layout)
+        
+        # Options test web
+        web_layout = QHBoxLayout()
+        web_layout.addWidget(QLabel("Sites test web:"))
+        self.web_urls_input = QLineEdit()
+        self.web_urls_input.setPlaceholderText("Sites courants par défaut, ou URL séparées par des espaces")
+        web_layout.addWidget(self.web_urls_input, 1)
+        test_layout.addLayout(web_layout)
+        
+        # Surveillance continue
+        monitor_layout = QHBoxLayout()
+        self.monitor_btn = QPushButton("📡 Surveillance continue")
+        self.monitor_btn.setCheckable(True)
+        self.monitor_btn.setToolTip("Ping passerelle + internet + DNS chaque seconde pour attraper les coupures intermittentes")
+        self.monitor_btn.toggled.connect(self.toggle_monitor)
+        monitor_layout.addWidget(self.monitor_btn)
+        export_incidents_btn = QPushButton("📤 Exporter coupures")
+        export_incidents_btn.clicked.connect(self.export_incidents)
+        monitor_layout.addWidget(export_incidents_btn)
+        self.monitor_label = QLabel("Surveillance arrêtée")
+        self.monitor_label.setStyleSheet("color: #888;")
+        monitor_layout.addWidget(self.monitor_label, 1)
+        test_layout.addLayout(monitor_layout)
+        
+        # Débit par carte / par processus
+        bandwidth_layout = QHBoxLayout()
+        self.bandwidth_btn = QPushButton("📶 Bande passante")
+        self.bandwidth_btn.setCheckable(True)
+        self.bandwidth_btn.setToolTip("Débit en temps réel par carte réseau et programmes qui utilisent le réseau")
+        self.bandwidth_btn.toggled.connect(self.toggle_bandwidth)
+        bandwidth_layout.addWidget(self.bandwidth_btn)
+        self.bandwidth_label = QLabel("Moniteur de bande passante arrêté")
+        self.bandwidth_label.setStyleSheet("color: #888;")
+        self.bandwidth_label.setWordWrap(True)
+        bandwidth_layout.addWidget(self.bandwidth_label, 1)
+        test_layout.addLayout(bandwidth_layout)
+        
         # Boutons tests
         test_btn_layout = QHBoxLayout()
         
@@ -810,6 +1187,12 @@ class NetworktesterWindow(QDialog):
         self.repair_full_btn.setStyleSheet("background: #FF9800; font-size: 11px;")
         repair_btn_layout.addWidget(self.repair_full_btn)
         
+        self.repair_adaptive_btn = QPushButton("🧠 Adaptative")
+        self.repair_adaptive_btn.setToolTip("Répare étape par étape et s'arrête dès que la connexion revient")
+        self.repair_adaptive_btn.clicked.connect(lambda: self.start_repair("adaptive"))
+        self.repair_adaptive_btn.setStyleSheet("font-size: 11px;")
+        repair_btn_layout.addWidget(self.repair_adaptive_btn)
+        
         self.repair_quick_btn = QPushButton("⚡ Réparation Rapide")
         self.repair_quick_btn.clicked.connect(lambda: self.start_repair("quick"))
         self.repair_quick_btn.setStyleSheet("font-size: 11px;")
@@ -937,6 +1320,10 @@ class NetworktesterWindow(QDialog):
         self.show_welcome()
         self.test_worker = None
         self.repair_worker = None
+        self.local_server = None
+        self.monitor_worker = None
+        self.last_monitor = None
+        self.bandwidth_worker = None
     
     def show_welcome(self):
         """Message d'accueil"""
@@ -949,12 +1336,19 @@ class NetworktesterWindow(QDialog):
 🧪 TESTS RÉSEAU:
 - 📊 Ping vers 4 serveurs DNS internationaux
 - 🔍 Test résolution DNS (4 domaines)
-- 📉 Test perte de paquets (100 pings)
+- 📉 Test perte de paquets (500 sondes, rafales, déséquencement)
 - 🗺️ Traceroute (chemin réseau)
 - ℹ️ Informations connexion (IP, passerelle, DNS)
+- 🚀 Test débit multi-flux (download/upload, serveur local pour le LAN)
+- 🎮 Test bufferbloat (lag sous charge, note A+ à F)
+- 📶 Bande passante en direct (par carte et par programme)
+- 📡 Scan du réseau local (appareils, ports ouverts, nouveaux venus)
+- ⏱️ Test web : temps DNS, connexion, TLS, serveur et transfert
+- 🎮 Services de jeu : ports Steam, Xbox, PSN, Battle.net, Riot...
 
 🔧 RÉPARATIONS RÉSEAU (NOUVEAU):
 - 🚀 Réparation Complète (5 étapes - Recommandé)
+- 🧠 Réparation Adaptative (s'arrête dès que la connexion revient)
 - ⚡ Réparation Rapide (3 étapes - 30 sec)
 - ⚙️ Réparation Personnalisée (choix manuel)
 
@@ -1033,6 +1427,11 @@ POUR RÉPARER:
             0: "full",
             1: "latency",
             2: "dns",
+            3: "speed",
+            4: "bufferbloat",
+            5: "lan",
+            6: "web",
+            7: "games",
         }
         
         test_type = test_types.get(test_index, "full")
@@ -1041,6 +1440,7 @@ POUR RÉPARER:
         self.stop_btn.setEnabled(True)
         self.repair_full_btn.setEnabled(False)
         self.repair_quick_btn.setEnabled(False)
+        self.repair_adaptive_btn.setEnabled(False)
         self.repair_custom_btn.setEnabled(False)
         
         self.progress.setVisible(True)
@@ -1048,7 +1448,13 @@ POUR RÉPARER:
         
         self.results.clear()
         
-        self.test_worker = NetworkTestWorker(test_type)
+        options = {
+            'endpoint': self.endpoint_input.text().strip(),
+            'streams': self.streams_spin.value(),
+            'lan_range': self.lan_range_input.text().strip(),
+            'web_urls': self.web_urls_input.text().strip(),
+        }
+        self.test_worker = NetworkTestWorker(test_type, options)
         self.test_worker.log_signal.connect(self.append_log)
         self.test_worker.progress_signal.connect(self.progress.setValue)
         self.test_worker.finished_signal.connect(self.on_test_finished)
@@ -1057,11 +1463,156 @@ POUR RÉPARER:
     def stop_test(self):
         """Arrêter le test en cours"""
         if self.test_worker and self.test_worker.isRunning():
+            # Fermer les flux du test de débit (threads hors QThread)
+            if self.test_worker.active_test:
+                self.test_worker.active_test.stop()
             self.test_worker.terminate()
             self.test_worker.wait()
             self.append_log("\n⚠️ Test interrompu par l'utilisateur")
             self.on_test_finished({})
     
+    def toggle_local_server(self, enabled):
+        """Démarrer/arrêter le serveur de test de débit local"""
+        if enabled:
+            try:
+                self.local_server = ThroughputServer(port=DEFAULT_PORT).start()
+            except OSError as e:
+                self.server_btn.setChecked(False)
+                QMessageBox.warning(self, "⚠️ Serveur local", f"Impossible d'ouvrir le port {DEFAULT_PORT} :\n{e}")
+                return
+            self.server_btn.setText("⏹️ Arrêter serveur")
+            self.append_log(f"\n🖥️ Serveur de test de débit actif (port {DEFAULT_PORT})")
+            for address in local_addresses() or ["<IP de ce PC>"]:
+                self.append_log(f"   Depuis un autre PC : tcp://{address}:{DEFAULT_PORT} ou http://{address}:{DEFAULT_PORT}")
+        elif self.local_server:
+            self.local_server.stop()
+            self.local_server = None
+            self.server_btn.setText("🖥️ Serveur local")
+            self.append_log("\n🖥️ Serveur de test de débit arrêté")
+    
+    def toggle_monitor(self, enabled):
+        """Démarrer/arrêter la surveillance continue"""
+        if enabled:
+            self.monitor_worker = NetworkMonitorWorker()
+            self.monitor_worker.sample_signal.connect(self.on_monitor_sample)
+            self.monitor_worker.incident_signal.connect(self.on_monitor_incident)
+            self.monitor_worker.start()
+            self.monitor_btn.setText("⏹️ Arrêter surveillance")
+            self.append_log("\n📡 Surveillance continue démarrée (passerelle, 1.0.0.1, DNS 8.8.8.8 - 1 mesure/s)")
+            self.append_log("   Laissez la fenêtre ouverte : chaque coupure sera notée ici.")
+        elif self.monitor_worker:
+            self.monitor_worker.stop()
+            self.monitor_worker.wait()
+            self.last_monitor = self.monitor_worker.monitor
+            self.monitor_worker = None
+            self.monitor_btn.setText("📡 Surveillance continue")
+            summary = self.last_monitor.summary()
+            self.monitor_label.setText(
+                f"Arrêtée - disponibilité {summary['availability']:.2f}% | {summary['incidents']} coupure(s)"
+            )
+            self.append_log(f"\n📡 Surveillance arrêtée : {summary['incidents']} coupure(s), "
+                            f"disponibilité {summary['availability']:.2f}%")
+    
+    def on_monitor_sample(self, sample):
+        """Mesure de la surveillance (chaque seconde)"""
+        def fmt(rtt):
+            return "❌" if rtt is None else f"{rtt:.0f} ms"
+        
+        icon = "🟢" if sample['status'] == STATUS_OK else "🔴"
+        monitor = self.monitor_worker.monitor if self.monitor_worker else None
+        incidents = 0
+        if monitor:
+            incidents = len(monitor.incidents) + (1 if monitor.detector.current else 0)
+        self.monitor_label.setText(
+            f"{icon} Passerelle {fmt(sample['gateway'])} | Internet {fmt(sample['host'])} | "
+            f"DNS {fmt(sample['dns'])} | Coupures: {incidents}"
+        )
+    
+    def on_monitor_incident(self, kind, incident):
+        """Début/fin de coupure"""
+        started = datetime.fromtimestamp(incident['start']).strftime('%H:%M:%S')
+        if kind == 'start':
+            self.append_log(f"🔴 {started} Coupure détectée - cause probable : {STATUS_NAMES[incident['kind']]}")
+        else:
+            self.append_log(f"🟢 Rétabli : {format_incident(incident)}")
+    
+    def toggle_bandwidth(self, enabled):
+        """Démarrer/arrêter le moniteur de bande passante"""
+        if enabled:
+            self.bandwidth_worker = BandwidthMonitorWorker()
+            self.bandwidth_worker.sample_signal.connect(self.on_bandwidth_sample)
+            self.bandwidth_worker.start()
+            self.bandwidth_btn.setText("⏹️ Arrêter bande passante")
+            self.append_log("\n📶 Moniteur de bande passante démarré (cartes : 2 relevés/s, programmes : toutes les 2 s)")
+        elif self.bandwidth_worker:
+            self.bandwidth_worker.stop()
+            self.bandwidth_worker.wait()
+            monitor = self.bandwidth_worker.monitor
+            self.bandwidth_worker = None
+            self.bandwidth_btn.setText("📶 Bande passante")
+            self.bandwidth_label.setText("Moniteur de bande passante arrêté")
+            self.append_log("\n📶 Moniteur de bande passante arrêté - pics de débit par carte :")
+            for name, (recv, sent) in sorted(monitor.peaks().items(), key=lambda item: -sum(item[1])):
+                if recv or sent:
+                    self.append_log(f"   {name}: ⬇️ {format_rate(recv)} | ⬆️ {format_rate(sent)}")
+            if monitor.talkers:
+                self.append_log("   Derniers programmes les plus actifs :")
+                for talker in monitor.talkers:
+                    label = RATE_NAMES.get(talker['rate_kind'], "E/S")
+                    rate = f"{label} N/A" if talker['rate'] is None else f"{label} {format_rate(talker['rate'])}"
+                    self.append_log(f"   • {talker['name']} (PID {talker['pid']}) - "
+                                    f"{talker['connections']} connexion(s), {rate}")
+    
+    def on_bandwidth_sample(self, sample):
+        """Relevé du moniteur de bande passante"""
+        active = sorted(
+            ((name, recv, sent) for name, (recv, sent) in sample['rates'].items() if recv or sent),
+            key=lambda item: item[1] + item[2], reverse=True
+        )
+        lines = [f"{name}: ⬇️ {format_rate(recv)} ⬆️ {format_rate(sent)}" for name, recv, sent in active[:3]]
+        if not lines:
+            lines.append("Aucun trafic")
+        talkers = ", ".join(
+            f"{t['name']} ({t['connections']})" for t in sample['talkers'][:3]
+        )
+        if talkers:
+            lines.append(f"Programmes : {talkers}")
+        self.bandwidth_label.setText("\n".join(lines))
+    
+    def export_incidents(self):
+        """Exporter la chronologie des coupures"""
+        monitor = self.monitor_worker.monitor if self.monitor_worker else self.last_monitor
+        if monitor is None or monitor.started is None:
+            QMessageBox.warning(self, "⚠️", "Aucune surveillance à exporter.\nLancez d'abord la surveillance continue.")
+            return
+        
+        incidents = list(monitor.incidents)
+        if monitor.detector.current:
+            current = monitor.detector.current
+            incidents.append(dict(current, end=None, duration=time.time() - current['start']))
+        desktop = Path.home() / "Desktop"
+        filename = desktop / f"Wapinator_Coupures_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        try:
+            export_timeline(filename, incidents, monitor.summary())
+            QMessageBox.information(self, "✅ Chronologie exportée", f"Fichier sauvegardé:\n{filename.name}")
+        except OSError as e:
+            QMessageBox.critical(self, "❌ Erreur", f"Impossible d'exporter:\n{str(e)}")
+    
+    def done(self, result):
+        """Fermer le serveur local et les moniteurs avec la fenêtre"""
+        if self.local_server:
+            self.local_server.stop()
+            self.local_server = None
+        if self.monitor_worker:
+            self.monitor_worker.stop()
+            self.monitor_worker.wait()
+            self.monitor_worker = None
+        if self.bandwidth_worker:
+            self.bandwidth_worker.stop()
+            self.bandwidth_worker.wait()
+            self.bandwidth_worker = None
+        super().done(result)
+    
     def start_repair(self, repair_type):
         """Lancer réparation réseau"""
         
@@ -1099,6 +1650,16 @@ POUR RÉPARER:
                 "💾 Sauvegardez vos travaux en cours avant de continuer.\n\n"
                 "Continuer ?"
             )
+        elif repair_type == "adaptive":
+            message = (
+                "🧠 RÉPARATION ADAPTATIVE\n\n"
+                "Les réparations sont tentées de la plus légère à la plus lourde\n"
+                "(DNS, IP, TCP/IP, Winsock, Firewall).\n\n"
+                "La connexion est vérifiée en moins d'une seconde après chaque étape :\n"
+                "la réparation s'arrête dès que tout refonctionne.\n\n"
+                "Durée : quelques secondes à 1 minute\n\n"
+                "Continuer ?"
+            )
         else:  # quick
             message = (
                 "⚡ RÉPARATION RAPIDE\n\n"
@@ -1124,6 +1685,7 @@ POUR RÉPARER:
         # Désactiver boutons
         self.repair_full_btn.setEnabled(False)
         self.repair_quick_btn.setEnabled(False)
+        self.repair_adaptive_btn.setEnabled(False)
         self.repair_custom_btn.setEnabled(False)
         self.start_btn.setEnabled(False)
         
@@ -1238,6 +1800,7 @@ POUR RÉPARER:
             # Désactiver boutons
             self.repair_full_btn.setEnabled(False)
             self.repair_quick_btn.setEnabled(False)
+            self.repair_adaptive_btn.setEnabled(False)
             self.repair_custom_btn.setEnabled(False)
             self.start_btn.setEnabled(False)
             
@@ -1262,6 +1825,7 @@ POUR RÉPARER:
         self.stop_btn.setEnabled(False)
         self.repair_full_btn.setEnabled(True)
         self.repair_quick_btn.setEnabled(True)
+        self.repair_adaptive_btn.setEnabled(True)
         self.repair_custom_btn.setEnabled(True)
         self.progress.setVisible(False)
         
@@ -1269,6 +1833,17 @@ POUR RÉPARER:
             self.append_log(f"\n❌ Erreur: {results['error']}")
             return
         
+        # Histogramme de latence (test latence)
+        if results.get('servers'):
+            self.append_log("\n📊 DISTRIBUTION DES LATENCES")
+            self.append_log("─" * 70)
+            for name, ping_data in results['servers']:
+                if not ping_data.get('histogram'):
+                    continue
+                self.append_log(f"\n{name}")
+                for line in format_histogram(ping_data['histogram']):
+                    self.append_log(line)
+        
         # Ajouter résumé si test complet
         if 'ping' in results and 'packet_loss' in results:
             self.append_log("\n" + "╔" + "═"*70 + "╗")
@@ -1304,6 +1879,7 @@ POUR RÉPARER:
         """Réparation terminée"""
         self.repair_full_btn.setEnabled(True)
         self.repair_quick_btn.setEnabled(True)
+        self.repair_adaptive_btn.setEnabled(True)
         self.repair_custom_btn.setEnabled(True)
         self.start_btn.setEnabled(True)
         self.progress.setVisible(False)
@@ -1317,12 +1893,41 @@ POUR RÉPARER:
             )
             return
         
-        # Proposition redémarrage si repair complète
-        if repair_type == "full":
+        report = results.get('report')
+        if repair_type == "adaptive" and report:
+            if report['fixed_by']:
+                QMessageBox.information(
+                    self,
+                    "✅ Connexion Rétablie",
+                    f"Réparé par : {STEP_NAMES[report['fixed_by']]}\n\n"
+                    "Aucun redémarrage nécessaire."
+                )
+                return
+            if not report['steps']:
+                QMessageBox.information(
+                    self,
+                    "✅ Connexion OK",
+                    "La connexion fonctionne : aucune réparation nécessaire."
+                )
+                return
+            if not report['reboot_needed']:
+                QMessageBox.warning(
+                    self,
+                    "⚠️ Problème Persistant",
+                    f"Symptôme : {SYMPTOM_NAMES[report['final']['symptom']]}\n\n"
+                    "Les réparations Windows n'ont pas suffi.\n"
+                    "Vérifiez la box, le câble/WiFi ou contactez votre FAI."
+                )
+                return
+        
+        # Proposition redémarrage si repair complète (ou reset en attente de redémarrage)
+        if repair_type in ("full", "adaptive"):
+            done_text = ("Réparation réseau complète effectuée avec succès!" if repair_type == "full"
+                         else "Reset effectué : il ne s'applique qu'après redémarrage.")
             reply = QMessageBox.question(
                 self,
                 "✅ Réparation Terminée",
-                "Réparation réseau complète effectuée avec succès!\n\n"
+                f"{done_text}\n\n"
                 "⚠️ REDÉMARRAGE OBLIGATOIRE pour appliquer les changements.\n\n"
                 "💾 Sauvegardez vos travaux en cours avant de redémarrer.\n\n"
                 "Redémarrer maintenant ?",
@@ -11,6 +11,8 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+from modules.service_state import ServiceStateSnapshot
+
 # Flags subprocess
 import sys
 if sys.platform == 'win32':
@@ -294,10 +296,13 @@ class BackupManager:
             'hosts': BackupManager.backup_hosts()
         }
         
+        # Un seul instantané pour tous les services et toutes les tâches
+        snapshot = ServiceStateSnapshot()
+        
         # Sauvegarder les services
         for category in PRIVACY_CONFIG.values():
             for service in category['services']:
-                backup_data['services'][service] = BackupManager.get_service_status(service)
+                backup_data['services'][service] = BackupManager.get_service_status(service, snapshot)
         
         # Sauvegarder le registre
         for category in PRIVACY_CONFIG.values():
@@ -308,7 +313,7 @@ class BackupManager:
         # Sauvegarder les tâches
         for category in PRIVACY_CONFIG.values():
             for task in category['tasks']:
-                backup_data['tasks'][task] = BackupManager.get_task_status(task)
+                backup_data['tasks'][task] = BackupManager.get_task_status(task, snapshot)
         
         # Écrire le fichier JSON
         with open(backup_path, 'w', encoding='utf-8') as f:
@@ -373,45 +378,9 @@ class BackupManager:
             return "Unknown"
     
     @staticmethod
-    def get_service_status(service_name):
-        """Récupère l'état d'un service"""
-        try:
-            result = subprocess.run(
-                ['sc', 'query', service_name],
-                capture_output=True,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=STARTUPINFO
-            )
-            
-            if result.returncode != 0:
-                return None
-            
-            status = "stopped"
-            if "RUNNING" in result.stdout:
-                status = "running"
-            
-            # Récupérer le type de démarrage
-            config_result = subprocess.run(
-                ['sc', 'qc', service_name],
-                capture_output=True,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=STARTUPINFO
-            )
-            
-            start_type = "auto"
-            if "DISABLED" in config_result.stdout:
-                start_type = "disabled"
-            elif "DEMAND" in config_result.stdout:
-                start_type = "manual"
-            
-            return {
-                'status': status,
-                'start_type': start_type
-            }
-        except:
-            return None
+    def get_service_status(service_name, snapshot=None):
+        """Récupère l'état d'un service ({'status', 'start_type'} ou None)"""
+        return (snapshot or ServiceStateSnapshot()).service(service_name)
     
     @staticmethod
     def get_registry_value(path, name):
@@ -434,27 +403,9 @@ class BackupManager:
             return None
     
     @staticmethod
-    def get_task_status(task_path):
-        """Récupère l'état d'une tâche planifiée"""
-        try:
-            result = subprocess.run(
-                ['schtasks', '/Query', '/TN', task_path, '/FO', 'LIST'],
-                capture_output=True,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=STARTUPINFO
-            )
-            
-            if result.returncode != 0:
-                return None
-            
-            status = "enabled"
-            if "Disabled" in result.stdout or "Désactivé" in result.stdout:
-                status = "disabled"
-            
-            return {'status': status}
-        except:
-            return None
+    def get_task_status(task_path, snapshot=None):
+        """Récupère l'état d'une tâche planifiée ({'status'} ou None)"""
+        return (snapshot or ServiceStateSnapshot()).task(task_path)
     
     @staticmethod
     def backup_hosts():
@@ -872,6 +823,8 @@ class ScanWorker(QThread):
     
     def run(self):
         results = {}
+        # États lus une fois (services + tâches) puis servis depuis l'instantané
+        self.state = ServiceStateSnapshot()
         
         self.log_signal.emit("🔍 SCAN DE LA CONFIDENTIALITÉ EN COURS...")
         self.log_signal.emit("="*60 + "\n")
@@ -975,17 +928,7 @@ class ScanWorker(QThread):
     
     def check_service(self, service_name):
         """Vérifie si un service est actif"""
-        try:
-            result = subprocess.run(
-                ['sc', 'query', service_name],
-                capture_output=True,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=STARTUPINFO
-            )
-            return "RUNNING" in result.stdout
-        except:
-            return False
+        return self.state.service_running(service_name)
     
     def check_registry(self, path, name):
         """Lit une valeur du registre"""
@@ -1004,21 +947,7 @@ class ScanWorker(QThread):
     
     def check_task(self, task_path):
         """Vérifie si une tâche est active"""
-        try:
-            result = subprocess.run(
-                ['schtasks', '/Query', '/TN', task_path],
-                capture_output=True,
-                text=True,
-                creationflags=CREATE_NO_WINDOW,
-                startupinfo=STARTUPINFO
-            )
-            
-            # Vérifier si la tâche existe et n'est pas désactivée
-            if result.returncode == 0:
-                return "Disabled" not in result.stdout and "Désactivé" not in result.stdout
-            return False
-        except:
-            return False
+        return self.state.task_enabled(task_path)
     
     def check_hosts(self):
         """Compte combien de domaines sont bloqués dans hosts"""
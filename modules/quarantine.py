@@ -0,0 +1,514 @@
+# modules/quarantine.py
+"""
+Quarantine - Corbeille réversible pour les nettoyages
+Utilisé par : Nettoyage disque avancé, Nettoyage Windows
+
+- Même volume : simple renommage vers la zone d'attente (aucune copie,
+  aussi rapide qu'une suppression)
+- Autre volume : copie compressée (lzma) en flux, puis suppression
+- Consolidation différée : contenu haché (SHA-256), blobs identiques
+  dédupliqués, compression lzma si elle fait gagner de la place
+- Expiration par âge et par budget de taille ; restauration d'un passage
+  complet en une fois
+"""
+
+import os
+import json
+import lzma
+import time
+import errno
+import shutil
+import hashlib
+import secrets
+import threading
+from itertools import count
+from pathlib import Path
+from datetime import datetime
+
+from modules.disk_walker import iter_files
+
+DAY = 86400
+
+DEFAULT_MAX_AGE_DAYS = 14
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+
+# Fichiers par sous-dossier de la zone d'attente
+STAGING_BUCKET = 1000
+
+# Compression conservée seulement si elle fait gagner au moins 10%
+COMPRESS_RATIO = 0.9
+LZMA_PRESET = 1
+CHUNK_SIZE = 1024 * 1024
+
+# Consolidation après un nettoyage (s) : reprise au nettoyage suivant
+MAINTAIN_BUDGET = 5
+
+# ERROR_NOT_SAME_DEVICE (renommage entre volumes sous Windows)
+ERROR_NOT_SAME_DEVICE = 17
+
+# Types d'entrée du manifeste : [chemin, taille, type, référence, mtime_ns]
+STAGED = 's'       # référence = chemin relatif dans staging/<passage>
+BLOB = 'b'         # référence = sha256 (blob brut)
+BLOB_XZ = 'z'      # référence = sha256 (blob compressé .xz)
+
+
+def get_quarantine_dir():
+    """Dossier de la quarantaine"""
+    path = Path.home() / "Documents" / "Wapinator" / "Quarantine"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _write_json(path, data):
+    """Écriture atomique (fichier temporaire + remplacement)"""
+    tmp = Path(str(path) + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def _read_json(path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+# ============ PRÉFÉRENCES ============
+
+def load_settings(root=None):
+    """Préférences de quarantaine (activée, âge max, budget)"""
+    root = Path(root) if root else get_quarantine_dir()
+    settings = {'enabled': False, 'max_age_days': DEFAULT_MAX_AGE_DAYS, 'max_bytes': DEFAULT_MAX_BYTES}
+    settings.update(_read_json(root / "settings.json", {}) or {})
+    return settings
+
+
+def save_settings(settings, root=None):
+    root = Path(root) if root else get_quarantine_dir()
+    try:
+        _write_json(root / "settings.json", settings)
+    except OSError:
+        pass
+
+
+def quarantine_enabled():
+    """Mode quarantaine activé (préférence partagée par tous les nettoyages)"""
+    return bool(load_settings().get('enabled'))
+
+
+def set_quarantine_enabled(enabled):
+    settings = load_settings()
+    settings['enabled'] = bool(enabled)
+    save_settings(settings)
+
+
+# ============ PASSAGE ============
+
+class QuarantineRun:
+    """Un nettoyage mis en quarantaine (restaurable en une fois)
+
+    `add` est appelé depuis les threads du moteur de suppression.
+    """
+
+    def __init__(self, store, label):
+        self.store = store
+        self.label = label
+        self.id = datetime.now().strftime("%Y%m%d-%H%M%S-") + secrets.token_hex(3)
+        self.created = time.time()
+        self.staging = store.staging_dir / self.id
+        self.entries = []
+        self.size = 0
+        self._counter = count()
+        self._lock = threading.Lock()
+        self._buckets = set()
+
+    def add(self, path, size=None):
+        """Retirer un fichier de son emplacement (lève OSError comme os.unlink)"""
+        path = os.fspath(path)
+        n = next(self._counter)
+        bucket = str(n // STAGING_BUCKET)
+        rel = os.path.join(bucket, str(n))
+
+        if bucket not in self._buckets:
+            os.makedirs(self.staging / bucket, exist_ok=True)
+            with self._lock:
+                self._buckets.add(bucket)
+
+        try:
+            os.rename(path, self.staging / rel)
+            entry = [path, size, STAGED, rel, None]
+        except OSError as e:
+            if e.errno != errno.EXDEV and getattr(e, 'winerror', None) != ERROR_NOT_SAME_DEVICE:
+                raise
+            # Autre volume : copie compressée en flux puis suppression
+            st = os.stat(path)
+            digest = self.store.ingest(path, compress=True)
+            os.unlink(path)
+            size = st.st_size
+            entry = [path, size, BLOB_XZ if self.store.blob_path(digest, True).exists() else BLOB,
+                     digest, st.st_mtime_ns]
+
+        with self._lock:
+            if entry[1] is None:
+                try:
+                    entry[1] = os.stat(self.staging / rel).st_size
+                except OSError:
+                    entry[1] = 0
+            self.entries.append(entry)
+            self.size += entry[1]
+        return True
+
+    def commit(self):
+        """Enregistrer le manifeste (passage vide : rien n'est conservé)"""
+        if not self.entries:
+            shutil.rmtree(self.staging, ignore_errors=True)
+            return None
+        manifest = {
+            'id': self.id,
+            'label': self.label,
+            'created': self.created,
+            'files': len(self.entries),
+            'size': self.size,
+            'entries': self.entries,
+        }
+        self.store.save_manifest(manifest)
+        return manifest
+
+
+def _blob_refs(manifest):
+    """Blobs référencés par un passage"""
+    return {entry[3] for entry in manifest['entries'] if entry[2] != STAGED}
+
+
+# ============ MAGASIN ============
+
+class QuarantineStore:
+    """Zone d'attente + blobs adressés par contenu + manifestes des passages"""
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else get_quarantine_dir()
+        self.staging_dir = self.root / "staging"
+        self.blobs_dir = self.root / "blobs"
+        self.runs_dir = self.root / "runs"
+        for folder in (self.staging_dir, self.blobs_dir, self.runs_dir):
+            folder.mkdir(parents=True, exist_ok=True)
+        # Blobs orphelins trop récents pour être supprimés (dernier ramasse-miettes)
+        self.unclaimed_bytes = 0
+
+    # ---------- passages ----------
+
+    def begin(self, label):
+        """Nouveau passage de quarantaine"""
+        return QuarantineRun(self, label)
+
+    def save_manifest(self, manifest):
+        _write_json(self.runs_dir / f"{manifest['id']}.json", manifest)
+
+    def runs(self):
+        """Manifestes des passages, du plus récent au plus ancien"""
+        manifests = []
+        for path in self.runs_dir.glob("*.json"):
+            manifest = _read_json(path)
+            if manifest and 'id' in manifest:
+                manifests.append(manifest)
+        manifests.sort(key=lambda m: m.get('created', 0), reverse=True)
+        return manifests
+
+    def load_run(self, run_id):
+        return _read_json(self.runs_dir / f"{run_id}.json")
+
+    def purge(self, run_id, collect=True):
+        """Supprimer définitivement un passage"""
+        shutil.rmtree(self.staging_dir / run_id, ignore_errors=True)
+        try:
+            (self.runs_dir / f"{run_id}.json").unlink()
+        except OSError:
+            pass
+        if collect:
+            self.collect_garbage()
+
+    # ---------- blobs ----------
+
+    def blob_path(self, digest, compressed=False):
+        name = digest + (".xz" if compressed else "")
+        return self.blobs_dir / digest[:2] / name
+
+    def has_blob(self, digest):
+        return self.blob_path(digest).exists() or self.blob_path(digest, True).exists()
+
+    def _claim_blob(self, digest):
+        """Blob existant réutilisé : date rafraîchie pour le protéger du ramasse-miettes"""
+        for path in (self.blob_path(digest), self.blob_path(digest, True)):
+            try:
+                os.utime(path)
+                return True
+            except FileNotFoundError:
+                continue
+        return False
+
+    def ingest(self, path, compress=True):
+        """Copier un fichier dans les blobs (haché et compressé en un passage)"""
+        sha = hashlib.sha256()
+        tmp = self.blobs_dir / f"ingest-{secrets.token_hex(8)}.tmp"
+        try:
+            with open(path, 'rb') as src:
+                if compress:
+                    with lzma.open(tmp, 'wb', preset=LZMA_PRESET) as dst:
+                        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                            sha.update(chunk)
+                            dst.write(chunk)
+                else:
+                    with open(tmp, 'wb') as dst:
+                        for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                            sha.update(chunk)
+                            dst.write(chunk)
+            digest = sha.hexdigest()
+            if self._claim_blob(digest):
+                tmp.unlink()
+            else:
+                target = self.blob_path(digest, compress)
+                target.parent.mkdir(exist_ok=True)
+                os.replace(tmp, target)
+            return digest
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _hash_file(path):
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _compress_to_blob(self, staged, digest):
+        """Compresser un fichier en attente ; blob brut (renommage) si peu rentable"""
+        size = os.stat(staged).st_size
+        tmp = self.blobs_dir / f"compress-{secrets.token_hex(8)}.tmp"
+        with open(staged, 'rb') as src, lzma.open(tmp, 'wb', preset=LZMA_PRESET) as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        compressed = os.stat(tmp).st_size < size * COMPRESS_RATIO
+        target = self.blob_path(digest, compressed)
+        target.parent.mkdir(exist_ok=True)
+        if compressed:
+            os.replace(tmp, target)
+            os.unlink(staged)
+        else:
+            tmp.unlink()
+            os.replace(staged, target)
+            os.utime(target)  # le renommage garde la date d'origine du fichier
+        return compressed
+
+    # ---------- maintenance ----------
+
+    def consolidate(self, time_budget=None):
+        """Traiter les fichiers en attente : dédupliquer puis compresser
+
+        Interrompu proprement après `time_budget` secondes (repris au prochain appel).
+        """
+        deadline = time.monotonic() + time_budget if time_budget else None
+        stats = {'deduplicated': 0, 'compressed': 0, 'stored': 0}
+
+        for manifest in reversed(self.runs()):  # plus anciens d'abord
+            changed = False
+            for entry in manifest['entries']:
+                if entry[2] != STAGED:
+                    continue
+                if deadline and time.monotonic() > deadline:
+                    break
+                staged = self.staging_dir / manifest['id'] / entry[3]
+                try:
+                    mtime_ns = os.stat(staged).st_mtime_ns
+                    digest = self._hash_file(staged)
+                    if self._claim_blob(digest):
+                        os.unlink(staged)
+                        stats['deduplicated'] += 1
+                    elif self._compress_to_blob(staged, digest):
+                        stats['compressed'] += 1
+                    else:
+                        stats['stored'] += 1
+                except OSError:
+                    continue
+                entry[2] = BLOB_XZ if self.blob_path(digest, True).exists() else BLOB
+                entry[3] = digest
+                entry[4] = mtime_ns
+                changed = True
+            if changed:
+                self.save_manifest(manifest)
+                if not any(e[2] == STAGED for e in manifest['entries']):
+                    shutil.rmtree(self.staging_dir / manifest['id'], ignore_errors=True)
+            if deadline and time.monotonic() > deadline:
+                break
+        return stats
+
+    def usage(self):
+        """Octets occupés par la quarantaine (attente + blobs)"""
+        total = 0
+        for folder in (self.staging_dir, self.blobs_dir):
+            for _, st in iter_files(folder):
+                total += st.st_size
+        return total
+
+    def collect_garbage(self):
+        """Supprimer les blobs qui ne sont plus référencés"""
+        referenced = set()
+        known_runs = set()
+        for manifest in self.runs():
+            known_runs.add(manifest['id'])
+            for entry in manifest['entries']:
+                if entry[2] != STAGED:
+                    referenced.add(entry[3])
+
+        removed = 0
+        self.unclaimed_bytes = 0
+        now = time.time()
+        for path, st in list(iter_files(self.blobs_dir)):
+            name = os.path.basename(path)
+            if not name.endswith('.tmp') and name.split('.', 1)[0] in referenced:
+                continue
+            # Copie interrompue ou blob orphelin ; un blob récent peut appartenir
+            # à un passage en cours dont le manifeste n'est pas encore écrit
+            if now - st.st_mtime <= DAY:
+                self.unclaimed_bytes += st.st_size
+                continue
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+
+        # Zones d'attente orphelines (passage interrompu avant son manifeste)
+        for entry in os.scandir(self.staging_dir):
+            if entry.is_dir() and entry.name not in known_runs:
+                try:
+                    if now - entry.stat().st_mtime > DAY:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                except OSError:
+                    pass
+        return removed
+
+    def expire(self, max_age_days=None, max_bytes=None):
+        """Supprimer les passages trop anciens, puis les plus anciens jusqu'au budget"""
+        settings = load_settings(self.root)
+        max_age_days = max_age_days if max_age_days is not None else settings['max_age_days']
+        max_bytes = max_bytes if max_bytes is not None else settings['max_bytes']
+
+        expired = 0
+        runs = self.runs()
+        cutoff = time.time() - max_age_days * DAY
+        for manifest in [m for m in runs if m.get('created', 0) < cutoff]:
+            self.purge(manifest['id'], collect=False)
+            runs.remove(manifest)
+            expired += 1
+        self.collect_garbage()
+
+        # Budget : occupation mesurée une fois, puis décomptée passage par passage
+        # (les blobs orphelins récents ne partiront pas en supprimant d'autres passages)
+        used = self.usage() - self.unclaimed_bytes
+        if not runs or used <= max_bytes:
+            return expired
+        owners = {}  # blob -> nombre de passages qui le référencent
+        for manifest in runs:
+            for digest in _blob_refs(manifest):
+                owners[digest] = owners.get(digest, 0) + 1
+        while runs and used > max_bytes:
+            manifest = runs.pop()
+            used -= sum(entry[1] or 0 for entry in manifest['entries'] if entry[2] == STAGED)
+            self.purge(manifest['id'], collect=False)
+            for digest in _blob_refs(manifest):
+                owners[digest] -= 1
+                if not owners[digest]:
+                    used -= self._remove_blob(digest)
+            expired += 1
+        return expired
+
+    def _remove_blob(self, digest):
+        """Supprimer un blob plus référencé ; octets retirés du budget"""
+        freed = 0
+        for path in (self.blob_path(digest), self.blob_path(digest, True)):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            freed += st.st_size
+            # Blob récent : peut-être repris par un passage en cours (ramasse-miettes)
+            if time.time() - st.st_mtime > DAY:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+        return freed
+
+    def maintain(self, time_budget=MAINTAIN_BUDGET):
+        """Après un nettoyage : consolidation bornée dans le temps puis expiration"""
+        stats = self.consolidate(time_budget=time_budget)
+        stats['expired'] = self.expire()
+        return stats
+
+    # ---------- restauration ----------
+
+    def restore(self, run_id):
+        """Remettre tous les fichiers d'un passage à leur place
+
+        Les fichiers dont l'emplacement est de nouveau occupé sont laissés en
+        quarantaine (conflits) ; le passage est supprimé s'il est vide.
+        """
+        report = {'restored': 0, 'size': 0, 'conflicts': [], 'failed': {}}
+        manifest = self.load_run(run_id)
+        if not manifest:
+            report['failed'][run_id] = "Passage introuvable"
+            return report
+
+        remaining = []
+        for entry in manifest['entries']:
+            path, size, kind, ref, mtime_ns = entry
+            if os.path.lexists(path):
+                report['conflicts'].append(path)
+                remaining.append(entry)
+                continue
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if kind == STAGED:
+                    staged = self.staging_dir / run_id / ref
+                    try:
+                        os.rename(staged, path)
+                    except OSError as e:
+                        if e.errno != errno.EXDEV and getattr(e, 'winerror', None) != ERROR_NOT_SAME_DEVICE:
+                            raise
+                        shutil.move(str(staged), path)
+                elif kind == BLOB_XZ:
+                    with lzma.open(self.blob_path(ref, True), 'rb') as src, open(path, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                else:
+                    # Blob partagé entre passages : copie, jamais déplacement
+                    shutil.copyfile(self.blob_path(ref), path)
+                if mtime_ns is not None:
+                    os.utime(path, ns=(mtime_ns, mtime_ns))
+                report['restored'] += 1
+                report['size'] += size or 0
+            except OSError as e:
+                report['failed'][path] = e.strerror or str(e)
+                remaining.append(entry)
+
+        if remaining:
+            manifest['entries'] = remaining
+            manifest['files'] = len(remaining)
+            manifest['size'] = sum(e[1] or 0 for e in remaining)
+            self.save_manifest(manifest)
+            self.collect_garbage()
+        else:
+            self.purge(run_id)
+        return report
+
+
+def describe_run(manifest):
+    """Ligne de résumé d'un passage"""
+    created = datetime.fromtimestamp(manifest.get('created', 0)).strftime("%d/%m/%Y %H:%M")
+    return (f"{created} • {manifest.get('label', '?')} • {manifest.get('files', 0)} fichiers "
+            f"• {manifest.get('size', 0) / (1024**2):.1f} Mo")
@@ -0,0 +1,179 @@
+# modules/retention_policy.py
+"""
+Retention Policy - Règles de conservation par âge / taille / nombre
+Utilisé par : Nettoyage disque avancé (logs), Nettoyage Windows (temp)
+
+Exemples de règles :
+- Logs de plus de 14 jours
+- Garder les 5 dumps les plus récents
+- Fichiers temp non ouverts depuis 7 jours
+
+Les règles sont compilées (seuils en timestamps, extensions en tuple) puis
+évaluées pendant le parcours unique du disque, avec le stat déjà obtenu par
+le walker : aucun appel système supplémentaire.
+"""
+
+import os
+import time
+import heapq
+from itertools import count
+
+from modules.disk_walker import iter_files, get_cluster_size, allocated_size
+
+DAY = 86400
+
+
+class RetentionRule:
+    """Règle de conservation (la première règle dont les extensions correspondent s'applique)"""
+
+    def __init__(self, name, extensions=None, older_than_days=None, not_accessed_days=None,
+                 keep_newest=None, min_size=0):
+        self.name = name
+        self.extensions = tuple(ext.lower() for ext in extensions) if extensions else None
+        self.older_than_days = older_than_days        # âge de modification
+        self.not_accessed_days = not_accessed_days    # dernier accès (ou modification)
+        self.keep_newest = keep_newest                # garder les N plus récents
+        self.min_size = min_size                      # ignorer les fichiers plus petits
+
+    def describe(self):
+        parts = []
+        if self.extensions:
+            parts.append(", ".join(self.extensions))
+        if self.older_than_days is not None:
+            parts.append(f"modifiés il y a > {self.older_than_days} j")
+        if self.not_accessed_days is not None:
+            parts.append(f"non ouverts depuis {self.not_accessed_days} j")
+        if self.keep_newest:
+            parts.append(f"{self.keep_newest} plus récents conservés")
+        if self.min_size:
+            parts.append(f"> {self.min_size / (1024**2):.0f} Mo")
+        return " • ".join(parts) or "tous les fichiers"
+
+
+class _CompiledRule:
+    __slots__ = ('rule', 'extensions', 'mtime_cutoff', 'atime_cutoff', 'keep_newest', 'min_size')
+
+    def __init__(self, rule, now):
+        self.rule = rule
+        self.extensions = rule.extensions
+        self.mtime_cutoff = now - rule.older_than_days * DAY if rule.older_than_days is not None else None
+        self.atime_cutoff = now - rule.not_accessed_days * DAY if rule.not_accessed_days is not None else None
+        self.keep_newest = rule.keep_newest or 0
+        self.min_size = rule.min_size
+
+    def expired(self, st):
+        if st.st_size < self.min_size:
+            return False
+        if self.mtime_cutoff is not None and st.st_mtime >= self.mtime_cutoff:
+            return False
+        if self.atime_cutoff is not None:
+            # Le dernier accès n'est pas toujours mis à jour par NTFS :
+            # un fichier modifié récemment compte comme utilisé
+            if max(st.st_atime, st.st_mtime) >= self.atime_cutoff:
+                return False
+        return True
+
+
+def new_result():
+    """Résultat d'évaluation vide"""
+    return {
+        'files': 0,        # fichiers à supprimer
+        'size': 0,
+        'allocated': 0,
+        'kept': 0,         # fichiers couverts par une règle mais conservés
+        'by_rule': {},     # nom de règle -> {'files', 'size'}
+        'candidates': [],  # (chemin, stat) à supprimer (si collect=True)
+    }
+
+
+class RetentionPolicy:
+    """Ensemble de règles compilé une fois, évalué en une passe"""
+
+    def __init__(self, rules, now=None):
+        self.rules = list(rules)
+        self.compiled = [_CompiledRule(rule, now if now is not None else time.time()) for rule in self.rules]
+
+    def dir_cutoff(self):
+        """Instant avant lequel un dossier vide est considéré inutilisé (règle la plus prudente)"""
+        cutoffs = [cutoff for compiled in self.compiled
+                   for cutoff in (compiled.mtime_cutoff, compiled.atime_cutoff) if cutoff is not None]
+        return min(cutoffs) if cutoffs else None
+
+    def _match(self, name):
+        lower = name.lower()
+        for compiled in self.compiled:
+            if compiled.extensions is None or lower.endswith(compiled.extensions):
+                return compiled
+        return None
+
+    def evaluate(self, roots, progress=None, collect=True):
+        """Parcourir les racines une seule fois et sélectionner les fichiers expirés"""
+        result = new_result()
+        for rule in self.rules:
+            result['by_rule'][rule.name] = {'files': 0, 'size': 0}
+
+        if isinstance(roots, (str, os.PathLike)):
+            roots = [roots]
+
+        for root in roots:
+            if not os.path.isdir(root):
+                continue
+            cluster = get_cluster_size(root)
+            # "Garder les N plus récents" : tas des N plus récents par règle et par racine ;
+            # tout fichier qui en sort est plus ancien que N autres
+            newest = {}
+            tie = count()
+
+            def select(compiled, path, st):
+                if not compiled.expired(st):
+                    result['kept'] += 1
+                    return
+                self._add(result, compiled.rule, path, st, cluster, collect)
+
+            for path, st in iter_files(root, progress=progress):
+                compiled = self._match(os.path.basename(path))
+                if compiled is None:
+                    continue
+
+                if compiled.keep_newest:
+                    heap = newest.setdefault(id(compiled), [])
+                    heapq.heappush(heap, (st.st_mtime, next(tie), path, st))
+                    if len(heap) > compiled.keep_newest:
+                        _, _, old_path, old_st = heapq.heappop(heap)
+                        select(compiled, old_path, old_st)
+                    continue
+
+                select(compiled, path, st)
+
+            for heap in newest.values():
+                result['kept'] += len(heap)
+
+        return result
+
+    @staticmethod
+    def _add(result, rule, path, st, cluster, collect):
+        result['files'] += 1
+        result['size'] += st.st_size
+        result['allocated'] += allocated_size(st, cluster, path)
+        stats = result['by_rule'][rule.name]
+        stats['files'] += 1
+        stats['size'] += st.st_size
+        if collect:
+            result['candidates'].append((path, st))
+
+
+# ============ POLITIQUES PAR DÉFAUT ============
+
+LOG_RETENTION = [
+    RetentionRule("Logs anciens", extensions=['.log', '.etl'], older_than_days=14),
+    RetentionRule("Dumps mémoire", extensions=['.dmp'], keep_newest=5),
+]
+
+TEMP_RETENTION = [
+    RetentionRule("Temporaires inutilisés", not_accessed_days=7),
+]
+
+
+def describe_policy(rules):
+    """Lignes de log décrivant une politique"""
+    return [f"    • {rule.name} : {rule.describe()}" for rule in rules]
@@ -0,0 +1,112 @@
+# modules/service_state.py
+"""
+Service State - Instantané de l'état des services et tâches planifiées
+Utilisé par : Confidentialité & Télémétrie (scan, sauvegarde)
+
+- Services lus directement auprès du gestionnaire de services (psutil),
+  sans lancer `sc query` / `sc qc` pour chacun
+- Toutes les tâches planifiées lues en un seul `schtasks /query /fo csv`
+- Les vérifications suivantes sont servies depuis l'instantané
+"""
+
+import csv
+import sys
+import subprocess
+
+import psutil
+
+if sys.platform == 'win32':
+    CREATE_NO_WINDOW = 0x08000000
+    STARTUPINFO = subprocess.STARTUPINFO()
+    STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+else:
+    CREATE_NO_WINDOW = 0
+    STARTUPINFO = None
+
+# Types de démarrage psutil -> valeurs des sauvegardes de confidentialité
+START_TYPES = {
+    'automatic': 'auto',
+    'manual': 'manual',
+    'disabled': 'disabled',
+}
+
+# Statut schtasks d'une tâche désactivée (anglais / français)
+DISABLED_STATES = ("Disabled", "Désactivé", "Désactivée")
+
+
+def parse_schtasks_csv(output):
+    """{chemin de tâche: 'enabled'|'disabled'} depuis `schtasks /query /fo csv /nh`
+
+    Colonnes : nom, prochaine exécution, statut (libellés selon la langue).
+    """
+    tasks = {}
+    for row in csv.reader(output.splitlines()):
+        if len(row) < 3 or not row[0].startswith('\\'):
+            continue
+        disabled = any(state in row[2] for state in DISABLED_STATES)
+        tasks[row[0].lower()] = 'disabled' if disabled else 'enabled'
+    return tasks
+
+
+class ServiceStateSnapshot:
+    """État des services et des tâches, lu une fois puis servi depuis la mémoire"""
+
+    def __init__(self):
+        self._services = {}
+        self._tasks = None
+
+    # ----- services -----
+
+    def service(self, name):
+        """{'status': 'running'|'stopped', 'start_type'} ou None si absent"""
+        if name not in self._services:
+            self._services[name] = self._query_service(name)
+        return self._services[name]
+
+    def preload_services(self, names):
+        for name in names:
+            self.service(name)
+
+    @staticmethod
+    def _query_service(name):
+        try:
+            info = psutil.win_service_get(name).as_dict()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError, OSError):
+            return None
+        return {
+            'status': 'running' if info['status'] == 'running' else 'stopped',
+            'start_type': START_TYPES.get(info['start_type'], 'auto'),
+        }
+
+    def service_running(self, name):
+        state = self.service(name)
+        return bool(state and state['status'] == 'running')
+
+    # ----- tâches planifiées -----
+
+    def _load_tasks(self):
+        try:
+            result = subprocess.run(
+                ['schtasks', '/Query', '/FO', 'CSV', '/NH'],
+                capture_output=True,
+                text=True,
+                errors='replace',
+                timeout=30,
+                creationflags=CREATE_NO_WINDOW,
+                startupinfo=STARTUPINFO
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return {}
+        return parse_schtasks_csv(result.stdout)
+
+    def task(self, task_path):
+        """{'status': 'enabled'|'disabled'} ou None si la tâche n'existe pas"""
+        if self._tasks is None:
+            self._tasks = self._load_tasks()
+        status = self._tasks.get(task_path.lower())
+        return {'status': status} if status else None
+
+    def task_enabled(self, task_path):
+        state = self.task(task_path)
+        return bool(state and state['status'] == 'enabled')
@@ -0,0 +1,341 @@
+# modules/throughput.py
+"""
+Throughput - Test de débit multi-flux (HTTP ou TCP brut) + serveur local
+Utilisé par : Network Tester (test débit, test bufferbloat)
+
+- N flux parallèles vers un point de test configurable :
+  http(s)://hôte/chemin (GET chemin/__down?bytes=N, POST chemin/__up,
+  comme speed.cloudflare.com) ou tcp://hôte:port
+- Octets comptés au fil de l'eau, échantillonnés toutes les 100 ms
+- Montée en charge (warm-up) écartée du calcul du débit
+- Débit utile (goodput) en Mbps par flux et agrégé, courbe dans le temps
+- Serveur local (même port pour HTTP et TCP brut) pour tester un LAN
+  ou une machine sans internet
+"""
+
+import time
+import socket
+import threading
+import http.client
+import socketserver
+from urllib.parse import urlsplit
+
+# Point de test public par défaut (Cloudflare : __down?bytes=N / __up)
+DEFAULT_ENDPOINT = "https://speed.cloudflare.com"
+DEFAULT_PORT = 5201
+
+CHUNK = 64 * 1024
+SAMPLE_INTERVAL = 0.1
+DOWNLOAD_REQUEST_BYTES = 25 * 1024 ** 2
+UPLOAD_REQUEST_BYTES = 8 * 1024 ** 2
+CONNECT_TIMEOUT = 5
+
+
+def parse_endpoint(endpoint):
+    """(schéma, hôte, port, chemin) ; "hôte:port" seul = TCP brut"""
+    endpoint = (endpoint or DEFAULT_ENDPOINT).strip()
+    if "://" not in endpoint:
+        endpoint = "tcp://" + endpoint
+    parts = urlsplit(endpoint)
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https', 'tcp'):
+        raise ValueError(f"Schéma non supporté : {scheme}")
+    default_port = {'http': 80, 'https': 443, 'tcp': DEFAULT_PORT}[scheme]
+    return scheme, parts.hostname, parts.port or default_port, parts.path.rstrip('/')
+
+
+def _mbps(byte_count, seconds):
+    return byte_count * 8 / seconds / 1e6 if seconds > 0 else 0.0
+
+
+class ThroughputTest:
+    """Test de débit : `streams` flux en parallèle pendant `duration` s
+
+    Les `warmup` premières secondes (ouverture TCP, slow start) sont exclues
+    du débit ; elles restent visibles dans la courbe.
+    """
+
+    def __init__(self, endpoint=None, streams=4, duration=10, warmup=2, direction='download'):
+        self.scheme, self.host, self.port, self.path = parse_endpoint(endpoint)
+        self.endpoint = endpoint or DEFAULT_ENDPOINT
+        self.streams = max(1, int(streams))
+        self.duration = duration
+        self.warmup = min(warmup, duration / 2)
+        self.direction = direction
+        self.counters = [0] * self.streams
+        self.errors = [None] * self.streams
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    # ----- flux -----
+
+    def _connection(self):
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=CONNECT_TIMEOUT)
+
+    def _http_download(self, index):
+        conn = self._connection()
+        buffer = bytearray(CHUNK)
+        try:
+            while not self._stop.is_set():
+                conn.request('GET', f"{self.path}/__down?bytes={DOWNLOAD_REQUEST_BYTES}")
+                response = conn.getresponse()
+                if response.status != 200:
+                    raise OSError(f"HTTP {response.status}")
+                while not self._stop.is_set():
+                    read = response.readinto(buffer)
+                    if not read:
+                        break
+                    self.counters[index] += read
+        finally:
+            conn.close()
+
+    def _http_upload(self, index):
+        conn = self._connection()
+        chunk = b'\0' * CHUNK
+        path = f"{self.path}/__up"
+        try:
+            while not self._stop.is_set():
+                conn.putrequest('POST', path)
+                conn.putheader('Content-Type', 'application/octet-stream')
+                conn.putheader('Content-Length', str(UPLOAD_REQUEST_BYTES))
+                conn.endheaders()
+                sent = 0
+                while sent < UPLOAD_REQUEST_BYTES:
+                    if self._stop.is_set():
+                        return  # requête abandonnée : la connexion est fermée
+                    conn.send(chunk)
+                    sent += CHUNK
+                    self.counters[index] += CHUNK
+                response = conn.getresponse()
+                response.read()
+        finally:
+            conn.close()
+
+    def _tcp_stream(self, index):
+        with socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT) as sock:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(1.0)
+            if self.direction == 'download':
+                sock.sendall(b"DOWN\n")
+                buffer = bytearray(CHUNK)
+                while not self._stop.is_set():
+                    try:
+                        read = sock.recv_into(buffer)
+                    except socket.timeout:
+                        continue
+                    if not read:
+                        break
+                    self.counters[index] += read
+            else:
+                sock.sendall(b"UP\n")
+                chunk = b'\0' * CHUNK
+                while not self._stop.is_set():
+                    try:
+                        self.counters[index] += sock.send(chunk)
+                    except socket.timeout:
+                        continue
+
+    def _run_stream(self, index):
+        try:
+            if self.scheme == 'tcp':
+                self._tcp_stream(index)
+            elif self.direction == 'download':
+                self._http_download(index)
+            else:
+                self._http_upload(index)
+        except (OSError, http.client.HTTPException) as e:
+            self.errors[index] = str(e) or type(e).__name__
+
+    # ----- mesure -----
+
+    def run(self, progress=None):
+        """Exécuter le test (bloquant) ; retourne le rapport"""
+        threads = [threading.Thread(target=self._run_stream, args=(i,), daemon=True,
+                                    name=f"throughput-{i}")
+                   for i in range(self.streams)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        samples = []  # (t, [octets cumulés par flux])
+        next_sample = start
+        next_report = start + 1.0
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            if now - start >= self.duration or not any(t.is_alive() for t in threads):
+                break
+            samples.append((now - start, list(self.counters)))
+            if progress and now >= next_report:
+                progress(now - start, self.duration, self._rate(samples, 1.0))
+                next_report += 1.0
+            next_sample += SAMPLE_INTERVAL
+            time.sleep(max(0.0, next_sample - time.perf_counter()))
+        samples.append((time.perf_counter() - start, list(self.counters)))
+
+        self._stop.set()
+        for thread in threads:
+            thread.join(timeout=2)
+        return self._report(samples)
+
+    @staticmethod
+    def _rate(samples, window):
+        """Débit agrégé (Mbps) sur la dernière fenêtre"""
+        last_t, last = samples[-1]
+        for t, counters in reversed(samples):
+            if last_t - t >= window:
+                return _mbps(sum(last) - sum(counters), last_t - t)
+        return 0.0
+
+    def _report(self, samples):
+        end_t, end = samples[-1]
+        # Premier échantillon après le warm-up
+        base_t, base = next(((t, c) for t, c in samples if t >= self.warmup), samples[0])
+        measured = end_t - base_t
+
+        per_stream = [_mbps(end[i] - base[i], measured) for i in range(self.streams)]
+
+        # Courbe : débit agrégé par seconde
+        timeline = []
+        previous_t, previous = samples[0]
+        for t, counters in samples[1:]:
+            if t - previous_t >= 1.0 or t == end_t:
+                timeline.append((round(t, 1), _mbps(sum(counters) - sum(previous), t - previous_t)))
+                previous_t, previous = t, counters
+
+        errors = [e for e in self.errors if e]
+        return {
+            'success': sum(end) > 0 and len(errors) < self.streams,
+            'endpoint': self.endpoint,
+            'direction': self.direction,
+            'streams': self.streams,
+            'duration': end_t,
+            'warmup': self.warmup,
+            'bytes': sum(end),
+            'mbps': _mbps(sum(end) - sum(base), measured),
+            'per_stream': per_stream,
+            'timeline': timeline,
+            'errors': errors,
+        }
+
+
+# ============ SERVEUR LOCAL ============
+
+class _ThroughputHandler(socketserver.BaseRequestHandler):
+    """Une connexion : TCP brut ("DOWN"/"UP") ou HTTP (GET ?bytes=N / POST)"""
+
+    def handle(self):
+        sock = self.request
+        sock.settimeout(30)
+        reader = sock.makefile('rb')
+        try:
+            line = reader.readline(4096)
+            if line.strip() == b"DOWN":
+                self._send_forever(sock)
+            elif line.strip() == b"UP":
+                while reader.read1(CHUNK):
+                    pass
+            else:
+                while line:
+                    if not self._http_request(sock, reader, line):
+                        break
+                    line = reader.readline(4096)
+        except OSError:
+            pass
+        finally:
+            reader.close()
+
+    def _send_forever(self, sock):
+        chunk = b'\0' * CHUNK
+        while True:
+            sock.sendall(chunk)
+
+    def _http_request(self, sock, reader, request_line):
+        """Traiter une requête HTTP/1.1 ; False si la connexion doit être fermée"""
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            return False
+        headers = {}
+        while True:
+            header = reader.readline(4096)
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if method == 'GET':
+            size = DOWNLOAD_REQUEST_BYTES
+            if 'bytes=' in target:
+                try:
+                    size = int(target.split('bytes=', 1)[1].split('&', 1)[0])
+                except ValueError:
+                    pass
+            sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n"
+                         b"Content-Length: %d\r\n\r\n" % size)
+            chunk = b'\0' * CHUNK
+            remaining = size
+            while remaining > 0:
+                sock.sendall(chunk[:min(CHUNK, remaining)])
+                remaining -= CHUNK
+        elif method == 'POST':
+            remaining = int(headers.get('content-length', 0))
+            while remaining > 0:
+                data = reader.read1(min(CHUNK, remaining))
+                if not data:
+                    return False
+                remaining -= len(data)
+            sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+        else:
+            sock.sendall(b"HTTP/1.1 405 Method Not Allowed\r\nContent-Length: 0\r\n\r\n")
+        return headers.get('connection', '').lower() != 'close'
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ThroughputServer:
+    """Serveur de test local (HTTP + TCP brut sur le même port)"""
+
+    def __init__(self, host='0.0.0.0', port=DEFAULT_PORT):
+        self.server = _Server((host, port), _ThroughputHandler)
+        self.address = self.server.server_address
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True,
+                                        name="throughput-server")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def local_addresses():
+    """Adresses IPv4 de la machine (pour indiquer le point de test aux autres PC)"""
+    addresses = set()
+    try:
+        for info in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET):
+            addresses.add(info[4][0])
+    except OSError:
+        pass
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+            probe.connect(("192.0.2.1", 9))  # aucun paquet envoyé (UDP non connecté)
+            addresses.add(probe.getsockname()[0])
+    except OSError:
+        pass
+    addresses.discard("127.0.0.1")
+    return sorted(addresses)
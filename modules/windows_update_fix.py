@@ -7,6 +7,8 @@ import subprocess
 from datetime import datetime
 from pathlib import Path
 
+from modules.bulk_delete import BulkDeleter, summarize_failures
+
 # Flags subprocess
 import sys
 if sys.platform == 'win32':
@@ -86,22 +88,27 @@ class WindowsUpdateFixWorker(QThread):
             r"C:\Windows\SoftwareDistribution\DataStore"
         ]
         
+        def on_progress(files, size, current_path):
+            self.log_signal.emit(f"    … {files} fichiers supprimés ({size / (1024**2):.1f} Mo)")
+        
         for cache_path in cache_paths:
             try:
                 path = Path(cache_path)
                 if path.exists():
-                    # Supprimer contenu
-                    for item in path.iterdir():
-                        try:
-                            if item.is_file():
-                                item.unlink()
-                            elif item.is_dir():
-                                import shutil
-                                shutil.rmtree(item)
-                        except:
-                            pass
+                    # Supprimer contenu (pool de threads, verrouillés → redémarrage)
+                    deleter = BulkDeleter(progress_callback=on_progress, progress_interval=2.0)
+                    report = deleter.delete_contents(path)
                     
-                    self.log_signal.emit(f"  ✅ Cache vidé: {cache_path}")
+                    self.log_signal.emit(
+                        f"  ✅ Cache vidé: {cache_path} "
+                        f"({report['files']} fichiers, {report['size'] / (1024**2):.1f} Mo)"
+                    )
+                    if report['scheduled']:
+                        self.log_signal.emit(f"  🔁 {len(report['scheduled'])} éléments verrouillés supprimés au redémarrage")
+                    if report['failed']:
+                        self.log_signal.emit(f"  ⚠️ {len(report['failed'])} éléments non supprimés :")
+                        for line in summarize_failures(report):
+                            self.log_signal.emit(line)
                 else:
                     self.log_signal.emit(f"  ℹ️ Cache non trouvé: {cache_path}")
             except Exception as e:
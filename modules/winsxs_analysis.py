@@ -0,0 +1,182 @@
+# modules/winsxs_analysis.py
+"""
+WinSxS Analysis - Analyse du magasin de composants mise en cache
+Utilisé par : Nettoyage disque avancé (catégorie WinSxS)
+
+- Dism /AnalyzeComponentStore exécuté en arrière-plan (peut dépasser 1 minute)
+- Résultat mémorisé avec sa date
+- Invalidé uniquement par une activité de maintenance (logs CBS/DISM,
+  sessions de maintenance, opérations en attente)
+- Lecture indépendante de la langue de Windows (ordre des lignes DISM)
+"""
+
+import os
+import re
+import json
+import subprocess
+import sys
+from pathlib import Path
+from datetime import datetime
+
+from modules.disk_walker import get_data_dir
+
+if sys.platform == 'win32':
+    CREATE_NO_WINDOW = 0x08000000
+    STARTUPINFO = subprocess.STARTUPINFO()
+    STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+else:
+    CREATE_NO_WINDOW = 0
+    STARTUPINFO = None
+
+ANALYZE_TIMEOUT = 300
+
+
+def _windows_dir():
+    return Path(os.environ.get('SystemRoot', 'C:\\Windows'))
+
+
+def servicing_paths():
+    """Fichiers et dossiers modifiés par toute opération de maintenance"""
+    windows = _windows_dir()
+    return [
+        windows / 'Logs' / 'CBS' / 'CBS.log',
+        windows / 'Logs' / 'DISM' / 'dism.log',
+        windows / 'servicing' / 'Sessions',
+        windows / 'WinSxS' / 'pending.xml',
+        windows / 'WinSxS',
+    ]
+
+
+def servicing_stamp():
+    """Empreinte de l'activité de maintenance : {chemin: mtime_ns ou None}"""
+    stamp = {}
+    for path in servicing_paths():
+        try:
+            stamp[str(path)] = os.stat(path).st_mtime_ns
+        except OSError:
+            stamp[str(path)] = None
+    return stamp
+
+
+# Unités : "1.80 GB", "512 Ko"... et "0 bytes" / "0 octets" (cache vide)
+_SIZE_RE = re.compile(r':\s*(\d+(?:[.,]\d+)?)\s*(?:bytes|octets|([KMGT]?)[BOo])\b', re.IGNORECASE)
+_COUNT_RE = re.compile(r':\s*(\d+)\s*$')
+_YES_NO_RE = re.compile(r':\s*(yes|no|oui|non|ja|nein|sí|si|sim|não|nao)\s*$', re.IGNORECASE)
+_UNITS = {'': 1 / (1024 ** 2), 'K': 1 / 1024, 'M': 1, 'G': 1024, 'T': 1024 ** 2}
+
+
+def parse_analysis(output):
+    """Extraire les chiffres de /AnalyzeComponentStore (toutes langues)
+
+    DISM affiche toujours, dans cet ordre : taille Explorateur, taille réelle,
+    partagé avec Windows, sauvegardes et fonctionnalités désactivées, cache et
+    données temporaires ; puis le nombre de packages récupérables et
+    "nettoyage recommandé : oui/non".
+    """
+    sizes = []
+    packages = None
+    recommended = None
+    legacy_mb = 0
+    for line in output.splitlines():
+        line = line.strip()
+        match = _SIZE_RE.search(line)
+        if match:
+            value = float(match.group(1).replace(',', '.'))
+            sizes.append(int(value * _UNITS[(match.group(2) or '').upper()]))
+            if "Taille de nettoyage recommandée" in line:
+                legacy_mb = sizes[-1]
+            continue
+        match = _COUNT_RE.search(line)
+        if match:
+            packages = int(match.group(1))
+            continue
+        match = _YES_NO_RE.search(line)
+        if match:
+            recommended = match.group(1).lower() in ('yes', 'oui', 'ja', 'sí', 'si', 'sim')
+
+    result = {
+        'actual_mb': sizes[1] if len(sizes) > 1 else 0,
+        'reclaimable_mb': 0,
+        'packages': packages or 0,
+        'recommended': bool(recommended),
+    }
+    if legacy_mb:
+        result['reclaimable_mb'] = legacy_mb
+    elif recommended and len(sizes) >= 4:
+        # Sauvegardes/fonctionnalités désactivées + cache/données temporaires
+        # (ligne du cache absente ou illisible : comptée à 0)
+        result['reclaimable_mb'] = sizes[3] + (sizes[4] if len(sizes) > 4 else 0)
+    return result
+
+
+def run_analysis(timeout=ANALYZE_TIMEOUT):
+    """Exécuter Dism /AnalyzeComponentStore (bloquant) ; None si échec"""
+    try:
+        completed = subprocess.run(
+            ["Dism.exe", "/Online", "/Cleanup-Image", "/AnalyzeComponentStore"],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            creationflags=CREATE_NO_WINDOW,
+            startupinfo=STARTUPINFO,
+            encoding="utf-8",
+            errors="replace"
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if completed.returncode != 0:
+        return None
+    result = parse_analysis(completed.stdout)
+    result['timestamp'] = datetime.now().isoformat(timespec='seconds')
+    # Empreinte prise APRÈS l'analyse : DISM écrit lui-même dans CBS.log/dism.log
+    result['stamp'] = servicing_stamp()
+    return result
+
+
+class WinSxSCache:
+    """Dernière analyse du magasin de composants"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_data_dir() / "winsxs_analysis.json"
+
+    def load(self):
+        """Dernière analyse (dict) ou None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, result):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+        except OSError:
+            pass
+
+    def clear(self):
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    @staticmethod
+    def is_fresh(result):
+        """True si aucune maintenance n'a eu lieu depuis l'analyse"""
+        return bool(result) and result.get('stamp') == servicing_stamp()
+
+
+def format_age(timestamp):
+    """"il y a 3 h" à partir d'une date ISO"""
+    try:
+        delta = datetime.now() - datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return "date inconnue"
+    minutes = int(delta.total_seconds() // 60)
+    if minutes < 60:
+        return f"il y a {max(minutes, 0)} min"
+    if minutes < 48 * 60:
+        return f"il y a {minutes // 60} h"
+    return f"il y a {minutes // (24 * 60)} j"
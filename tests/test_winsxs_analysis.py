@@ -0,0 +1,82 @@
+# tests/test_winsxs_analysis.py
+"""
+Tests - Lecture de la sortie de Dism /AnalyzeComponentStore
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.winsxs_analysis import parse_analysis
+
+# Cache vide : DISM écrit "0 bytes" (sans unité K/M/G)
+OUTPUT_EN = """
+Deployment Image Servicing and Management tool
+Version: 10.0.19041.844
+
+Image Version: 10.0.19045.3803
+
+[===========================100.0%==========================]
+
+Component Store (WinSxS) information:
+
+Windows Explorer Reported Size of Component Store : 9.95 GB
+
+Actual Size of Component Store : 7.94 GB
+
+    Shared with Windows : 6.13 GB
+    Backups and Disabled Features : 1.80 GB
+    Cache and Temporary Data :  0 bytes
+
+Date of Last Cleanup : 2023-11-14 10:22:41
+
+Number of Reclaimable Packages : 3
+Component Store Cleanup Recommended : Yes
+
+The operation completed successfully.
+"""
+
+OUTPUT_FR = """
+Informations sur le magasin de composants (WinSxS) :
+
+Taille du magasin de composants indiquée par l'Explorateur Windows : 9,95 Go
+
+Taille réelle du magasin de composants : 7,94 Go
+
+    Partagé avec Windows : 6,13 Go
+    Sauvegardes et fonctionnalités désactivées : 1,80 Go
+    Cache et données temporaires : 0 octets
+
+Date du dernier nettoyage : 2023-11-14 10:22:41
+
+Nombre de packages récupérables : 3
+Nettoyage du magasin de composants recommandé : Oui
+"""
+
+
+def test_zero_bytes_cache_counts_as_zero():
+    result = parse_analysis(OUTPUT_EN)
+    assert result == {
+        'actual_mb': int(7.94 * 1024),
+        'reclaimable_mb': int(1.80 * 1024),
+        'packages': 3,
+        'recommended': True,
+    }
+
+
+def test_zero_octets_cache_french():
+    result = parse_analysis(OUTPUT_FR)
+    assert result['reclaimable_mb'] == int(1.80 * 1024)
+    assert result['actual_mb'] == int(7.94 * 1024)
+    assert result['recommended'] is True
+
+
+def test_missing_cache_line_counts_as_zero():
+    output = "\n".join(line for line in OUTPUT_EN.splitlines() if "Cache and Temporary" not in line)
+    assert parse_analysis(output)['reclaimable_mb'] == int(1.80 * 1024)
+
+
+def test_not_recommended_reclaims_nothing():
+    output = OUTPUT_EN.replace("Recommended : Yes", "Recommended : No")
+    assert parse_analysis(output)['reclaimable_mb'] == 0